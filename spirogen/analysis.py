@@ -0,0 +1,134 @@
+"""
+Array based measurements of paths.
+
+Analyze works through coordinate lists point by point in Python. These
+functions work out the same kinds of things (centers, distances between
+points, lengths along a path, bounding boxes) for a single path or a whole
+collection of paths at once with numpy. Paths can be given as anything
+PathCollection.fromlist accepts, and per-path results come back as arrays
+with one row per path.
+"""
+import numpy as np
+
+from spirogen.paths import PathCollection
+
+
+def aspoints(path):
+    """
+    Returns:
+        a single path (list of (x, y) or array-like) as an (N, 2) float array
+    """
+    return np.asarray(path, dtype=float).reshape(-1, 2)
+
+
+def centroid(path):
+    """
+    Returns:
+        (x, y) array with the average of every point, or None if there are
+        no points
+    """
+    points = aspoints(path)
+    if not len(points):
+        return None
+    return points.mean(axis=0)
+
+
+def segments(path, closed=False):
+    """
+    Args:
+        path: a single path
+        closed: also include the segment from the last point back to the
+            first
+
+    Returns:
+        (N - 1, 2) array (N, 2 if closed) of the x and y distance from each
+        point to the next
+    """
+    points = aspoints(path)
+    if closed:
+        return np.roll(points, -1, axis=0) - points
+    return np.diff(points, axis=0)
+
+
+def segment_lengths(path, closed=False):
+    """
+    Returns:
+        array of the length of every segment of a path, see segments()
+    """
+    return np.hypot(*segments(path, closed).T)
+
+
+def arc_length(path):
+    """
+    Returns:
+        (N,) array of the distance along a path to each point, starting at 0
+    """
+    lengths = segment_lengths(path)
+    out = np.zeros(len(lengths) + 1)
+    np.cumsum(lengths, out=out[1:])
+    return out
+
+
+def bounds(path):
+    """
+    Returns:
+        (xmin, ymin, xmax, ymax) array of every point
+    """
+    points = aspoints(path)
+    return np.concatenate((points.min(axis=0), points.max(axis=0)))
+
+
+def _reduce(ufunc, coll, values):
+    # applies ufunc.reduceat over each path's rows of values, leaving nan for
+    # empty paths, which reduceat can't handle
+    lengths = coll.lengths
+    out = np.full((coll.npaths,) + values.shape[1:], np.nan)
+    filled = lengths > 0
+    if filled.any():
+        out[filled] = ufunc.reduceat(values, coll.offsets[:-1][filled])
+    return out
+
+
+def centroids(paths):
+    """
+    Returns:
+        (P, 2) array with the average point of each path
+    """
+    coll = PathCollection.fromlist(paths)
+    sums = _reduce(np.add, coll, coll.points)
+    with np.errstate(invalid='ignore'):
+        return sums / coll.lengths[:, None]
+
+
+def path_bounds(paths):
+    """
+    Returns:
+        (P, 4) array of (xmin, ymin, xmax, ymax) for each path
+    """
+    coll = PathCollection.fromlist(paths)
+    low = _reduce(np.minimum, coll, coll.points)
+    high = _reduce(np.maximum, coll, coll.points)
+    return np.hstack((low, high))
+
+
+def extents(paths):
+    """
+    Returns:
+        (P, 2) array of the width and height of each path
+    """
+    box = path_bounds(paths)
+    return box[:, 2:] - box[:, :2]
+
+
+def path_lengths(paths):
+    """
+    Returns:
+        (P,) array of the total length of each path
+    """
+    coll = PathCollection.fromlist(paths)
+    steps = np.zeros(coll.npoints)
+    steps[1:] = np.hypot(*np.diff(coll.points, axis=0).T)
+    # the step onto the first point of each path comes from the path before
+    steps[coll.offsets[:-1][coll.lengths > 0]] = 0
+    lengths = _reduce(np.add, coll, steps)
+    return np.nan_to_num(lengths)
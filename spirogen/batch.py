@@ -0,0 +1,187 @@
+"""
+Command line batch rendering of saved settings.
+
+Renders session, pattern and color json files to an output folder without
+opening the interface, optionally in parallel across a pool of worker
+processes. For example, to render every saved session to png and svg using
+all cores:
+
+    python -m spirogen.batch "spirogen/interface/settings/sessions/*.json" \
+        -o renders -f png svg -j 0
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from functools import partial
+from multiprocessing import Pool
+
+from spirogen import pipeline
+
+
+def expand(inputs):
+    """
+    Expands a list of files, glob patterns and folders into a sorted list of
+    json files without duplicates. Folders are searched recursively.
+    """
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = glob.glob(os.path.join(item, '**', '*.json'),
+                                recursive=True)
+        else:
+            matches = glob.glob(item, recursive=True) or [item]
+        files += [f for f in matches if f not in files]
+    return sorted(files)
+
+
+def render_one(path, **kwargs):
+    """
+    Renders a single file, catching any errors so one bad file doesn't stop
+    the rest of the batch.
+    Returns:
+        (path, list of written files, error message or None, seconds taken)
+    """
+    start = time.perf_counter()
+    try:
+        written = pipeline.render_file(path, **kwargs)
+        error = None
+    except Exception as e:
+        written = []
+        error = f'{type(e).__name__}: {e}'
+    return path, written, error, time.perf_counter() - start
+
+
+def imap(worker, items, jobs=1):
+    """
+    Runs worker on every item, in a pool of processes if jobs is more than 1.
+    Args:
+        worker: picklable function that takes one item
+        items: list of items
+        jobs: number of worker processes. 0 uses every core.
+
+    Yields:
+        the results, in the order they finish
+    """
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(items))
+    if jobs <= 1:
+        yield from map(worker, items)
+        return
+    with Pool(jobs) as pool:
+        yield from pool.imap_unordered(worker, items)
+
+
+def run(files, outdir, formats=('png',), jobs=1, resolution=(1920, 1200),
+        supersample=2, settingspath=None, verbose=True, tolerance=None,
+        cache=None, chunksize=None):
+    """
+    Renders a list of settings files, in parallel if jobs is more than 1.
+    Args:
+        files: list of json paths
+        outdir: folder to write the renders to
+        formats: file extensions to write each render as
+        jobs: number of worker processes. 0 uses every core.
+        the rest are as for pipeline.render_file
+
+    Returns:
+        list of (path, error) for the files that failed
+    """
+    worker = partial(
+        render_one, outdir=outdir, formats=formats, resolution=resolution,
+        supersample=supersample, settingspath=settingspath,
+        tolerance=tolerance, cache=cache, chunksize=chunksize
+    )
+    failed = []
+    for path, written, error, seconds in imap(worker, files, jobs):
+        if error is not None:
+            failed.append((path, error))
+            print(f'Failed {path}: {error}', file=sys.stderr)
+        elif verbose:
+            print(f'{path} -> {", ".join(written)} ({seconds:.1f}s)')
+    return failed
+
+
+def parse_resolution(text):
+    try:
+        width, height = text.lower().split('x')
+        return int(width), int(height)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Resolution should look like 1920x1200, not '{text}'"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m spirogen.batch',
+        description='Render saved SpiroGen sessions, patterns and colors '
+                    'without opening the interface.'
+    )
+    parser.add_argument(
+        'inputs', nargs='+',
+        help='json files, glob patterns, or folders to search for json files'
+    )
+    parser.add_argument(
+        '-o', '--outdir', default='renders', help='output folder'
+    )
+    parser.add_argument(
+        '-f', '--format', nargs='+', default=['png'], dest='formats',
+        choices=pipeline.RASTER_FORMATS + pipeline.VECTOR_FORMATS,
+        help='file types to write'
+    )
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='number of files to render in parallel. 0 uses every core.'
+    )
+    parser.add_argument(
+        '-r', '--resolution', type=parse_resolution, default=(1920, 1200),
+        help='output size as WIDTHxHEIGHT'
+    )
+    parser.add_argument(
+        '-s', '--supersample', type=int, default=2,
+        help='anti-aliasing factor for raster output'
+    )
+    parser.add_argument(
+        '--simplify', type=float, default=None, metavar='PIXELS',
+        help='drop points that are within this many pixels of the line, '
+             'e.g. 0.5. Off by default.'
+    )
+    parser.add_argument(
+        '--no-cache', action='store_false', dest='cache',
+        help="don't load or save generated paths in the geometry cache"
+    )
+    parser.add_argument(
+        '--stream', nargs='?', type=int, const=1 << 18, default=None,
+        metavar='POINTS', dest='chunksize',
+        help='generate and draw this many points at a time (262144 if not '
+             'given) to keep memory use down on very large patterns'
+    )
+    parser.add_argument(
+        '--settings', default=None,
+        help='settings folder that session files point into. Defaults to '
+             'the folder above each session file.'
+    )
+    parser.add_argument(
+        '-q', '--quiet', action='store_true', help='only report failures'
+    )
+    args = parser.parse_args(argv)
+
+    files = expand(args.inputs)
+    if not files:
+        print('No files found', file=sys.stderr)
+        return 1
+    failed = run(
+        files, args.outdir, args.formats, args.jobs, args.resolution,
+        args.supersample, args.settings, not args.quiet, args.simplify,
+        None if args.cache else False, args.chunksize
+    )
+    if not args.quiet:
+        print(f'Rendered {len(files) - len(failed)} of {len(files)} files')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
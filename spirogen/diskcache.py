@@ -0,0 +1,247 @@
+"""
+On-disk cache of generated paths.
+
+Heavy presets take far longer to generate than to read back, and the same
+ones get generated again every time they are loaded, run or batch
+rendered. A DiskCache stores each generated PathCollection as .npy files in
+a folder named after a hash of its key (pipeline.geometry_key) and of the
+source of the modules that generate paths (GEOMETRY_MODULES), so editing
+the generators never returns stale paths, while editing anything else
+(the interface, renderers, command lines) keeps the cache. Reading an entry memory-maps its arrays instead of reading
+them in, so a cached pattern is ready in the time it takes to open a few
+files, and only the parts that get used are read from disk.
+
+Entries are written to a temporary folder and renamed into place, so any
+number of processes (the interface, its jobs, batch workers) can share a
+cache. When the cache grows past its size limit, the entries that were
+used least recently are deleted.
+
+The cache lives in ~/.cache/spirogen/geometry, or the folder in the
+SPIROGEN_CACHE environment variable. Setting SPIROGEN_CACHE to an empty
+string turns it off.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from spirogen import stream
+from spirogen.paths import PathCollection
+
+DEFAULT_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'spirogen', 'geometry'
+)
+
+# the arrays of a PathCollection that are saved when they aren't None
+ARRAYS = ('points', 'offsets', 'colors', 'pensizes', 'groups')
+
+# the spirogen modules whose code can change the paths generated for a key
+GEOMETRY_MODULES = (
+    'spirogen', 'geometry', 'paths', 'palette', 'parallel', 'stream',
+    'analysis', 'spatial', 'resample', 'pointcloud'
+)
+
+# bump this when pipeline.generate_paths changes what it makes from a
+# pattern, so entries saved before are no longer used
+VERSION = 1
+
+_codeversion = None
+
+
+def codeversion():
+    """
+    Returns:
+        a hex digest of VERSION and the source of GEOMETRY_MODULES, which
+        changes whenever any of the code that could generate paths does
+    """
+    global _codeversion
+    if _codeversion is None:
+        folder = os.path.dirname(os.path.abspath(__file__))
+        digest = hashlib.sha1(str(VERSION).encode())
+        for name in GEOMETRY_MODULES:
+            with open(os.path.join(folder, f'{name}.py'), 'rb') as file:
+                digest.update(name.encode())
+                digest.update(file.read())
+        _codeversion = digest.hexdigest()
+    return _codeversion
+
+
+class DiskCache:
+    """
+    A folder of cached PathCollections.
+    Args:
+        folder: where to keep them. It is created when something is saved.
+        maxbytes: total size the cache is trimmed back to when it's exceeded
+    """
+    def __init__(self, folder=DEFAULT_PATH, maxbytes=1 << 30):
+        self.folder = folder
+        self.maxbytes = maxbytes
+
+    def path(self, key):
+        """
+        Returns:
+            the folder the entry for key is stored in
+        """
+        name = hashlib.sha1(f'{codeversion()}:{key}'.encode()).hexdigest()
+        return os.path.join(self.folder, name)
+
+    def get(self, key):
+        """
+        Returns:
+            the PathCollection saved under key with memory-mapped arrays, or
+            None if there isn't one. Changing the arrays doesn't change the
+            cache.
+        """
+        path = self.path(key)
+        try:
+            with open(os.path.join(path, 'meta.json'), 'r') as file:
+                meta = json.load(file)
+            arrays = {
+                name: np.load(os.path.join(path, f'{name}.npy'),
+                              mmap_mode='c')
+                for name in meta['arrays']
+            }
+        except (OSError, ValueError):
+            # not cached, or deleted by another process while reading it
+            return None
+        try:
+            os.utime(path)  # marks it as recently used
+        except OSError:
+            pass
+        return PathCollection(depth=meta['depth'], **arrays)
+
+    def put(self, key, coll):
+        """
+        Saves a PathCollection under key, then trims the cache if it has
+        grown too big.
+        """
+        path = self.path(key)
+        if os.path.exists(path):
+            return
+        temp = self._tempfolder()
+        try:
+            arrays = [name for name in ARRAYS
+                      if getattr(coll, name) is not None]
+            for name in arrays:
+                np.save(os.path.join(temp, f'{name}.npy'),
+                        getattr(coll, name))
+        except OSError:
+            shutil.rmtree(temp, ignore_errors=True)
+            return
+        self._commit(temp, key, coll.depth, arrays)
+
+    def stream(self, key, chunks):
+        """
+        Passes the chunks of a stream.Strands or stream.Chunks through while
+        saving them under key. They are copied straight into memory-mapped
+        files, so the whole collection never has to be in memory at once.
+        The entry is only added once every chunk has been used.
+        Args:
+            key: the key to save the collection under
+            chunks: stream.Strands or stream.Chunks
+
+        Yields:
+            the chunks
+        """
+        if chunks.depth != 2 or os.path.exists(self.path(key)):
+            yield from chunks
+            return
+        temp = self._tempfolder()
+        complete = False
+        try:
+            buffer = stream.PathBuffer(chunks.npoints, chunks.npaths, temp)
+            for chunk in chunks:
+                buffer.append(chunk)
+                yield chunk
+            complete = buffer.full
+            buffer.flush()
+            del buffer  # the files are only closed once nothing maps them
+        finally:
+            if not complete:  # stopped early, or something went wrong
+                shutil.rmtree(temp, ignore_errors=True)
+        if complete:
+            self._commit(temp, key, 2, ['points', 'offsets'])
+
+    def _tempfolder(self):
+        # entries are written in here, then renamed into place
+        os.makedirs(self.folder, exist_ok=True)
+        return tempfile.mkdtemp(dir=self.folder, prefix='.partial-')
+
+    def _commit(self, temp, key, depth, arrays):
+        # moves a finished entry into place, then trims the cache
+        try:
+            with open(os.path.join(temp, 'meta.json'), 'w') as file:
+                json.dump({'key': key, 'depth': depth, 'arrays': arrays},
+                          file, indent=2)
+            os.replace(temp, self.path(key))
+        except OSError:
+            # most likely another process saved the same entry first
+            shutil.rmtree(temp, ignore_errors=True)
+            return
+        self.trim()
+
+    def entries(self):
+        """
+        Returns:
+            list of (last used time, size in bytes, path) for every entry
+        """
+        entries = []
+        try:
+            names = os.listdir(self.folder)
+        except OSError:
+            return entries
+        for name in names:
+            if name.startswith('.'):
+                continue
+            path = os.path.join(self.folder, name)
+            try:
+                size = sum(entry.stat().st_size for entry in os.scandir(path))
+                entries.append((os.stat(path).st_mtime, size, path))
+            except OSError:
+                continue
+        return entries
+
+    def size(self):
+        """
+        Returns:
+            total size of the cache in bytes
+        """
+        return sum(size for _, size, _ in self.entries())
+
+    def trim(self, maxbytes=None):
+        """
+        Deletes the least recently used entries until the cache is no bigger
+        than maxbytes (the cache's own limit by default).
+        Returns:
+            number of entries deleted
+        """
+        if maxbytes is None:
+            maxbytes = self.maxbytes
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= maxbytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        return self.trim(0)
+
+
+def default():
+    """
+    Returns:
+        the DiskCache set up by the SPIROGEN_CACHE environment variable, or
+        None if it is turned off
+    """
+    folder = os.environ.get('SPIROGEN_CACHE', DEFAULT_PATH)
+    if not folder:
+        return None
+    return DiskCache(folder)
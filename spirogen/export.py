@@ -0,0 +1,291 @@
+"""
+Vector export for SpiroGen patterns.
+
+Writes the same coordinate lists that DrawPath draws to SVG or PDF. The file
+is streamed out run by run as the paths are read, so nothing bigger than the
+current color run is kept in memory. Consecutive runs that share a color and
+width are merged into one <path> element (or one stroke operation in PDF), and
+coordinates are written with a fixed number of decimal places.
+"""
+import os
+
+import numpy as np
+from PIL import ImageColor
+
+from spirogen.render import runs
+
+
+def formatpoints(points, precision=2):
+    """
+    Formats points as 'x,y x,y ...' rounded to precision decimal places, with
+    no trailing '.0' on whole numbers.
+    Args:
+        points: (n, 2) array
+        precision: number of decimal places to keep
+
+    Returns:
+        string of space separated coordinate pairs
+    """
+    points = np.round(points, precision) + 0.0  # + 0.0 turns -0.0 into 0.0
+    if precision <= 0:
+        points = points.astype(np.int64)
+    text = ' '.join(','.join(pair) for pair in points.astype(str).tolist())
+    if precision > 0:
+        text = text.replace('.0,', ',').replace('.0 ', ' ')
+        if text.endswith('.0'):
+            text = text[:-2]
+    return text
+
+
+class VectorWriter:
+    """
+    Base class for the streaming vector writers. Runs are buffered only until
+    the color or width changes, then written out as one stroke.
+    Args:
+        file: filename or open binary file object
+        resolution: (width, height) of the page
+        background: background color, or None for a transparent background
+        precision: number of decimal places to write coordinates with
+        scale: multiplier from pattern coordinates (and pen sizes) to page
+            units. Pattern coordinates are turtle coordinates, with (0, 0) in
+            the center and y going up.
+    """
+    def __init__(self, file, resolution=(1920, 1200), background='black',
+                 precision=2, scale=1):
+        self.resolution = (resolution[0], resolution[1])
+        self.background = background
+        self.precision = precision
+        self.scale = scale
+        self._ownsfile = isinstance(file, (str, os.PathLike))
+        self._file = open(file, 'wb') if self._ownsfile else file
+        self._style = None  # (color, width) of the buffered stroke
+        self._chunks = []
+        self._last = None  # last point of the buffered stroke
+        self.header()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, text):
+        self._file.write(text.encode('latin-1'))
+
+    def topage(self, points):
+        """
+        Converts pattern coordinates to page coordinates. Overridden by
+        formats whose y axis points down.
+        """
+        return np.asarray(points, dtype=float).reshape(-1, 2) * self.scale
+
+    def line(self, points, color='white', pensize=1):
+        """
+        Adds a polyline in one color. It is merged into the current stroke if
+        the color and width match, and continues it without a new subpath if
+        it starts where the last one ended.
+        """
+        if len(points) < 2:
+            return
+        style = (color, float(pensize) * self.scale)
+        if style != self._style:
+            self.flush()
+            self._style = style
+        points = self.topage(points)
+        end = points[-1].copy()
+        if self._last is not None and np.allclose(
+                points[0], self._last, atol=0.5 * 10 ** -self.precision):
+            self._chunks.append(self.lineto(points[1:]))
+        else:
+            self._chunks.append(self.moveto(points))
+        self._last = end
+
+    def paths(self, coordlist, colors='white', pensize=1, colorby=None,
+              first=0):
+        """
+        Adds a coordinate list of any depth, like DrawPath does. The
+        arguments are the same as for render.runs().
+        """
+        for points, color, width in runs(coordlist, colors, pensize, colorby,
+                                         first):
+            self.line(points, color, width)
+
+    def flush(self):
+        """
+        Writes out the buffered stroke.
+        """
+        if self._chunks:
+            self.stroke(self._chunks, *self._style)
+        self._chunks = []
+        self._style = None
+        self._last = None
+
+    def close(self):
+        if self._file is None:
+            return
+        self.flush()
+        self.footer()
+        if self._ownsfile:
+            self._file.close()
+        self._file = None
+
+    # format specific parts
+    def header(self):
+        raise NotImplementedError
+
+    def footer(self):
+        raise NotImplementedError
+
+    def moveto(self, points):
+        raise NotImplementedError
+
+    def lineto(self, points):
+        raise NotImplementedError
+
+    def stroke(self, chunks, color, width):
+        raise NotImplementedError
+
+
+class SVGWriter(VectorWriter):
+    """
+    Streams paths to an SVG file. The arguments are as for VectorWriter.
+    """
+    def topage(self, points):
+        points = super().topage(points)
+        points[:, 0] += self.resolution[0] / 2
+        points[:, 1] = self.resolution[1] / 2 - points[:, 1]
+        return points
+
+    def header(self):
+        width, height = self.resolution
+        self.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+            f'height="{height}" viewBox="0 0 {width} {height}">\n'
+        )
+        if self.background is not None:
+            self.write(
+                f'<rect width="100%" height="100%" '
+                f'fill="{self.background}"/>\n'
+            )
+        self.write(
+            '<g fill="none" stroke-linecap="round" stroke-linejoin="round">\n'
+        )
+
+    def footer(self):
+        self.write('</g>\n</svg>\n')
+
+    def moveto(self, points):
+        return 'M' + formatpoints(points, self.precision)
+
+    def lineto(self, points):
+        return formatpoints(points, self.precision)
+
+    def stroke(self, chunks, color, width):
+        self.write(f'<path stroke="{color}" stroke-width="{width:g}" d="')
+        self.write(chunks[0])
+        for chunk in chunks[1:]:
+            self.write(' ')
+            self.write(chunk)
+        self.write('"/>\n')
+
+
+class PDFWriter(VectorWriter):
+    """
+    Streams paths to a single page PDF. The page content is written straight
+    into one stream object whose length is filled in by an object written
+    after it, so the file is still produced in one pass. The arguments are as
+    for VectorWriter, with resolution in points.
+    """
+    def topage(self, points):
+        points = super().topage(points)
+        points[:, 0] += self.resolution[0] / 2
+        points[:, 1] += self.resolution[1] / 2
+        return points
+
+    def write(self, text):
+        data = text.encode('latin-1')
+        self._file.write(data)
+        self._offset += len(data)
+
+    def _object(self, number):
+        self._xref[number] = self._offset
+        self.write(f'{number} 0 obj\n')
+
+    def _rgb(self, color):
+        rgb = ImageColor.getrgb(color)[:3]
+        return ' '.join(f'{c / 255:.4g}' for c in rgb)
+
+    def header(self):
+        width, height = self.resolution
+        self._offset = 0
+        self._xref = {}
+        self.write('%PDF-1.4\n')
+        self._object(1)
+        self.write('<< /Type /Catalog /Pages 2 0 R >>\nendobj\n')
+        self._object(2)
+        self.write('<< /Type /Pages /Kids [3 0 R] /Count 1 >>\nendobj\n')
+        self._object(3)
+        self.write(
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width} {height}] '
+            '/Contents 4 0 R /Resources << >> >>\nendobj\n'
+        )
+        self._object(4)
+        self.write('<< /Length 5 0 R >>\nstream\n')
+        self._streamstart = self._offset
+        if self.background is not None:
+            self.write(
+                f'{self._rgb(self.background)} rg 0 0 {width} {height} re f\n'
+            )
+        self.write('1 J 1 j\n')  # round caps and joins, like turtle
+
+    def footer(self):
+        length = self._offset - self._streamstart
+        self.write('endstream\nendobj\n')
+        self._object(5)
+        self.write(f'{length}\nendobj\n')
+        xref = self._offset
+        self.write('xref\n0 6\n0000000000 65535 f \n')
+        for number in range(1, 6):
+            self.write(f'{self._xref[number]:010d} 00000 n \n')
+        self.write(
+            f'trailer\n<< /Size 6 /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'
+        )
+
+    def moveto(self, points):
+        ops = self.lineto(points)
+        end = ops.find('\n')
+        return ops[:end - 1] + 'm' + ops[end:] if end > 0 else ops[:-1] + 'm'
+
+    def lineto(self, points):
+        # 'x,y x,y' -> 'x y l\nx y l'
+        pairs = formatpoints(points, self.precision)
+        return pairs.replace(' ', ' l\n').replace(',', ' ') + ' l'
+
+    def stroke(self, chunks, color, width):
+        self.write(f'{self._rgb(color)} RG {width:g} w\n')
+        for chunk in chunks:
+            self.write(chunk)
+            self.write('\n')
+        self.write('S\n')
+
+
+WRITERS = {'.svg': SVGWriter, '.pdf': PDFWriter}
+
+
+def export(coordlist, filename, colors='white', pensize=1, background='black',
+           resolution=(1920, 1200), precision=2, scale=1, colorby=None):
+    """
+    Writes a coordinate list to an SVG or PDF file in one call.
+    Args:
+        coordlist: single path, list of paths, or list of groups of paths
+        filename: output file, the format is picked from the extension
+        the rest are as for VectorWriter and render.runs
+    """
+    extension = os.path.splitext(str(filename))[1].lower()
+    if extension not in WRITERS:
+        raise ValueError(f"Can't export to '{extension}' files. Use one of "
+                         f"{', '.join(WRITERS)}")
+    with WRITERS[extension](filename, resolution, background, precision,
+                            scale) as writer:
+        writer.paths(coordlist, colors, pensize, colorby)
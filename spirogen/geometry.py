@@ -0,0 +1,434 @@
+"""
+Headless geometry for SpiroGen patterns.
+
+Everything in here reproduces the points the turtle cursor used to visit
+while a pattern was being built (begin_poly/get_poly), but computes them with
+NumPy instead of moving the global turtle, so no Tk window is ever needed.
+Positions are tracked as complex numbers (x + yj) and returned as (N, 2)
+float arrays.
+"""
+from fractions import Fraction
+from math import radians, sin, cos
+import numpy as np
+
+# For each number of angles, the turncycle values that make an angle repeat
+# itself before moving on to the next one in the cycle.
+TURNCYCLE_REPEATS = {
+    1: [()],
+    2: [(1, 5), (2, 5)],
+    3: [(1, 5), (2, 5, 6), (3, 6)],
+    4: [(1, 5, 8), (2, 5, 6, 8, 9), (3, 6, 7, 8, 9), (4, 7, 9)],
+}
+
+
+def xy(points):
+    """
+    Converts a sequence of complex positions to an (N, 2) array of x, y
+    """
+    points = np.asarray(points, dtype=complex)
+    return np.column_stack((points.real, points.imag))
+
+
+def tuples(points):
+    """
+    Converts an (N, 2) array to the list of (x, y) tuples the pattern classes
+    pass around.
+    """
+    return [tuple(p) for p in np.asarray(points, dtype=float).tolist()]
+
+
+def ndim(coordlist):
+    """
+    np.ndim for coordinate lists, following the first element down instead
+    of building an array, which fails on lists of paths of different
+    lengths.
+    """
+    if isinstance(coordlist, np.ndarray):
+        return coordlist.ndim
+    if isinstance(coordlist, (list, tuple)):
+        return 1 + (ndim(coordlist[0]) if len(coordlist) else 0)
+    return 0
+
+
+def circle(radius, steps, start=(0, 0), heading=0):
+    """
+    Points visited by turtle.circle(radius, steps=steps) starting from start.
+    Args:
+        radius: radius of the circle. The center is radius units to the left
+            of the starting heading.
+        steps: number of sides of the inscribed polygon
+        start: starting (x, y) position, which is also the first point
+        heading: starting heading in degrees
+
+    Returns:
+        (steps + 1, 2) array of points
+    """
+    w = 360 / steps
+    w2 = 0.5 * w
+    length = 2.0 * radius * sin(radians(w2))
+    if radius < 0:
+        length, w, w2 = -length, -w, -w2
+    headings = np.radians(heading + w2 + w * np.arange(steps))
+    moves = np.empty(steps + 1, dtype=complex)
+    moves[0] = complex(*start)
+    moves[1:] = length * np.exp(1j * headings)
+    return xy(np.cumsum(moves))
+
+
+def times_table(ring, range_, multby):
+    """
+    The path a TimesTable traces across its ring: from each point i to the
+    point at i * multby, for every i in range_.
+    Args:
+        ring: (N, 2) array of the points around the circle
+        range_: number of lines to draw
+        multby: the multiplier
+
+    Returns:
+        (2 * range_ + 1, 2) array of points, starting at the first ring point
+    """
+    ring = np.asarray(ring, dtype=float)
+    n = len(ring)
+    i = np.arange(range_)
+    path = np.empty((2 * range_ + 1, 2))
+    path[0] = ring[0]
+    path[1::2] = ring[i % n]
+    path[2::2] = ring[(i * multby).astype(int) % n]
+    return path
+
+
+def cascade_lines(lengths, dists, start=(0, 0)):
+    """
+    The horizontal lines of a CascadeLines pattern before rotation.
+    Args:
+        lengths: length of each line
+        dists: distance below start of each line
+        start: (x, y) position the lines are centered under
+
+    Returns:
+        (nlines, 2, 2) array, each line being its two endpoints
+    """
+    lengths = np.asarray(lengths, dtype=float)
+    dists = np.asarray(dists, dtype=float)
+    lines = np.empty((len(lengths), 2, 2))
+    lines[:, 0, 0] = start[0] - (lengths / 2)
+    lines[:, :, 1] = (start[1] - dists)[:, None]
+    lines[:, 1, 0] = lines[:, 0, 0] + lengths
+    return lines
+
+
+def turn_moves(angle, curve=0):
+    """
+    The (distance, turn) moves that Pattern.turn makes for a single turn.
+    Curved turns are split into roughly 10 degree pieces with a forward step
+    of length curve before each piece.
+    """
+    if curve is None or curve == 0:
+        return [(None, angle)]
+    reps = round(abs(angle) / 10)
+    if reps == 0:
+        reps = 1
+    turn = abs(angle) / reps
+    if angle < 0:
+        turn = -turn
+    return [(curve, turn)] * reps
+
+
+def cycle_moves(size, angles, turncycle=0, jank=None):
+    """
+    The (distance, turn) moves that make up a single cycle of a
+    RadialAngularPattern.
+    Args:
+        size: length of each side
+        angles: list of [angle, curve] pairs
+        turncycle: which angles are repeated within each cycle
+        jank: extra forward distance at the end of every cycle
+
+    Returns:
+        list of (distance, turn) tuples. A distance of None is a turn in place
+        and a turn of None is a move without turning.
+    """
+    moves = []
+    repeats = TURNCYCLE_REPEATS[len(angles)]
+    for n, angle in enumerate(angles):
+        count = 2 if turncycle in repeats[n] else 1
+        for _ in range(count):
+            moves.append((size, None))
+            moves += turn_moves(*angle)
+    if jank is not None and len(angles) > 1:
+        moves.append((jank, None))
+    return moves
+
+
+def cycle_path(moves, heading=0):
+    """
+    Traces a single cycle of moves from the origin.
+    Args:
+        moves: list of (distance, turn) tuples from cycle_moves
+        heading: starting heading in degrees
+
+    Returns:
+        (offsets, totalturn) where offsets is a complex array of every point
+        visited relative to the start of the cycle, and totalturn is how far
+        the heading turned clockwise over the cycle, in degrees.
+    """
+    distances = np.array(
+        [np.nan if d is None else d for d, _ in moves], dtype=float
+    )
+    turns = np.array([0 if t is None else t for _, t in moves], dtype=float)
+    # heading before each move is the starting heading minus every turn so far
+    headings = heading - (np.cumsum(turns) - turns)
+    stepping = ~np.isnan(distances)
+    steps = distances[stepping] * np.exp(1j * np.radians(headings[stepping]))
+    return np.cumsum(steps), turns.sum()
+
+
+def cycle_starts(displacement, totalturn, ncycles, origin=0j, first=0):
+    """
+    Where each cycle begins when a cycle moves the cursor by displacement and
+    turns it by totalturn degrees clockwise.
+    Args:
+        displacement: complex displacement of the first cycle
+        totalturn: clockwise turn per cycle in degrees
+        ncycles: number of cycle starts to compute
+        origin: complex starting position
+        first: index of the first cycle to compute
+
+    Returns:
+        (starts, orients) complex arrays for cycles first to ncycles - 1, the
+        position and unit heading vector at the beginning of each cycle
+    """
+    k = np.arange(first, ncycles)
+    orients = np.exp(-1j * np.radians(totalturn * k))
+    rotation = np.exp(-1j * np.radians(totalturn))
+    if abs(1 - rotation) < 1e-12:
+        travelled = k
+    else:
+        travelled = (1 - orients) / (1 - rotation)
+    return origin + displacement * travelled, orients
+
+
+def closing_cycle(displacement, totalturn, origin=0j, tolerance=0.5,
+                  maxcycles=10000):
+    """
+    Works out how many cycles it takes for a repeated cycle of moves to come
+    back to where it started. The heading only returns to its start after a
+    whole number of full turns, so the period is the denominator of
+    totalturn / 360 as a fraction. Only the cycle ends up to that period are
+    checked, and if none of them close (the turn isn't a tidy fraction), the
+    remaining cycles up to maxcycles are checked and the closest one is used.
+    Args:
+        displacement: complex displacement of the first cycle
+        totalturn: clockwise turn per cycle in degrees
+        origin: complex starting position
+        tolerance: how close (in x and y) a cycle has to end to the start to
+            count as closed
+        maxcycles: the most cycles to allow
+
+    Returns:
+        (ncycles, closed), the number of cycles to trace and whether the last
+        one ends back on the start
+    """
+    period = Fraction(totalturn / 360).limit_denominator(maxcycles).denominator
+    period = min(period, maxcycles)
+    ends, _ = cycle_starts(displacement, totalturn, period + 1, origin, 1)
+    misses = np.maximum(abs((ends - origin).real), abs((ends - origin).imag))
+    hits = np.flatnonzero(misses < tolerance)
+    if len(hits):
+        return hits[0] + 1, True
+
+    ends, _ = cycle_starts(
+        displacement, totalturn, maxcycles + 1, origin, period + 1
+    )
+    misses = np.concatenate((misses, np.maximum(
+        abs((ends - origin).real), abs((ends - origin).imag)
+    )))
+    hits = np.flatnonzero(misses < tolerance)
+    if len(hits):
+        return hits[0] + 1, True
+    return np.argmin(misses) + 1, False
+
+
+def radial_angular(size, angles, turncycle=0, jank=None, start=(0, 0),
+                   heading=0, maxcycles=10000, tolerance=0.5):
+    """
+    Traces a RadialAngularPattern: the cycle of moves is repeated until the
+    cursor comes back to the starting point (see closing_cycle). Each cycle
+    is the first one rotated and shifted, so the whole path is computed at
+    once instead of one turtle step at a time.
+    Args:
+        size: length of each side
+        angles: list of [angle, curve] pairs
+        turncycle: which angles are repeated within each cycle
+        jank: extra forward distance at the end of every cycle
+        start: (x, y) starting position
+        heading: starting heading in degrees
+        maxcycles: the most cycles to trace before giving up on closing
+        tolerance: how close a cycle has to end to the start to count as
+            closed
+
+    Returns:
+        (N, 2) array of every point visited, ending on start if it closed
+    """
+    moves = cycle_moves(size, angles, turncycle, jank)
+    offsets, totalturn = cycle_path(moves, heading)
+    origin = complex(*start)
+    ncycles, closed = closing_cycle(
+        offsets[-1], totalturn, origin, tolerance, maxcycles
+    )
+    starts, orients = cycle_starts(offsets[-1], totalturn, ncycles, origin)
+    points = starts[:, None] + orients[:, None] * offsets[None, :]
+    points = np.concatenate(([origin], points.ravel()))
+    if closed:
+        points = np.append(points, origin)
+    return xy(points)
+
+
+def scale_matrix(x=1, y=None):
+    """
+    3x3 affine matrix scaling about the origin. y defaults to x.
+    """
+    if y is None:
+        y = x
+    return np.array([[x, 0, 0], [0, y, 0], [0, 0, 1]], dtype=float)
+
+
+def shift_matrix(x=0, y=0):
+    """
+    3x3 affine matrix translating by x, y
+    """
+    return np.array([[1, 0, x], [0, 1, y], [0, 0, 1]], dtype=float)
+
+
+def rotation_matrix(angle, center=(0, 0), clockwise=False):
+    """
+    3x3 affine matrix rotating by angle degrees about center.
+    Args:
+        angle: degrees to rotate, counterclockwise unless clockwise is True
+        center: (x, y) point to rotate around
+        clockwise: rotate clockwise instead
+
+    Returns:
+        3x3 array
+    """
+    return rotation_matrices([angle], center, clockwise)[0]
+
+
+def rotation_matrices(angles, center=(0, 0), clockwise=False):
+    """
+    A stack of 3x3 affine matrices, one rotation about center per angle.
+
+    Returns:
+        (len(angles), 3, 3) array
+    """
+    rads = np.radians(np.asarray(angles, dtype=float))
+    if clockwise:
+        rads = -rads
+    c, s = np.cos(rads), np.sin(rads)
+    x0, y0 = center[0], center[1]
+    matrices = np.zeros((len(rads), 3, 3))
+    matrices[:, 0, 0] = c
+    matrices[:, 0, 1] = -s
+    matrices[:, 0, 2] = x0 - (x0 * c) + (y0 * s)
+    matrices[:, 1, 0] = s
+    matrices[:, 1, 1] = c
+    matrices[:, 1, 2] = y0 - (x0 * s) - (y0 * c)
+    matrices[:, 2, 2] = 1
+    return matrices
+
+
+def reflection_matrix(x=False, y=False):
+    """
+    3x3 affine matrix reflecting across the x axis (negating y) and/or the
+    y axis (negating x).
+    """
+    return scale_matrix(-1 if y else 1, -1 if x else 1)
+
+
+def apply_matrix(points, matrix, out=None):
+    """
+    Applies a 3x3 affine matrix to an (N, 2) array of points.
+    Args:
+        points: (N, 2) array
+        matrix: 3x3 affine matrix
+        out: optional (N, 2) array to write the result to. This can be points
+            itself to transform in place.
+
+    Returns:
+        the transformed (N, 2) array
+    """
+    points = np.asarray(points, dtype=float)
+    result = points @ matrix[:2, :2].T
+    result += matrix[:2, 2]
+    if out is None:
+        return result
+    out[...] = result
+    return out
+
+
+def stack_paths(paths):
+    """
+    Packs a list of paths of any lengths into one array.
+    Args:
+        paths: list of paths, each a list of (x, y) or an (n, 2) array
+
+    Returns:
+        (points, offsets) where points is the (N, 2) array of every point and
+        path i is points[offsets[i]:offsets[i + 1]]
+    """
+    paths = [np.asarray(p, dtype=float).reshape(-1, 2) for p in paths]
+    offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+    np.cumsum([len(p) for p in paths], out=offsets[1:])
+    if not paths:
+        return np.empty((0, 2)), offsets
+    return np.concatenate(paths), offsets
+
+
+def split_paths(points, offsets):
+    """
+    The reverse of stack_paths. The paths returned are views into points.
+    """
+    return [points[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+def repeat_paths(points, offsets, n):
+    """
+    Stacks n copies of a set of stacked paths one after the other.
+
+    Returns:
+        (points, offsets) for the n * (len(offsets) - 1) paths
+    """
+    total = offsets[-1]
+    points = np.tile(points, (n, 1))
+    starts = (offsets[:-1] + (total * np.arange(n))[:, None]).ravel()
+    return points, np.append(starts, n * total)
+
+
+def transform_paths(points, matrices, offsets=None, out=None):
+    """
+    Applies a different 3x3 affine matrix to each path in a stack of paths,
+    all in one go.
+    Args:
+        points: either an (N, 2) array of stacked paths with offsets (see
+            stack_paths), or a padded (P, L, 2) array of P paths of length L
+        matrices: (P, 3, 3) array with one matrix per path
+        offsets: path boundaries into points when they are stacked
+        out: optional array shaped like points to write the result to. This
+            can be points itself to transform in place.
+
+    Returns:
+        the transformed points, shaped like points
+    """
+    points = np.asarray(points, dtype=float)
+    matrices = np.asarray(matrices, dtype=float)
+    if offsets is None:
+        result = np.einsum('pij,plj->pli', matrices[:, :2, :2], points)
+        result += matrices[:, None, :2, 2]
+    else:
+        owner = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+        result = np.einsum('nij,nj->ni', matrices[owner, :2, :2], points)
+        result += matrices[owner, :2, 2]
+    if out is None:
+        return result
+    out[...] = result
+    return out
@@ -0,0 +1,82 @@
+"""
+Checks how long the spirogen modules take to import.
+
+Each module is imported in a fresh interpreter, so nothing is already loaded,
+and the time is compared against a budget. It also checks that the modules
+kept out of the import path (matplotlib and scipy, see lazy.py) haven't crept
+back in. Run it with:
+
+    python -m spirogen.importbudget
+
+It prints a line per module and exits with 1 if anything is over budget.
+"""
+import subprocess
+import sys
+
+# seconds each module may take to import, with nothing already loaded
+BUDGETS = {
+    'spirogen.spirogen': 0.5,
+    'spirogen.pipeline': 0.6,
+    'spirogen.interface': 0.75,
+}
+
+# modules that should only be imported when they are actually used
+DEFERRED = ('matplotlib', 'scipy')
+
+SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+print(' '.join(sorted({{m.split('.')[0] for m in sys.modules}})))
+"""
+
+
+def measure(module, repeat=3):
+    """
+    Imports a module in new interpreters and times it.
+    Args:
+        module: full dotted name of the module
+        repeat: number of times to import it. The fastest is kept, as the
+            first is often slowed down by compiling or a cold disk cache.
+
+    Returns:
+        (seconds, set of the top level modules it loaded)
+    """
+    times = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-c', SCRIPT.format(module=module)],
+            capture_output=True, text=True, check=True
+        )
+        seconds, loaded = result.stdout.strip().split('\n')
+        times.append(float(seconds))
+    return min(times), set(loaded.split())
+
+
+def check(budgets=None, repeat=3):
+    """
+    Measures every module in budgets and prints how each did.
+
+    Returns:
+        True if every module imported within its budget without loading
+        any of the DEFERRED modules
+    """
+    if budgets is None:
+        budgets = BUDGETS
+    ok = True
+    for module, budget in budgets.items():
+        seconds, loaded = measure(module, repeat)
+        deferred = sorted(loaded.intersection(DEFERRED))
+        passed = seconds <= budget and not deferred
+        ok = ok and passed
+        line = f'{"ok  " if passed else "FAIL"} {module:<22} ' \
+               f'{seconds:.3f}s / {budget:.3f}s'
+        if deferred:
+            line += f'  imported {", ".join(deferred)}'
+        print(line)
+    return ok
+
+
+if __name__ == '__main__':
+    sys.exit(0 if check() else 1)
@@ -7,8 +7,9 @@ Purpose: This is the Root of the SpiroGen application interface.
 Input: None
 Output: None, the application opens
 """
-from tkinter import Frame, Button, ttk, Tk, Menu
+from tkinter import Frame, Button, ttk, Tk, Menu, Label, StringVar
 from spirogen import spirogen as spiro
+from spirogen import jobs, pipeline
 from spirogen.interface.PatternTab import PatternTab
 from spirogen.interface.ColorSchemeTab import ColorSchemeTab
 from spirogen.interface.Dialogs import SaveDialog, LoadDialog
@@ -46,6 +47,10 @@ class Application(ttk.Notebook):
 
         self._patterntab = PatternTab(self)  # create the pattern control tab
         self._colorschemetab = ColorSchemeTab(self)  # create the colors tab
+        # paths of recent patterns, so changing only colors or pen size
+        # doesn't generate them again
+        self._geometry = pipeline.GeometryCache()
+        self._patterntab.setup_preview(self._colorschemetab, self._geometry)
 
         # add both tabs to the notebook:
         self.add(self._patterntab, text="Pattern")
@@ -57,10 +62,16 @@ class Application(ttk.Notebook):
 
         self._settingspath = './spirogen/interface/settings/'
 
+        # patterns are generated in another process so the controls stay
+        # usable, then drawn a piece at a time (see run)
+        self._runner = jobs.Runner()
+        self._drawing = None
+        self._status = StringVar()
+
         # create a frame for the load, save, and run buttons
         button_area = Frame(self)
 
-        # create those three buttons:
+        # create those buttons, and a label for how the run is going:
         getbutton = Button(
             button_area, text="Load", command=self.open_load_dialog
         )
@@ -68,11 +79,15 @@ class Application(ttk.Notebook):
             button_area, text="Save", command=self.open_save_dialog
         )
         runbutton = Button(button_area, text="Run", command=self.run)
+        stopbutton = Button(button_area, text="Stop", command=self.stop)
+        statuslabel = Label(button_area, textvariable=self._status)
 
-        # add those three buttons to the button frame
-        runbutton.pack(side="right", padx=40, pady=20)
+        # add them to the button frame
+        runbutton.pack(side="right", padx=(0, 40), pady=20)
+        stopbutton.pack(side="right", padx=20, pady=20)
         savebutton.pack(side="left", padx=40, pady=20)
         getbutton.pack(side="left", padx=0, pady=20)
+        statuslabel.pack(side="left", fill='x', expand=True)
 
         # add the button frame to the bottom of the window
         button_area.pack(side="bottom", fill='x')
@@ -232,9 +247,63 @@ class Application(ttk.Notebook):
             print('Name not found. Try another mode, or a different name.')
 
     def run(self):
+        # starts generating the pattern in the background, replacing any run
+        # that is still going. check_run picks it up when it's ready.
+        self._drawing = None
+        self._runner.cancel()
+        pattern = self._patterntab.pattern()
+        colorscheme = self._colorschemetab.colorscheme
+        paths = self._geometry.get(pattern)
+        if paths is not None:  # only the styling has changed
+            self.draw(pipeline.style(paths, pattern, colorscheme))
+            return
+        job = self._runner.submit(pipeline.generate_paths, pattern)
+        self.check_run(job, pattern, colorscheme)
+
+    def check_run(self, job, pattern, colorscheme):
+        if job is not self._runner.job:  # a newer run has replaced this one
+            return
+        if job.poll():
+            fraction, message = job.progress
+            self._status.set(f'{message}...')
+            self.after(50, self.check_run, job, pattern, colorscheme)
+        elif job.state == 'done':
+            self._geometry.put(pattern, job.result)
+            self.draw(pipeline.style(job.result, pattern, colorscheme))
+        elif job.state == 'failed':
+            message, trace = job.error
+            print(trace)
+            self._status.set(f'Failed: {message}')
+
+    def draw(self, drawing):
         try:
             self.setup_drawing()  # setup the window parameters
-            self._patterntab.run(self._colorschemetab.colorscheme)  # call the run method of the pattern tab, passing the colorscheme info
         except turtle.Terminator:  # turtle sometimes throws errors when you try to launch after clicking to exit the previous
-            self.setup_drawing()
-            self._patterntab.run(self._colorschemetab.colorscheme)  # Running it a second time when this happens works just fine
+            self.setup_drawing()  # Running it a second time when this happens works just fine
+        self._drawing = spiro.drawsteps(**drawing)
+        self.draw_step(self._drawing)
+
+    def draw_step(self, steps):
+        # draws the next piece of the pattern, then lets tkinter handle
+        # anything else that's waiting before drawing the one after
+        if steps is not self._drawing:  # stopped, or replaced by a new run
+            return
+        try:
+            fraction = next(steps)
+        except turtle.Terminator:  # the drawing window was closed
+            self._drawing = None
+            self._status.set('Stopped')
+            return
+        if fraction < 1:
+            self._status.set(f'Drawing {fraction:.0%}')
+            self.after(1, self.draw_step, steps)
+        else:
+            self._drawing = None
+            self._status.set('Done')
+
+    def stop(self):
+        if self._drawing is not None or (
+                self._runner.job is not None and self._runner.job.running):
+            self._status.set('Stopped')
+        self._runner.cancel()
+        self._drawing = None
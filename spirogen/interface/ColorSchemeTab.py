@@ -18,7 +18,7 @@ from spirogen.interface.Dialogs import ShiftLightnessDialog, \
     RampLightnessDialog, ColorSwatchDialog
 from spirogen.interface.ColorSwatch import ColorSwatch
 # from colorsys import hsv_to_rgb, rgb_to_hsv
-from matplotlib.colors import hsv_to_rgb, rgb_to_hsv
+from spirogen.palette import hsv_to_rgb, rgb_to_hsv
 from functools import partial
 from time import sleep
 
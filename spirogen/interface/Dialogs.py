@@ -13,11 +13,12 @@ Output:
     They all run the function that they are given when submit is clicked.
 """
 from tkinter import Frame, Toplevel, StringVar, Label, Entry, Button, IntVar, \
-    Radiobutton, Listbox
+    Radiobutton, Listbox, PhotoImage
+from spirogen import thumbnails
 from spirogen.interface.Parameter import Parameter
 import os
 import re
-from matplotlib.colors import rgb2hex, hex2color
+from spirogen.palette import rgb2hex, hex2color
 
 
 class ShiftLightnessDialog(Frame):
@@ -244,7 +245,10 @@ class ListAvailableDialog(Frame):
     """
     This dialog is launched from the loading dialog. It lists the names that
     are available to load. Clicking on one of the names fills the entry box
-    with that name.
+    with that name, and hovering over or clicking a name shows a thumbnail of
+    it. Thumbnails are cached (see thumbnails.py), and the ones that are
+    missing or out of date are rendered in the background while the dialog is
+    open.
     Args:
         namevar: the tk variable for the load dialog textbox. This is set based
             on the list item clicked.
@@ -257,9 +261,8 @@ class ListAvailableDialog(Frame):
         self.master.title(f"Loadable {type.capitalize()[:-1]} Names")
         self.pack(padx=30, pady=30)
 
-        files = os.listdir(
-            f'./spirogen/interface/settings/{type}'
-        )
+        folder = f'./spirogen/interface/settings/{type}'
+        files = os.listdir(folder)
         lbox = Listbox(self)
 
         endfiles = []
@@ -273,13 +276,66 @@ class ListAvailableDialog(Frame):
                     lbox.insert(i, name)
         for i, file in enumerate(endfiles):
             lbox.insert(i + len(files), file)
-        lbox.pack(fill="both")
+        lbox.pack(side='left', fill="both")
         lbox.bind('<<ListboxSelect>>', self.get_value)
+        lbox.bind('<Motion>', self.hover)
+
+        # the thumbnail of the name under the mouse, or the one picked:
+        width, height = thumbnails.SIZE
+        self._blank = PhotoImage(width=width, height=height)
+        self._preview = Label(
+            self, image=self._blank, text='', compound='center',
+            width=width, height=height, bg='black', fg='white'
+        )
+        self._preview.pack(side='left', padx=(20, 0))
+        self._shown = None
+        self._images = {}  # name: PhotoImage, or None if it failed
+
+        names = lbox.get(0, 'end')
+        self._paths = {os.path.join(folder, f'{n}.json'): n for n in names}
+        cache = thumbnails.ThumbnailCache(
+            os.path.join(thumbnails.CACHE_PATH, type),
+            settingspath='./spirogen/interface/settings'
+        )
+        self._builder = thumbnails.ThumbnailBuilder(cache, self._paths)
+        self._builder.start()
+        self.bind('<Destroy>', lambda *x: self._builder.cancel())
+        self.check_thumbnails()
 
     def get_value(self, event):
         w = event.widget
         ind = int(w.curselection()[0])
         self.namevar.set(w.get(ind))
+        self.show(w.get(ind))
+
+    def hover(self, event):
+        w = event.widget
+        if w.size():
+            self.show(w.get(w.nearest(event.y)))
+
+    def show(self, name):
+        self._shown = name
+        if name not in self._images:
+            self._preview.configure(image=self._blank, text='Rendering...')
+        elif self._images[name] is None:
+            self._preview.configure(image=self._blank, text='No preview')
+        else:
+            self._preview.configure(image=self._images[name], text='')
+
+    def check_thumbnails(self):
+        # picks up the thumbnails the builder has finished since last time,
+        # and keeps checking until it is done
+        while not self._builder.results.empty():
+            path, thumbnail = self._builder.results.get()
+            name = self._paths[path]
+            if thumbnail is None:
+                self._images[name] = None
+            else:
+                self._images[name] = PhotoImage(file=thumbnail)
+            if name == self._shown:
+                self.show(name)
+        if self._builder.is_alive() or not self._builder.results.empty():
+            self.after(100, self.check_thumbnails)
 
 
 class ColorSwatchDialog(Frame):
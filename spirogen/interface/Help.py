@@ -20,10 +20,14 @@ Output:
 """
 from tkinter import Frame, Listbox, Toplevel, Label, Button, Message, Scrollbar
 from tkinter.font import Font
-from PIL import Image, ImageTk
+from spirogen import lazy
 from itertools import count
 import json
 
+# only needed once a help page with images is opened
+Image = lazy.module('PIL.Image')
+ImageTk = lazy.module('PIL.ImageTk')
+
 
 class HelpIndex(Frame):
     """
@@ -10,16 +10,94 @@ Output:
     save method outputs a dictionary to be saved as json
 """
 from tkinter import StringVar, BooleanVar, IntVar, OptionMenu, Label, Entry, \
-    Scale, Radiobutton, Widget
+    Scale, Radiobutton, Widget, Canvas, PhotoImage, Variable
 from spirogen.interface.Tab import Tab
 from spirogen.interface.Parameter import Parameter
-from spirogen import spirogen as spiro
-from spirogen.spirogen import LVL2, RadialAngularPattern, DrawPath
+from spirogen import jobs, pipeline
+import base64
+
+
+class Preview(Canvas):
+    """
+    A small preview of the pattern that is rendered in the background (see
+    pipeline.preview) whenever a setting changes. Changes only start a new
+    render once they have stopped for delay milliseconds, and a change while
+    one is still rendering replaces it, so the preview follows the sliders
+    without falling behind. Heavy patterns show a rough version first, which
+    is swapped for the full detail one when it's ready.
+    Args:
+        master: the PatternTab
+        getsettings: function that returns the (pattern, colorscheme,
+            background) to preview
+        geometry: pipeline.GeometryCache to reuse and keep generated paths in
+        size: (width, height) of the preview
+        delay: milliseconds to wait for changes to stop
+    """
+    def __init__(self, master, getsettings, geometry, size=(320, 200),
+                 delay=150):
+        super().__init__(
+            master, width=size[0], height=size[1], bg='black',
+            highlightthickness=0
+        )
+        self._getsettings = getsettings
+        self._geometry = geometry
+        self._size = size
+        self._delay = delay
+        self._runner = jobs.Runner()
+        self._pending = None  # the after() id of the next refresh
+        self._image = None  # tkinter drops images nothing refers to
+        self._imageitem = self.create_image(0, 0, anchor='nw')
+        self._statusitem = self.create_text(
+            5, size[1] - 5, anchor='sw', fill='gray'
+        )
+
+    def schedule(self, *args):
+        # (re)starts the wait before refreshing
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+        self._pending = self.after(self._delay, self.refresh)
+
+    def refresh(self):
+        self._pending = None
+        pattern, colorscheme, background = self._getsettings()
+        job = self._runner.submit(
+            pipeline.preview, pattern, colorscheme, background or 'black',
+            self._size, paths=self._geometry.get(pattern)
+        )
+        self.itemconfigure(self._statusitem, text='Rendering...')
+        self.check(job, pattern)
+
+    def check(self, job, pattern, shown=None):
+        if job is not self._runner.job:  # replaced by a newer change
+            return
+        if job.poll():
+            if job.partial is not shown:
+                self.show(job.partial)
+            self.after(30, self.check, job, pattern, job.partial)
+        elif job.state == 'done':
+            png, paths = job.result
+            if paths is not None:
+                self._geometry.put(pattern, paths)
+            self.show(png)
+            self.itemconfigure(self._statusitem, text='')
+        elif job.state == 'failed':
+            self.itemconfigure(self._statusitem, text='No preview')
+
+    def show(self, png):
+        self._image = PhotoImage(data=base64.b64encode(png).decode())
+        self.itemconfigure(self._imageitem, image=self._image)
+
+    def stop(self):
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+            self._pending = None
+        self._runner.cancel()
 
 
 class PatternTab(Tab):
     def __init__(self, master):
         self._parameters = {}
+        self._preview = None
 
         super().__init__(master)
         self.name = None
@@ -35,6 +113,36 @@ class PatternTab(Tab):
         self._patternmenu.grid(row=1, column=400)
         self._n_angles = None
 
+    def setup_preview(self, colorschemetab, geometry):
+        """
+        Adds the preview of the pattern to the tab. This is called by the
+        Application once the color scheme tab exists, since the preview uses
+        its colors.
+        Args:
+            colorschemetab: the ColorSchemeTab to get the colors from
+            geometry: pipeline.GeometryCache shared with the Run button
+        """
+        self._preview = Preview(
+            self, lambda: (self.pattern(), colorschemetab.colorscheme,
+                           colorschemetab.backgroundcolor),
+            geometry
+        )
+        self._preview.grid(row=2, column=1, columnspan=790, pady=(10, 0))
+        self.changed()
+
+    def changed(self, *args):
+        # bound to every setting, so the preview can follow them
+        if self._preview is not None:
+            self._preview.schedule()
+
+    def _watch(self):
+        # connects the current pattern's settings to changed()
+        for value in self._parameters.values():
+            if isinstance(value, Scale):
+                value.configure(command=self.changed)
+            elif isinstance(value, Variable):
+                value.trace('w', self.changed)
+
     def _setpattern(self, *args):
         self.clear()  # clear tab of parameters from any previous pattern
 
@@ -50,6 +158,8 @@ class PatternTab(Tab):
             self.set_spirals()
         elif patterntype == 'iterativerotation':
             self.set_iterative_rotation()
+        self._watch()
+        self.changed()
 
     @property
     def angleparam(self):
@@ -137,11 +247,13 @@ class PatternTab(Tab):
         for i in range(n):  # n is the number of angles we are setting
             anglevar = StringVar()
             anglevar.trace('w', self.set_angles)
+            anglevar.trace('w', self.changed)
             anglebox = Entry(self._spacedarea, width=5, textvariable=anglevar)
             label1 = Label(self._spacedarea, text=f"angle {str(i + 1)}")
 
             curvevar = StringVar()
             curvevar.trace('w', self.set_angles)
+            curvevar.trace('w', self.changed)
             curvebox = Entry(self._spacedarea, width=5, textvariable=curvevar)
             label2 = Label(self._spacedarea, text=f"curve {str(i + 1)}")
             if len(prevparams) > i:
@@ -156,10 +268,11 @@ class PatternTab(Tab):
                     curvevar.set(0)
             if i == 1:
                 turncycle = Scale(self._spacedarea, orient='horizontal',
-                                  from_=0, to=5, label='turn cycle')
+                                  from_=0, to=5, label='turn cycle',
+                                  command=self.changed)
                 turncycle.grid(row=9, column=100, rowspan=3)
                 jank = Scale(self._spacedarea, orient='horizontal', from_=0,
-                             to=600, label="jank")
+                             to=600, label="jank", command=self.changed)
                 jank.grid(row=12, column=100, rowspan=3)
                 self._parameters['turncycle'] = turncycle
                 self._parameters['jank'] = jank
@@ -402,9 +515,15 @@ class PatternTab(Tab):
                             if isinstance(j, (Widget, Parameter)):
                                 j.grid_forget()
 
-    def save(self, mode, name):
-        if mode == 'patterns':
-            self.name = name
+    def pattern(self):
+        """
+        Returns:
+            the current settings as a dictionary with patterntype and
+            parameters, in the form they are saved in and that
+            pipeline.generate takes
+        """
+        if self._patternselection.get() == 'radialangular':
+            self.set_angles()
         params = {}
         # converting all widget parameters to their values for save:
         for k, v in self._parameters.items():
@@ -413,11 +532,15 @@ class PatternTab(Tab):
             else:
                 params[k] = v
         # Create new object with all necessary values for save:
-        output = {
+        return {
             'patterntype': self._patternselection.get(),
             'parameters': params
         }
-        return self.name, output
+
+    def save(self, mode, name):
+        if mode == 'patterns':
+            self.name = name
+        return self.name, self.pattern()
 
     def load(self, name, data):
         """
@@ -449,47 +572,3 @@ class PatternTab(Tab):
             else:  # if that parameter isn't already in the list:
                 self._parameters[k] = params[k]  # add it
         self.name = name
-
-    def run(self, colorscheme):
-        """
-        This method is called from the the master Application.
-
-        Args:
-            colorscheme: a SpiroGen ColorScheme object
-
-        Returns:
-            None. Draws pattern
-        """
-        parameters = {}
-        # convert parameter widgets/variables to their values
-        for param in self._parameters.items():
-            label, value = param[0], param[1]
-            if not isinstance(value, (int, float, str, list, tuple)):
-                parameters[label] = value.get()
-            else:
-                parameters[label] = value
-
-        # This is where the patterns are actually drawn based on selection:
-        if self._patternselection.get() == "layeredflowers":
-            parameters['rotate'] = self.angleparam
-            parameters.pop('rotationfactor')
-            LVL2.layered_flowers(**parameters, colors=colorscheme)
-        elif self._patternselection.get() == "radialangular":
-            self.set_angles()
-            RadialAngularPattern(**parameters, colors=colorscheme).drawpath()
-        elif self._patternselection.get() == 'sinespiral':
-            pensize = parameters.pop('pensize')
-            DrawPath(
-                LVL2.sin_spiral(**parameters),
-                colors=colorscheme,
-                pensize=pensize,
-            )
-        elif self._patternselection.get() == 'spirals':
-            LVL2.spiral_spiral(**parameters, colors=colorscheme)
-        elif self._patternselection.get() == 'iterativerotation':
-            LVL2.random_iterative_rotation(
-                **parameters, colors=colorscheme, rotationcenter=(0, 0)
-            )
-        #     LVL2.iterative_rotation(**parameters, colors=colorscheme)
-
-        spiro.wait()  # This keeps the pattern window from closing as soon as it's done drawing
@@ -0,0 +1,161 @@
+"""
+Background jobs for generating patterns.
+
+Generating a heavy pattern can take long enough that running it on the
+interface's thread freezes the window until it is done. A Job runs a
+function in a separate process instead, so the interface stays responsive,
+and a job that is no longer wanted can be stopped outright rather than
+having to finish. The interface polls a job (with tkinter's after()) for
+its progress and, once it is done, its result.
+
+Code running inside a job can call report() to say how far along it is,
+and partial() to send back a rough result before the finished one. Outside
+of a job they do nothing, so the same code runs as normal everywhere else.
+
+A Runner keeps track of one job at a time: starting a new one cancels the
+one before it, so pressing Run again while a pattern is still generating
+replaces it instead of queueing up behind it.
+"""
+import multiprocessing
+import traceback
+
+# the end of the pipe back to the interface, when running inside a job
+_connection = None
+
+
+def report(fraction, message=''):
+    """
+    Sends the progress of the current job back to the interface.
+    Args:
+        fraction: how much of the job is done, from 0 to 1, or None if it
+            isn't known
+        message: what the job is doing
+    """
+    if _connection is not None:
+        _connection.send(('progress', (fraction, message)))
+
+
+def partial(value):
+    """
+    Sends a rough or incomplete result of the current job back to the
+    interface, e.g. a quick preview to show until the full result is ready.
+    """
+    if _connection is not None:
+        _connection.send(('partial', value))
+
+
+def _work(connection, func, args, kwargs):
+    # runs in the job's process, sending back the result or what went wrong
+    global _connection
+    _connection = connection
+    try:
+        result = func(*args, **kwargs)
+    except BaseException as e:
+        connection.send(('failed', (f'{type(e).__name__}: {e}',
+                                    traceback.format_exc())))
+    else:
+        connection.send(('done', result))
+    finally:
+        connection.close()
+
+
+class Job:
+    """
+    A handle on func(*args, **kwargs) running in its own process. func and
+    its arguments have to be picklable, and so does what it returns.
+
+    Attributes:
+        state: 'running', 'done', 'failed' or 'cancelled'
+        progress: (fraction, message) last sent with report()
+        partial: the last value sent with partial(), or None
+        result: what func returned, once the job is done
+        error: (message, traceback) if func raised an exception
+    """
+    def __init__(self, func, *args, **kwargs):
+        self.state = 'running'
+        self.progress = (0, 'Starting')
+        self.partial = None
+        self.result = None
+        self.error = None
+        self._connection, child = multiprocessing.Pipe(duplex=False)
+        self._process = multiprocessing.Process(
+            target=_work, args=(child, func, args, kwargs), daemon=True
+        )
+        self._process.start()
+        child.close()
+
+    @property
+    def running(self):
+        return self.state == 'running'
+
+    def poll(self):
+        """
+        Picks up any progress or results the job has sent since the last
+        poll. This never waits for the job.
+        Returns:
+            True if the job is still running
+        """
+        while self.running and self._connection.poll():
+            try:
+                kind, value = self._connection.recv()
+            except EOFError:
+                # the process ended without sending a result, e.g. it was
+                # killed or crashed
+                self._finish('failed')
+                self.error = ('The job stopped unexpectedly', '')
+                break
+            if kind == 'progress':
+                self.progress = value
+            elif kind == 'partial':
+                self.partial = value
+            elif kind == 'done':
+                self.result = value
+                self._finish('done')
+            else:
+                self.error = value
+                self._finish('failed')
+        return self.running
+
+    def wait(self, timeout=None):
+        """
+        Waits for the job to end.
+        Returns:
+            True if it has ended
+        """
+        while self.poll():
+            if not self._connection.poll(timeout):
+                break
+        return not self.running
+
+    def cancel(self):
+        """Stops the job if it is still running."""
+        if self.running:
+            self._process.terminate()
+            self._finish('cancelled')
+
+    def _finish(self, state):
+        self.state = state
+        self._connection.close()
+        self._process.join()
+
+
+class Runner:
+    """
+    Runs one job at a time, with each new job superseding the last one.
+    """
+    def __init__(self):
+        self.job = None
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Cancels the current job and starts func(*args, **kwargs) as a new one.
+        Returns:
+            the new Job
+        """
+        self.cancel()
+        self.job = Job(func, *args, **kwargs)
+        return self.job
+
+    def cancel(self):
+        if self.job is not None:
+            self.job.cancel()
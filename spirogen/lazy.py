@@ -0,0 +1,47 @@
+"""
+Lazy imports for modules that are slow to load.
+
+Modules like scipy.spatial take longer to import than the rest of SpiroGen put
+together, but are only needed by a few functions. module() returns a stand in
+that does the real import the first time one of its attributes is used, so
+importing spirogen (and starting the interface or a batch worker) doesn't pay
+for them up front.
+"""
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand in for a module that is imported on first attribute access.
+    """
+    def __getattr__(self, attr):
+        module = importlib.import_module(self.__name__)
+        # copy everything across so later lookups don't come back here
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+    def __repr__(self):
+        return f"<lazy module '{self.__name__}'>"
+
+
+def module(name):
+    """
+    Args:
+        name: full dotted name of the module, e.g. 'scipy.spatial'
+
+    Returns:
+        the module if it has already been imported, otherwise a LazyModule
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+
+def loaded(name):
+    """
+    Returns:
+        True if the module has really been imported
+    """
+    return name in sys.modules
@@ -0,0 +1,188 @@
+"""
+Vectorized color palette building.
+
+A ColorScheme fades between a list of color stops for each of r, g and b.
+build() makes the whole (ncolors, 3) palette and its hex strings in one go
+with numpy, giving the same colors as fading each section with np.linspace,
+and keeps the most recent palettes in an LRU cache so that schemes with the
+same stops and number of colors aren't worked out again.
+
+It also has the small color conversions the interface needs (hex strings and
+hsv), so matplotlib doesn't have to be imported just for those.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+KEYS = ('r', 'g', 'b')
+
+
+def divisions(nstops, ncolors):
+    """
+    Splits ncolors between the sections between nstops color stops. Every
+    section gets the same share, and the leftovers go one each to the last
+    sections.
+
+    Returns:
+        (nstops - 1,) int array that sums to ncolors
+    """
+    nsections = nstops - 1
+    divs = np.full(nsections, ncolors // nsections, dtype=np.int64)
+    leftover = ncolors - int(divs.sum())
+    if leftover:
+        divs[-leftover:] += 1
+    return divs
+
+
+def fade(stops, ncolors, roundto=3):
+    """
+    Fades through a list of stop values for one channel. Each section is
+    spaced like np.linspace(first, last, n), endpoints included.
+    Args:
+        stops: list of values to fade between
+        ncolors: total number of values to make
+        roundto: number of decimal places to round to
+
+    Returns:
+        (ncolors,) float array
+    """
+    stops = np.asarray(stops, dtype=float)
+    if len(stops) == 1:
+        return np.full(ncolors, np.around(stops[0], roundto))
+    divs = divisions(len(stops), ncolors)
+    section = np.repeat(np.arange(len(divs)), divs)
+    size = divs[section]
+    # position of each value within its section
+    index = np.arange(ncolors) - (np.cumsum(divs) - divs)[section]
+    first, last = stops[:-1][section], stops[1:][section]
+    values = index * ((last - first) / np.maximum(size - 1, 1)) + first
+    ends = (index == size - 1) & (size > 1)
+    values[ends] = last[ends]
+    return np.around(values, roundto)
+
+
+def tohex(rgb0to1):
+    """
+    Converts an (n, 3) array of colors scaled 0 to 1 into hex strings.
+
+    Returns:
+        list of '#rrggbb' strings
+    """
+    rgb = np.rint(np.asarray(rgb0to1, dtype=float) * 255).astype(np.int64)
+    return ['#%02x%02x%02x' % tuple(color) for color in rgb.tolist()]
+
+
+def rgb2hex(rgb):
+    """
+    Args:
+        rgb: (r, g, b) with values from 0 to 1
+
+    Returns:
+        '#rrggbb' hex string
+    """
+    return tohex([rgb[:3]])[0]
+
+
+def hex2color(hexstring):
+    """
+    Args:
+        hexstring: '#rrggbb' or shorthand '#rgb'
+
+    Returns:
+        (r, g, b) tuple with values from 0 to 1
+    """
+    digits = hexstring.lstrip('#')
+    if len(digits) == 3:
+        digits = ''.join(d * 2 for d in digits)
+    if len(digits) != 6:
+        raise ValueError(f'Invalid hex color {hexstring!r}')
+    return tuple(int(digits[i:i + 2], 16) / 255 for i in (0, 2, 4))
+
+
+def rgb_to_hsv(rgb):
+    """
+    Converts colors from rgb to hsv, with every value from 0 to 1.
+    Args:
+        rgb: (..., 3) array-like, e.g. a single (r, g, b) or an (n, 3) array
+
+    Returns:
+        array the same shape as rgb
+    """
+    rgb = np.asarray(rgb, dtype=float)
+    value = rgb.max(axis=-1)
+    delta = np.ptp(rgb, axis=-1)
+    hsv = np.zeros_like(rgb)
+    hsv[..., 1] = np.divide(delta, value, out=np.zeros_like(value),
+                            where=value > 0)
+    hue = np.zeros_like(value)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    safe = np.where(delta > 0, delta, 1)
+    hue = np.where(r == value, (g - b) / safe, hue)
+    hue = np.where(g == value, 2 + (b - r) / safe, hue)
+    hue = np.where(b == value, 4 + (r - g) / safe, hue)
+    hsv[..., 0] = np.where(delta > 0, (hue / 6) % 1, 0)
+    hsv[..., 2] = value
+    return hsv
+
+
+def hsv_to_rgb(hsv):
+    """
+    Converts colors from hsv to rgb, with every value from 0 to 1.
+    Args:
+        hsv: (..., 3) array-like, e.g. a single (h, s, v) or an (n, 3) array
+
+    Returns:
+        array the same shape as hsv
+    """
+    hsv = np.asarray(hsv, dtype=float)
+    h, s, v = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+    sector = np.floor(h * 6)
+    f = h * 6 - sector
+    p = v * (1 - s)
+    q = v * (1 - s * f)
+    t = v * (1 - s * (1 - f))
+    sector = sector.astype(np.int64) % 6
+    # (r, g, b) for each of the six hue sectors
+    choices = np.stack([
+        np.stack([v, t, p], -1), np.stack([q, v, p], -1),
+        np.stack([p, v, t], -1), np.stack([p, q, v], -1),
+        np.stack([t, p, v], -1), np.stack([v, p, q], -1)
+    ])
+    rgb = np.take_along_axis(
+        choices, sector[None, ..., None].repeat(3, -1), axis=0
+    )[0]
+    return np.where((s == 0)[..., None], v[..., None], rgb)
+
+
+@lru_cache(maxsize=128)
+def _build(stops, ncolors, roundto):
+    rgb = np.column_stack([fade(s, ncolors, roundto) for s in stops])
+    rgb0to1 = np.around(rgb / 255, roundto)
+    divs = tuple(tuple(divisions(len(s), ncolors).tolist()) if len(s) > 1
+                 else (ncolors,) for s in stops)
+    rgb.flags.writeable = False
+    rgb0to1.flags.writeable = False
+    return rgb, rgb0to1, tuple(tohex(rgb0to1)), divs
+
+
+def build(colordict, ncolors, roundto=3):
+    """
+    Builds a palette from color stops. Results are cached, so the arrays
+    returned are read only and shared between calls.
+    Args:
+        colordict: dictionary of 'r', 'g' and 'b' lists of stop values
+        ncolors: number of colors in the palette
+        roundto: decimal places the colors are rounded to
+
+    Returns:
+        (rgb, rgb0to1, hex, divisions) where rgb is an (ncolors, 3) array of
+        0 to 255 values, rgb0to1 the same scaled to 0 to 1, hex a tuple of hex
+        strings, and divisions a tuple per channel of the number of colors in
+        each section
+    """
+    stops = tuple(tuple(float(v) for v in colordict[k]) for k in KEYS)
+    return _build(stops, int(ncolors), roundto)
+
+
+cache_info = _build.cache_info
+cache_clear = _build.cache_clear
@@ -0,0 +1,151 @@
+"""
+Process pool generation of independent strands.
+
+Composite patterns like LVL2.sin_spiral and LVL2.layered_flowers build each
+strand or layer on its own before putting them together. generate() runs the
+function that builds one strand across a pool of processes. The point counts
+are worked out up front, so all the strands are written straight into one
+shared memory array instead of being pickled back to the main process, then
+split back into paths in their original order.
+"""
+import os
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from spirogen.paths import PathCollection
+
+
+def processcount(processes):
+    """
+    Returns:
+        the number of processes to use for a processes argument, where None
+        or 1 means run in this process and 0 means one per core
+    """
+    if processes is None:
+        return 1
+    if processes == 0:
+        return os.cpu_count() or 1
+    return max(1, int(processes))
+
+
+def _shard(job):
+    """
+    Runs in a worker process. Builds a run of consecutive strands and writes
+    them into their rows of the shared output array.
+    """
+    name, total, start, worker, tasks, sizes = job
+    memory = SharedMemory(name=name)
+    try:
+        out = np.ndarray((total, 2), dtype=float, buffer=memory.buf)
+        for task, size in zip(tasks, sizes):
+            points = np.asarray(worker(*task), dtype=float).reshape(-1, 2)
+            if len(points) != size:
+                raise ValueError(
+                    f'{worker.__name__}{task} made {len(points)} points, '
+                    f'expected {size}'
+                )
+            out[start:start + size] = points
+            start += size
+        del out  # the buffer can't be closed while an array still uses it
+    finally:
+        memory.close()
+
+
+class Workers:
+    """
+    A pool of processes and a shared memory array for generate() to build
+    strands with. generate() makes its own for each call, which is wasteful
+    when one pattern is built in many calls (see stream.Strands), so this
+    lets them share one. Use it as a context manager so the processes and
+    memory are released at the end.
+    Args:
+        processes: as for generate()
+        npoints: most points any one call will build
+    """
+    def __init__(self, processes, npoints):
+        self.processes = processcount(processes)
+        self.npoints = npoints
+        self.pool = None
+        self.memory = None
+        if self.processes > 1:
+            self.memory = SharedMemory(create=True,
+                                       size=max(1, npoints * 2 * 8))
+            self.pool = Pool(self.processes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+        if self.memory is not None:
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
+
+
+def generate(worker, tasks, sizes, processes=None, chunksize=None,
+             workers=None):
+    """
+    Builds one path per task, in parallel if processes allows it.
+    Args:
+        worker: module level function (so it can be pickled) that takes the
+            items of a task as arguments and returns an (n, 2) path
+        tasks: list of argument tuples, one per strand
+        sizes: number of points each task's path will have
+        processes: None or 1 to run here, 0 for one process per core, or the
+            number of processes to use
+        chunksize: number of consecutive tasks each worker builds at a time.
+            Defaults to splitting the tasks into 4 chunks per process.
+        workers: optional Workers to use instead of starting new ones, in
+            which case processes is ignored
+
+    Returns:
+        PathCollection of the paths in the same order as tasks
+    """
+    if workers is not None:
+        processes = workers.processes
+    nprocesses = min(processcount(processes), len(tasks))
+    if nprocesses <= 1:
+        return PathCollection.fromlist(
+            [np.asarray(worker(*task), dtype=float).reshape(-1, 2)
+             for task in tasks]
+        )
+
+    sizes = np.asarray(sizes, dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+    total = int(offsets[-1])
+    if chunksize is None:
+        chunksize = max(1, -(-len(tasks) // (nprocesses * 4)))
+    if workers is None:
+        with Workers(nprocesses, total) as workers:
+            points = _build(workers, worker, tasks, sizes, offsets, chunksize)
+    else:
+        if total > workers.npoints:
+            raise ValueError(f'{total} points is more than the workers were '
+                             f'made for ({workers.npoints})')
+        points = _build(workers, worker, tasks, sizes, offsets, chunksize)
+    return PathCollection(points, offsets)
+
+
+def _build(workers, worker, tasks, sizes, offsets, chunksize):
+    # builds the strands into the workers' shared memory, then copies them
+    # out so the memory can be used again
+    total = int(offsets[-1])
+    jobs = [
+        (workers.memory.name, total, int(offsets[i]), worker,
+         tasks[i:i + chunksize], sizes[i:i + chunksize].tolist())
+        for i in range(0, len(tasks), chunksize)
+    ]
+    workers.pool.map(_shard, jobs)
+    shared = np.ndarray((total, 2), dtype=float, buffer=workers.memory.buf)
+    points = shared.copy()
+    del shared  # the memory can't be closed while an array still uses it
+    return points
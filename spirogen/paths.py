@@ -0,0 +1,232 @@
+"""
+Compact storage for collections of paths.
+
+Patterns pass paths around as lists of (x, y) tuples, lists of those, or lists
+of lists of those, and the depth has to be guessed by looking at the first
+element. A PathCollection holds the same thing as one contiguous (N, 2)
+float64 array of points plus an offsets array marking where each path starts,
+so every point costs 16 bytes instead of a tuple of two floats, and the depth
+is simply stored. It can still be indexed like the nested list it stands in
+for, so DrawPath, Analyze and Transform accept it as is.
+"""
+import numpy as np
+
+from spirogen import geometry
+
+
+class PathCollection:
+    """
+    A set of paths stored in flat arrays.
+    Args:
+        points: (N, 2) array of every point, one path after another
+        offsets: (P + 1,) int array, path i is points[offsets[i]:offsets[i + 1]].
+            Defaults to all the points being one path.
+        colors: optional (N,) int array with a color index for every point.
+            Segments take the color of the point they end on, like
+            Pattern.simpledraw.
+        pensizes: optional (N,) array with a pen size for every point
+        groups: optional (G + 1,) int array of path indices for collections
+            standing in for a depth 3 list, group j is paths
+            groups[j]:groups[j + 1]
+        depth: depth of the nested list this stands in for. Defaults to 3 if
+            groups is given, otherwise 2.
+    """
+    def __init__(self, points, offsets=None, colors=None, pensizes=None,
+                 groups=None, depth=None):
+        self.points = np.ascontiguousarray(points, dtype=np.float64)
+        self.points = self.points.reshape(-1, 2)
+        if offsets is None:
+            offsets = [0, len(self.points)]
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        if self.offsets[0] != 0 or self.offsets[-1] != len(self.points):
+            raise ValueError('offsets must run from 0 to the number of points')
+        self.colors = None if colors is None else np.asarray(colors, np.int64)
+        self.pensizes = None if pensizes is None else np.asarray(pensizes,
+                                                                 np.float64)
+        for name in ('colors', 'pensizes'):
+            values = getattr(self, name)
+            if values is not None and len(values) != len(self.points):
+                raise ValueError(f'{name} needs one value per point')
+        self.groups = None if groups is None else np.asarray(groups, np.int64)
+        if depth is None:
+            depth = 2 if self.groups is None else 3
+        if depth == 1 and self.npaths != 1:
+            raise ValueError('A depth 1 collection has exactly one path')
+        if depth == 3 and self.groups is None:
+            self.groups = np.array([0, self.npaths], dtype=np.int64)
+        self.depth = depth
+
+    @classmethod
+    def fromlist(cls, coordlist, colors=None, pensizes=None):
+        """
+        Packs a coordinate list of any depth into a PathCollection.
+        Args:
+            coordlist: a single path (list of (x, y) or (n, 2) array), a list
+                of paths, a list of groups of paths, a (P, n, 2) array, or a
+                PathCollection (returned as it is)
+
+        Returns:
+            PathCollection with the depth of coordlist
+        """
+        if isinstance(coordlist, PathCollection):
+            return coordlist
+        if isinstance(coordlist, np.ndarray):
+            if coordlist.ndim == 2:
+                return cls(coordlist, colors=colors, pensizes=pensizes,
+                           depth=1)
+            points = coordlist.reshape(-1, 2)
+            offsets = np.arange(len(coordlist) + 1) * coordlist.shape[1]
+            return cls(points, offsets, colors, pensizes)
+        if len(coordlist) == 0:
+            return cls(np.empty((0, 2)), [0], colors, pensizes)
+        if geometry.ndim(coordlist[0]) == 1:  # a single path
+            return cls(np.asarray(coordlist, dtype=float), colors=colors,
+                       pensizes=pensizes, depth=1)
+        if geometry.ndim(coordlist[0][0]) == 1:  # a list of paths
+            points, offsets = geometry.stack_paths(coordlist)
+            return cls(points, offsets, colors, pensizes)
+        paths = [path for group in coordlist for path in group]  # depth 3
+        groups = np.zeros(len(coordlist) + 1, dtype=np.int64)
+        np.cumsum([len(group) for group in coordlist], out=groups[1:])
+        points, offsets = geometry.stack_paths(paths)
+        return cls(points, offsets, colors, pensizes, groups)
+
+    @staticmethod
+    def concatenate(collections):
+        """
+        Joins collections into one depth 2 collection. Colors and pen sizes
+        are kept only if every collection has them.
+        """
+        collections = [PathCollection.fromlist(c) for c in collections]
+        points = np.concatenate([c.points for c in collections])
+        starts = np.cumsum([0] + [len(c.points) for c in collections[:-1]])
+        offsets = np.concatenate(
+            [[0]] + [c.offsets[1:] + s for c, s in zip(collections, starts)]
+        )
+        extras = {}
+        for name in ('colors', 'pensizes'):
+            values = [getattr(c, name) for c in collections]
+            if all(v is not None for v in values):
+                extras[name] = np.concatenate(values)
+        return PathCollection(points, offsets, **extras)
+
+    def __len__(self):
+        # the length of the nested list this stands in for
+        if self.depth == 1:
+            return len(self.points)
+        if self.depth == 3:
+            return len(self.groups) - 1
+        return self.npaths
+
+    def __getitem__(self, index):
+        # indexes like the nested list this stands in for
+        if self.depth == 1:
+            return self.points[index]
+        if self.depth == 3:
+            return self.group(index)
+        return self.path(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self):
+        return (f'PathCollection({self.npaths} paths, {self.npoints} points, '
+                f'depth {self.depth})')
+
+    @property
+    def npaths(self):
+        return len(self.offsets) - 1
+
+    @property
+    def npoints(self):
+        return len(self.points)
+
+    @property
+    def lengths(self):
+        """
+        Returns:
+            (P,) array with the number of points in each path
+        """
+        return np.diff(self.offsets)
+
+    @property
+    def nbytes(self):
+        arrays = (self.points, self.offsets, self.colors, self.pensizes,
+                  self.groups)
+        return sum(a.nbytes for a in arrays if a is not None)
+
+    def path(self, index):
+        """
+        Returns:
+            path index as an (n, 2) view into points
+        """
+        if index < 0:
+            index += self.npaths
+        return self.points[self.offsets[index]:self.offsets[index + 1]]
+
+    def paths(self):
+        """
+        Returns:
+            list of every path as (n, 2) views into points, ignoring groups
+        """
+        return geometry.split_paths(self.points, self.offsets)
+
+    def group(self, index):
+        """
+        Returns:
+            group index of a depth 3 collection as a depth 2 PathCollection
+            sharing this collection's arrays
+        """
+        if index < 0:
+            index += len(self.groups) - 1
+        first, last = self.groups[index], self.groups[index + 1]
+        start, end = self.offsets[first], self.offsets[last]
+        return PathCollection(
+            self.points[start:end], self.offsets[first:last + 1] - start,
+            None if self.colors is None else self.colors[start:end],
+            None if self.pensizes is None else self.pensizes[start:end]
+        )
+
+    def tolist(self):
+        """
+        Returns:
+            the nested list of (x, y) tuples this stands in for
+        """
+        if self.depth == 1:
+            return geometry.tuples(self.points)
+        paths = [geometry.tuples(p) for p in self.paths()]
+        if self.depth == 2:
+            return paths
+        return [paths[self.groups[j]:self.groups[j + 1]]
+                for j in range(len(self.groups) - 1)]
+
+    def transform(self, matrices, inplace=False):
+        """
+        Applies a 3x3 affine matrix to every path, or a (P, 3, 3) stack with
+        one matrix per path (see geometry.transform_paths).
+
+        Returns:
+            the transformed PathCollection (self if inplace)
+        """
+        matrices = np.asarray(matrices, dtype=float)
+        out = self.points if inplace else None
+        if matrices.ndim == 2:
+            points = geometry.apply_matrix(self.points, matrices, out=out)
+        else:
+            points = geometry.transform_paths(
+                self.points, matrices, self.offsets, out=out
+            )
+        if inplace:
+            return self
+        return PathCollection(points, self.offsets, self.colors, self.pensizes,
+                              self.groups, self.depth)
+
+    def bounds(self):
+        """
+        Returns:
+            (xmin, ymin, xmax, ymax) of every point
+        """
+        low = self.points.min(axis=0)
+        high = self.points.max(axis=0)
+        return low[0], low[1], high[0], high[1]
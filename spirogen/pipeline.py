@@ -0,0 +1,549 @@
+"""
+Headless generation of saved SpiroGen settings.
+
+Turns the session, pattern and color json files the interface saves under
+settings/ into coordinate lists and styling, without any tkinter or turtle
+windows, so they can be rendered with render.py or exported with export.py.
+This is also how the interface generates the pattern it draws when Run is
+pressed, so a pattern renders the same here as it does there.
+"""
+import hashlib
+import io
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from spirogen import render, export, diskcache, jobs, simplify, stream
+from spirogen.paths import PathCollection
+from spirogen.spirogen import LVL2, RadialAngularPattern, ColorScheme
+
+SETTINGS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'interface', 'settings'
+)
+
+# what the Color Scheme tab starts with when nothing has been loaded
+DEFAULT_COLORS = {
+    'background': {'r': 0, 'g': 0, 'b': 0},
+    'totalcolors': 100,
+    'nstops': 11,
+    'colordict': {
+        'r': [255, 255, 255, 220, 75, 3, 3, 30, 125, 220, 255],
+        'g': [0, 150, 255, 255, 255, 255, 145, 3, 3, 3, 0],
+        'b': [0, 0, 0, 3, 3, 240, 255, 255, 255, 255, 0]
+    },
+    'id': None
+}
+
+# what colors files are shown on when they are rendered by themselves
+DEFAULT_PATTERN = {
+    'patterntype': 'radialangular',
+    'parameters': {'size': 500, 'pensize': 1, 'angles': [[125, 5]]}
+}
+
+# parameters that change how a pattern is styled but not its paths
+STYLE_PARAMETERS = ('pensize',)
+
+# iterativerotation parameters that are picked at random when they're missing
+RANDOM_PARAMETERS = (
+    'function', 'reps', 'xshift', 'yshift', 'stretch', 'length', 'depth',
+    'stretchshift', 'lenshift', 'depthshift', 'individualrotation', 'branches'
+)
+
+# pattern types that can be generated a chunk at a time
+STREAMING = ('layeredflowers', 'sinespiral')
+
+# size of the turtle window the interface draws into
+WINDOW = (1920, 1200)
+
+RASTER_FORMATS = ('png', 'jpg', 'jpeg', 'bmp', 'tiff', 'webp')
+VECTOR_FORMATS = tuple(ext[1:] for ext in export.WRITERS)
+
+
+def settings_kind(data):
+    """
+    Works out what kind of settings file some loaded json is.
+    Returns:
+        'sessions', 'patterns' or 'colors'
+    """
+    if 'patterntype' in data:
+        return 'patterns'
+    if 'colordict' in data:
+        return 'colors'
+    if 'patterns' in data or 'colors' in data:
+        return 'sessions'
+    raise ValueError('Not a SpiroGen settings file')
+
+
+def load(path, settingspath=None):
+    """
+    Loads a session, pattern or colors file and resolves the files a session
+    points to, like Application.load does.
+    Args:
+        path: path to the json file
+        settingspath: the settings folder sessions are resolved against.
+            Defaults to the folder two levels up from a session file.
+
+    Returns:
+        (pattern, colors) dictionaries. Either can be None if the file doesn't
+        contain it.
+    """
+    with open(path, 'r') as file:
+        data = json.load(file)
+    kind = settings_kind(data)
+    if kind == 'patterns':
+        return data, None
+    if kind == 'colors':
+        return None, data
+    if settingspath is None:
+        settingspath = os.path.dirname(os.path.dirname(os.path.abspath(path)))
+    loaded = {'patterns': None, 'colors': None}
+    for key, name in data.items():
+        with open(os.path.join(settingspath, key, f'{name}.json'), 'r') as file:
+            loaded[key] = json.load(file)
+    return loaded['patterns'], loaded['colors']
+
+
+def colorscheme(colors=None):
+    """
+    Builds the ColorScheme and background color for saved colors, the same way
+    the Color Scheme tab does.
+    Args:
+        colors: colors dictionary as saved by ColorSchemeTab.save, or None for
+            the default colors
+
+    Returns:
+        (ColorScheme, background hex string)
+    """
+    if colors is None:
+        colors = DEFAULT_COLORS
+    nstops = int(colors['nstops'])
+    colordict = {k: list(v[:nstops]) for k, v in colors['colordict'].items()}
+    scheme = ColorScheme(colordict, int(colors['totalcolors']))
+    background = colors['background']
+    rgb = tuple(round(float(background[k])) for k in 'rgb')
+    return scheme, '#%02x%02x%02x' % rgb
+
+
+def deterministic(pattern):
+    """
+    Returns:
+        False if generating the pattern picks some of its parameters at
+        random (iterative rotations missing some values and without a seed),
+        so it can come out differently each time
+    """
+    parameters = pattern['parameters']
+    if (pattern['patterntype'] != 'iterativerotation'
+            or parameters.get('seed') is not None):
+        return True
+    center = parameters.get('rotationcenter', (0, 0))
+    return None not in center and all(
+        parameters.get(name) is not None for name in RANDOM_PARAMETERS
+    )
+
+
+def geometry_key(pattern):
+    """
+    Returns:
+        a hex digest of everything that changes the paths of a pattern,
+        leaving out the parameters that only change its styling, or None if
+        the pattern isn't deterministic
+    """
+    if not deterministic(pattern):
+        return None
+    parameters = {k: v for k, v in pattern['parameters'].items()
+                  if k not in STYLE_PARAMETERS}
+    content = json.dumps([pattern['patterntype'], parameters], sort_keys=True)
+    return hashlib.sha1(content.encode()).hexdigest()
+
+
+def generate_paths(pattern, processes=None, cache=None):
+    """
+    Generates the paths for a saved pattern, without any styling. They only
+    depend on the parameters geometry_key() uses, so they can be kept and
+    styled again with style() when just the colors or pen size change.
+    Args:
+        pattern: pattern dictionary as saved by PatternTab.save
+        processes: passed on to the patterns that can build their strands in
+            parallel (see parallel.generate). Leave as None when this is
+            already running inside a worker process, e.g. from batch.py.
+        cache: diskcache.DiskCache to load the paths from if they have been
+            generated before, and to save them to if not. None uses
+            diskcache.default(), and False turns caching off.
+
+    Returns:
+        PathCollection
+    """
+    if cache is None:
+        cache = diskcache.default()
+    key = geometry_key(pattern) if cache else None
+    if key is not None:
+        paths = cache.get(key)
+        if paths is not None:
+            jobs.report(1, f"Loaded {pattern['patterntype']} from the cache")
+            return paths
+    paths = _generate_paths(pattern, processes)
+    if key is not None:
+        cache.put(key, paths)
+    return paths
+
+
+def stream_paths(pattern, chunksize=1 << 18, processes=None, cache=None):
+    """
+    Generates the paths for a saved pattern a chunk at a time (see
+    stream.py). The pattern types in STREAMING never have all of their
+    paths in memory at once, even when they are saved to the cache. The
+    rest are generated in full with generate_paths(), then handed out in
+    chunks.
+    Args:
+        chunksize: most points in a chunk
+        the rest are as for generate_paths()
+
+    Returns:
+        iterable of PathCollections
+    """
+    if pattern['patterntype'] not in STREAMING:
+        return stream.Chunks(generate_paths(pattern, processes, cache),
+                             chunksize)
+    if cache is None:
+        cache = diskcache.default()
+    key = geometry_key(pattern) if cache else None
+    if key is not None:
+        paths = cache.get(key)
+        if paths is not None:
+            return stream.Chunks(paths, chunksize)
+    strands = _generate_paths(pattern, processes, chunksize)
+    if key is not None:
+        # saved to the cache as the chunks go by
+        return cache.stream(key, strands)
+    return strands
+
+
+def _generate_paths(pattern, processes, chunksize=None):
+    # chunksize makes the STREAMING types return a stream.Strands. Bump
+    # diskcache.VERSION when this changes what it makes from a pattern.
+    patterntype = pattern['patterntype']
+    jobs.report(None, f'Generating {patterntype}')
+    parameters = {k: v for k, v in pattern['parameters'].items()
+                  if k not in STYLE_PARAMETERS}
+    # some patterns want colors even when they aren't drawing, but they
+    # don't change the paths
+    scheme, _ = colorscheme()
+    if patterntype == 'layeredflowers':
+        rotationfactor = parameters.pop('rotationfactor', 1)
+        parameters['rotate'] = parameters['rotate'] * rotationfactor
+        paths = LVL2.layered_flowers(
+            **parameters, colors=scheme, draw=False, processes=processes,
+            chunksize=chunksize
+        )
+    elif patterntype == 'radialangular':
+        parameters['angles'] = [a for a in parameters['angles'] if a[0] != 0]
+        paths = RadialAngularPattern(**parameters, colors=scheme).list
+    elif patterntype == 'sinespiral':
+        paths = LVL2.sin_spiral(
+            **parameters, colors=scheme, processes=processes,
+            chunksize=chunksize
+        )
+    elif patterntype == 'spirals':
+        paths = LVL2.spiral_spiral(**parameters, colors=scheme, draw=False)
+    elif patterntype == 'iterativerotation':
+        parameters.setdefault('rotationcenter', (0, 0))
+        paths = LVL2.random_iterative_rotation(
+            **parameters, colors=scheme, draw=False
+        )
+    else:
+        raise ValueError(f"Unknown pattern type '{patterntype}'")
+    if isinstance(paths, stream.Strands):
+        return paths
+    jobs.report(1, f'Generated {patterntype}')
+    return PathCollection.fromlist(paths)
+
+
+def style(coordlist, pattern, scheme):
+    """
+    Styles generated paths the way the interface draws their pattern type.
+    The paths are used as they are, not copied.
+    Args:
+        coordlist: PathCollection from generate_paths()
+        pattern: pattern dictionary the paths were generated from
+        scheme: ColorScheme to color them with
+
+    Returns:
+        dictionary of coordlist, colors, pensize, and colorby, ready to pass
+        to render.render or export.export
+    """
+    patterntype = pattern['patterntype']
+    hexes = list(scheme.hex)
+    if patterntype == 'layeredflowers':
+        hexes = hexes[1:] + hexes[:1]  # layers are colored from index 1
+    return {
+        'coordlist': coordlist, 'colors': hexes,
+        'pensize': pattern['parameters'].get('pensize', 1),
+        'colorby': 'segment' if patterntype == 'radialangular' else 'path'
+    }
+
+
+def generate(pattern, scheme, processes=None, cache=None):
+    """
+    Generates and styles the paths for a saved pattern without drawing them.
+    Args:
+        pattern: pattern dictionary as saved by PatternTab.save
+        scheme: ColorScheme to color it with
+        processes, cache: see generate_paths()
+
+    Returns:
+        dictionary from style()
+    """
+    return style(generate_paths(pattern, processes, cache), pattern, scheme)
+
+
+class GeometryCache:
+    """
+    Keeps the paths of the last few patterns that were generated, so
+    changing only the colors or pen size of a pattern restyles the paths it
+    already has instead of generating them again.
+    Args:
+        size: how many patterns to keep paths for
+    """
+    def __init__(self, size=4):
+        self.size = size
+        self._paths = OrderedDict()
+
+    def get(self, pattern):
+        """
+        Returns:
+            the PathCollection kept for a pattern, or None
+        """
+        key = geometry_key(pattern)
+        if key not in self._paths:
+            return None
+        self._paths.move_to_end(key)
+        return self._paths[key]
+
+    def put(self, pattern, coordlist):
+        key = geometry_key(pattern)
+        if key is None:
+            return
+        self._paths[key] = coordlist
+        self._paths.move_to_end(key)
+        while len(self._paths) > self.size:
+            self._paths.popitem(last=False)
+
+
+def simplified(drawing, tolerance):
+    """
+    Simplifies the paths of a generated drawing (see simplify.rdp) without
+    changing how it is colored.
+    Args:
+        drawing: dictionary from generate()
+        tolerance: furthest a removed point can be from the simplified paths,
+            in pattern units
+
+    Returns:
+        a copy of drawing with the simplified paths
+    """
+    coll = PathCollection.fromlist(drawing['coordlist'])
+    colors = drawing['colors']
+    if (drawing['colorby'] == 'segment' and coll.colors is None
+            and len(colors) > 1):
+        # colors that cycle along each path follow the point count, so pin
+        # them to the points before any are taken out
+        position = np.arange(coll.npoints) - np.repeat(coll.offsets[:-1],
+                                                        coll.lengths)
+        coll = PathCollection(coll.points, coll.offsets,
+                              position % len(colors), coll.pensizes,
+                              coll.groups, coll.depth)
+    return dict(drawing, coordlist=simplify.rdp(coll, tolerance))
+
+
+def windowscale(resolution):
+    """
+    Returns:
+        the scale that fits what is in the turtle window into resolution
+    """
+    return min(resolution[0] / WINDOW[0], resolution[1] / WINDOW[1])
+
+
+def output(drawing, filename, background='black', resolution=(1920, 1200),
+           supersample=2, precision=2, tolerance=None):
+    """
+    Writes a generated drawing to an image or vector file, picked by the
+    file extension. The drawing is scaled so that what fits in the turtle
+    window fits in the output.
+    Args:
+        drawing: dictionary from generate()
+        filename: output path
+        tolerance: if given, the paths are simplified first so that no point
+            is moved by more than this many output pixels. About half a
+            pixel looks the same as the full drawing.
+        the rest are as for render.render and export.export
+    """
+    extension = os.path.splitext(filename)[1][1:].lower()
+    scale = windowscale(resolution)
+    if tolerance:
+        drawing = simplified(drawing, tolerance / scale)
+    if extension in VECTOR_FORMATS:
+        export.export(
+            **drawing, filename=filename, background=background,
+            resolution=resolution, precision=precision, scale=scale
+        )
+    else:
+        render.render(
+            **drawing, filename=filename, background=background,
+            resolution=resolution, supersample=supersample, scale=scale
+        )
+
+
+def preview(pattern, scheme, background='black', resolution=(480, 300),
+            budget=20000, paths=None):
+    """
+    Renders a small preview of a pattern, meant to be run as a job (see
+    jobs.py). Patterns with more than budget points are first rendered
+    roughly, with the paths simplified and no anti-aliasing, and sent back
+    with jobs.partial() before the full detail version is rendered.
+    Args:
+        pattern: pattern dictionary as saved by PatternTab.save
+        scheme: ColorScheme to color it with
+        background: background color
+        resolution: (width, height) of the preview
+        budget: most points to render in the rough version
+        paths: the pattern's paths if they have already been generated
+
+    Returns:
+        (png, paths) where png is the preview as png bytes, and paths is the
+        PathCollection if it had to be generated, or else None
+    """
+    generated = paths is None
+    if generated:
+        # previews are redone on every change, so filling the disk cache with
+        # each one would only push out the patterns actually rendered
+        paths = generate_paths(pattern, cache=False)
+    drawing = style(paths, pattern, scheme)
+    scale = windowscale(resolution)
+    if paths.npoints > budget:
+        jobs.report(0.5, 'Rendering preview')
+        rough = simplified(drawing, 2 / scale)
+        jobs.partial(_png(rough, background, resolution, 1, scale))
+    jobs.report(0.75, 'Refining preview')
+    png = _png(simplified(drawing, 0.5 / scale), background, resolution, 2,
+               scale)
+    return png, paths if generated else None
+
+
+def _png(drawing, background, resolution, supersample, scale):
+    image = render.render(
+        **drawing, background=background, resolution=resolution,
+        supersample=supersample, scale=scale
+    )
+    data = io.BytesIO()
+    image.save(data, 'png')
+    return data.getvalue()
+
+
+def prepare(pattern, colors, cache=None):
+    """
+    Generates loaded settings the way render_file shows them: patterns
+    without colors use the default colors, and colors without a pattern are
+    shown on a default radial angular pattern.
+    Args:
+        pattern, colors: dictionaries from load()
+        cache: see generate_paths()
+
+    Returns:
+        (drawing, background) for output()
+    """
+    if pattern is None:
+        pattern = DEFAULT_PATTERN
+    scheme, background = colorscheme(colors)
+    return generate(pattern, scheme, cache=cache), background
+
+
+def output_stream(pattern, scheme, filename, background='black',
+                  resolution=(1920, 1200), supersample=2, precision=2,
+                  tolerance=None, chunksize=1 << 18, processes=None,
+                  cache=None):
+    """
+    Does the same as output(generate(pattern, scheme), ...), but generates
+    and draws the paths a chunk at a time (see stream_paths()), so memory
+    use stays about the same however big the pattern is.
+    Args:
+        pattern: pattern dictionary as saved by PatternTab.save
+        scheme: ColorScheme to color it with
+        chunksize: most points to generate and draw at a time
+        processes, cache: see generate_paths()
+        the rest are as for output()
+    """
+    extension = os.path.splitext(filename)[1][1:].lower()
+    scale = windowscale(resolution)
+    tolerance = tolerance / scale if tolerance else None
+    chunks = stream_paths(pattern, chunksize, processes, cache)
+    # written under another name first so a run that fails part way never
+    # leaves a half written file, or replaces a finished one
+    base, ext = os.path.splitext(filename)
+    temp = f'{base}.partial{ext}'
+    try:
+        if extension in VECTOR_FORMATS:
+            with export.WRITERS[f'.{extension}'](
+                temp, resolution, background, precision, scale
+            ) as writer:
+                _draw_chunks(writer, chunks, pattern, scheme, tolerance)
+        else:
+            writer = render.Raster(resolution, background, supersample, scale)
+            _draw_chunks(writer, chunks, pattern, scheme, tolerance)
+            writer.save(temp)
+        os.replace(temp, filename)
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
+
+
+def _draw_chunks(writer, chunks, pattern, scheme, tolerance):
+    first = 0  # paths drawn so far, so colors carry on across chunks
+    for chunk in chunks:
+        drawing = style(chunk, pattern, scheme)
+        if tolerance:
+            drawing = simplified(drawing, tolerance)
+        writer.paths(**drawing, first=first)
+        first += chunk.npaths
+
+def render_file(path, outdir, formats=('png',), resolution=(1920, 1200),
+                supersample=2, settingspath=None, tolerance=None, cache=None,
+                chunksize=None):
+    """
+    Loads a settings file and renders it to outdir, named after the file.
+    Sessions use their own pattern and colors, pattern files use the default
+    colors, and color files are shown on a default radial angular pattern.
+    Args:
+        path: session, pattern or colors json file
+        outdir: folder to write to. It is created if it doesn't exist.
+        formats: file extensions to write, e.g. ('png', 'svg')
+        tolerance: simplification tolerance in pixels, see output()
+        cache: see generate_paths()
+        chunksize: if given, the pattern is generated and drawn this many
+            points at a time, see output_stream()
+
+    Returns:
+        list of the files written
+    """
+    pattern, colors = load(path, settingspath)
+    if chunksize is None:
+        drawing, background = prepare(pattern, colors, cache)
+    else:
+        scheme, background = colorscheme(colors)
+    os.makedirs(outdir, exist_ok=True)
+    name = os.path.splitext(os.path.basename(path))[0]
+    written = []
+    for extension in formats:
+        filename = os.path.join(outdir, f'{name}.{extension.lstrip(".")}')
+        if chunksize is None:
+            output(drawing, filename, background, resolution, supersample,
+                   tolerance=tolerance)
+        else:
+            output_stream(
+                pattern or DEFAULT_PATTERN, scheme, filename, background,
+                resolution, supersample, tolerance=tolerance,
+                chunksize=chunksize, cache=cache
+            )
+        written.append(filename)
+    return written
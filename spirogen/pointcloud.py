@@ -0,0 +1,82 @@
+"""
+Random point clouds scattered around the points of a path.
+
+Every center gets density points, each at a random angle and at a distance
+drawn from an exponential distribution, so they bunch up around the center
+and thin out with distance. cloud() samples all of the radii and angles in
+one go and returns them as one array. chunks() makes the same points a
+block at a time, for clouds too big to hold in memory at once.
+
+The radii and angles come from two separate random streams made from the
+seed, so a seed gives the same points however they are split into chunks.
+"""
+import numpy as np
+
+
+def streams(seed=None):
+    """
+    Args:
+        seed: int or np.random.SeedSequence, or None for a random cloud
+
+    Returns:
+        (radius, angle) numpy Generators
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    radius, angle = seed.spawn(2)
+    return np.random.default_rng(radius), np.random.default_rng(angle)
+
+
+def _scatter(centers, density, spread, exp, radius, angle):
+    # density points around each center, in the order of the centers
+    n = len(centers) * density
+    radii = radius.exponential(exp, n) * spread
+    angles = angle.uniform(0, 2 * np.pi, n)
+    points = np.repeat(centers, density, axis=0)
+    points[:, 0] += radii * np.cos(angles)
+    points[:, 1] += radii * np.sin(angles)
+    return points
+
+
+def chunks(centers, density, spread, exp=1, seed=None, chunksize=1 << 20):
+    """
+    Makes a point cloud a block at a time.
+    Args:
+        centers: (N, 2) array-like of points to scatter around
+        density: number of points around each center
+        spread: multiplier for the distances from the centers
+        exp: scale of the exponential distribution the distances come from
+        seed: see streams()
+        chunksize: most points to make at a time
+
+    Yields:
+        (n, 2) arrays of points that join up into the full cloud, starting
+        with the points around the first center
+    """
+    centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+    radius, angle = streams(seed)
+    if density > chunksize:
+        # split up the points around each center
+        for center in centers:
+            left = density
+            while left:
+                n = min(left, chunksize)
+                yield _scatter(center[None], n, spread, exp, radius, angle)
+                left -= n
+        return
+    step = max(1, chunksize // max(density, 1))
+    for i in range(0, len(centers), step):
+        yield _scatter(centers[i:i + step], density, spread, exp, radius,
+                       angle)
+
+
+def cloud(centers, density, spread, exp=1, seed=None):
+    """
+    Makes a whole point cloud at once. See chunks() for the arguments.
+
+    Returns:
+        (N * density, 2) array of points, density for each center in turn
+    """
+    centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+    radius, angle = streams(seed)
+    return _scatter(centers, density, spread, exp, radius, angle)
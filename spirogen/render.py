@@ -0,0 +1,231 @@
+"""
+Offscreen raster rendering for SpiroGen patterns.
+
+Draws the same coordinate lists that DrawPath and the pattern classes draw with
+turtle, but straight into a Pillow image, so finished patterns can be saved
+as PNGs without opening a turtle window. Anti-aliasing is done by drawing at
+a multiple of the output size and scaling the image down at the end.
+"""
+import numpy as np
+from PIL import Image, ImageDraw
+
+from spirogen import geometry
+from spirogen.paths import PathCollection
+
+
+def aspaths(coordlist):
+    """
+    Normalizes a coordinate list of any depth into a list of (n, 2) arrays.
+    Args:
+        coordlist: a single path (list of (x, y) or (n, 2) array), a list of
+            paths (depth 2), a list of groups of paths (depth 3), or a
+            PathCollection
+
+    Returns:
+        list of (n, 2) float arrays, one per path
+    """
+    if isinstance(coordlist, PathCollection):
+        return coordlist.paths()
+    if isinstance(coordlist, np.ndarray):
+        if coordlist.ndim == 2:
+            return [coordlist.astype(float)]
+        return [path.astype(float) for path in coordlist]
+    if len(coordlist) == 0:
+        return []
+    depth = geometry.ndim(coordlist[0])
+    if depth == 1:  # a single path of points
+        return [np.asarray(coordlist, dtype=float).reshape(-1, 2)]
+    paths = []
+    for item in coordlist:
+        if geometry.ndim(item[0]) == 1:
+            paths.append(np.asarray(item, dtype=float).reshape(-1, 2))
+        else:  # depth 3, a group of paths
+            paths += [np.asarray(p, dtype=float).reshape(-1, 2) for p in item]
+    return paths
+
+
+def runs(coordlist, colors='white', pensize=1, colorby=None, first=0):
+    """
+    Splits a coordinate list into runs of consecutive segments that are drawn
+    in the same color and width. Colors either cycle along each path, the way
+    Pattern.simpledraw colors each segment by the index of the point it ends
+    on, or change from one path to the next like DrawPath. A PathCollection
+    with its own per point colors or pen sizes uses those instead.
+    Args:
+        coordlist: single path, list of paths, list of groups of paths, or a
+            PathCollection
+        colors: a color string, a list of them, or a ColorScheme
+        pensize: a single width, or a (start, end) tuple to fade the width
+            across the paths
+        colorby: 'segment' to cycle colors along each path, or 'path' to give
+            each path the next color in the list. Defaults to 'segment' for a
+            single path and 'path' otherwise.
+        first: index of the first path, so a collection drawn a chunk at a
+            time (see stream.py) is colored as if it were drawn all at once
+
+    Yields:
+        (points, color, pensize) for each run, where points is an (n, 2) array
+    """
+    if hasattr(colors, 'hex'):
+        colors = colors.hex
+    if isinstance(colors, str):
+        colors = [colors]
+    paths = aspaths(coordlist)
+    pointcolors = pointsizes = None
+    if isinstance(coordlist, PathCollection):
+        pointcolors, pointsizes = coordlist.colors, coordlist.pensizes
+        offsets = coordlist.offsets
+    if colorby is None:
+        colorby = 'segment' if len(paths) == 1 else 'path'
+    if isinstance(pensize, tuple) and len(pensize) == 2:
+        pensizes = np.linspace(pensize[0], pensize[1], len(paths))
+    else:
+        pensizes = np.full(len(paths), pensize)
+    for i, points in enumerate(paths):
+        if len(points) < 2:
+            continue
+        if pointcolors is None and pointsizes is None and (
+                colorby != 'segment' or len(colors) == 1):
+            yield points, colors[(first + i) % len(colors)], pensizes[i]
+            continue
+        # each segment is styled by the point it ends on
+        if pointcolors is not None:
+            segcolors = pointcolors[offsets[i] + 1:offsets[i + 1]]
+            segcolors = segcolors % len(colors)
+        elif colorby == 'segment':
+            segcolors = np.arange(1, len(points)) % len(colors)
+        else:
+            segcolors = np.full(len(points) - 1, (first + i) % len(colors))
+        if pointsizes is not None:
+            segsizes = pointsizes[offsets[i] + 1:offsets[i + 1]]
+        else:
+            segsizes = np.full(len(points) - 1, pensizes[i])
+        changes = (np.diff(segcolors) != 0) | (np.diff(segsizes) != 0)
+        starts = np.concatenate(([0], np.flatnonzero(changes) + 1))
+        ends = np.append(starts[1:], len(segcolors))
+        for start, end in zip(starts, ends):
+            yield (points[start:end + 1], colors[segcolors[start]],
+                   segsizes[start])
+
+
+def _corners(pixels, angle):
+    # the vertices of a polyline where it turns by more than angle radians
+    steps = np.diff(pixels, axis=0)
+    steps = steps[np.any(steps != 0, axis=1)]
+    if len(steps) < 2:
+        return np.empty((0, 2))
+    before, after = steps[:-1], steps[1:]
+    cross = before[:, 0] * after[:, 1] - before[:, 1] * after[:, 0]
+    dot = np.einsum('ij,ij->i', before, after)
+    sharp = np.arctan2(np.abs(cross), dot) > angle
+    vertices = pixels[0] + np.cumsum(steps, axis=0)[:-1]
+    return vertices[sharp]
+
+
+class Raster:
+    """
+    An offscreen image that paths can be drawn onto.
+    Args:
+        resolution: (width, height) of the final image in pixels
+        background: background color (any color string Pillow understands,
+            including the hex strings from ColorScheme.hex)
+        supersample: how many times larger to draw before scaling down to the
+            final size. Higher values give smoother lines. 1 turns
+            anti-aliasing off.
+        scale: multiplier from pattern coordinates (and pen sizes) to pixels.
+            Pattern coordinates are turtle coordinates, with (0, 0) in the
+            center and y going up.
+    """
+    def __init__(self, resolution=(1920, 1200), background='black',
+                 supersample=2, scale=1):
+        self.resolution = (int(resolution[0]), int(resolution[1]))
+        self.supersample = max(1, int(supersample))
+        self.scale = scale
+        size = tuple(i * self.supersample for i in self.resolution)
+        self.image = Image.new('RGB', size, background)
+        self._draw = ImageDraw.Draw(self.image)
+
+    def topixels(self, points):
+        """
+        Converts pattern coordinates to pixel coordinates on the (supersampled)
+        image.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        factor = self.scale * self.supersample
+        pixels = np.empty_like(points)
+        pixels[:, 0] = points[:, 0] * factor + self.image.width / 2
+        pixels[:, 1] = self.image.height / 2 - points[:, 1] * factor
+        return pixels
+
+    def line(self, points, color='white', pensize=1):
+        """
+        Draws a single polyline in one color.
+        """
+        if len(points) < 2:
+            return
+        width = max(1, round(pensize * self.scale * self.supersample))
+        pixels = self.topixels(points)
+        self._draw.line(pixels.ravel().tolist(), fill=color, width=width)
+        if width > 2:
+            # Pillow's joint='curve' rounds every vertex one at a time, which
+            # is most of the time spent on thick, dense paths. Only the
+            # corners sharp enough to leave a visible notch get rounded.
+            radius = width / 2
+            for x, y in _corners(pixels, 2 / width):
+                self._draw.ellipse(
+                    (x - radius, y - radius, x + radius, y + radius),
+                    fill=color
+                )
+
+    def paths(self, coordlist, colors='white', pensize=1, colorby=None,
+              first=0):
+        """
+        Draws a coordinate list of any depth, like DrawPath does. The
+        arguments are the same as for runs().
+        """
+        for points, color, width in runs(coordlist, colors, pensize, colorby,
+                                         first):
+            self.line(points, color, width)
+
+    def dots(self, points, color='white', size=1):
+        """
+        Draws a dot of diameter size at each point, like turtle.dot.
+        """
+        radius = max(0.5, size * self.supersample / 2)
+        for x, y in self.topixels(points):
+            self._draw.ellipse(
+                (x - radius, y - radius, x + radius, y + radius), fill=color
+            )
+
+    def finish(self):
+        """
+        Returns:
+            the final image at the output resolution
+        """
+        if self.supersample == 1:
+            return self.image.copy()
+        return self.image.resize(self.resolution, Image.LANCZOS)
+
+    def save(self, filename):
+        self.finish().save(filename)
+
+
+def render(coordlist, filename=None, colors='white', pensize=1,
+           background='black', resolution=(1920, 1200), supersample=2,
+           scale=1, colorby=None):
+    """
+    Draws a coordinate list onto a new Raster in one call.
+    Args:
+        coordlist: single path, list of paths, or list of groups of paths
+        filename: if given, the image is saved here (format from extension)
+        the rest are as for Raster and Raster.paths
+
+    Returns:
+        the finished PIL Image
+    """
+    raster = Raster(resolution, background, supersample, scale)
+    raster.paths(coordlist, colors, pensize, colorby)
+    image = raster.finish()
+    if filename is not None:
+        image.save(filename)
+    return image
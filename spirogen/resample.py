@@ -0,0 +1,183 @@
+"""
+Arc length resampling of paths.
+
+Patterns come out with very different point densities: some place a point
+every pixel, others leave long straight gaps, and the cost of drawing or
+rendering them follows the number of points rather than what is visible.
+These functions even that out, for a single path or a whole collection at
+once, all with numpy:
+
+densify() splits long segments so none is longer than a maximum length,
+keeping every original point.
+resample() places points at an even spacing along each path.
+decimate() resamples a collection down to a total number of points, shared
+between the paths by their length.
+
+Results are PathCollections with the same depth (and groups) as what was
+passed in. Per-point colors and pen sizes are carried over, with new points
+taking the style of the point that ends the segment they are on.
+"""
+import numpy as np
+
+from spirogen.paths import PathCollection
+
+
+def _collection(paths):
+    coll = PathCollection.fromlist(paths)
+    if coll.npaths and not coll.lengths.all():
+        raise ValueError('Cannot resample an empty path')
+    return coll
+
+
+def _rebuild(coll, points, counts, source):
+    # a collection like coll with new points, counts per path, and the
+    # index of the original point each new point takes its style from
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    styles = {}
+    for name in ('colors', 'pensizes'):
+        values = getattr(coll, name)
+        if values is not None:
+            styles[name] = values[source]
+    return PathCollection(points, offsets, groups=coll.groups,
+                          depth=coll.depth, **styles)
+
+
+def arc_lengths(coll):
+    """
+    Args:
+        coll: PathCollection
+
+    Returns:
+        (distance, lengths) where distance is an (N,) array of the distance
+        along its path to every point, and lengths the (P,) length of each
+        path
+    """
+    steps = np.zeros(coll.npoints)
+    steps[1:] = np.hypot(*np.diff(coll.points, axis=0).T)
+    starts = coll.offsets[:-1]
+    steps[starts] = 0
+    total = np.cumsum(steps)
+    distance = total - np.repeat(total[starts], coll.lengths)
+    return distance, distance[coll.offsets[1:] - 1]
+
+
+def densify(paths, maxlength):
+    """
+    Adds evenly spaced points to every segment longer than maxlength, so no
+    segment is longer than it. The original points are all kept.
+    Args:
+        paths: a path, list of paths or PathCollection
+        maxlength: longest a segment can be
+
+    Returns:
+        PathCollection
+    """
+    if maxlength <= 0:
+        raise ValueError('maxlength must be more than 0')
+    coll = _collection(paths)
+    points = coll.points
+    # number of pieces each point's segment to the next is cut into, with
+    # path ends counted as one piece so they are kept
+    pieces = np.ones(len(points), dtype=np.int64)
+    lengths = np.hypot(*np.diff(points, axis=0).T)
+    pieces[:-1] = np.maximum(np.ceil(lengths / maxlength), 1)
+    ends = coll.offsets[1:] - 1
+    pieces[ends] = 1
+    start = np.repeat(np.arange(len(points)), pieces)
+    step = np.arange(len(start)) - np.repeat(np.cumsum(pieces) - pieces,
+                                             pieces)
+    fraction = (step / pieces[start])[:, None]
+    end = np.minimum(start + 1, len(points) - 1)
+    new = points[start] + fraction * (points[end] - points[start])
+    # new points are on the segment ending at the next original point
+    source = np.where(step > 0, end, start)
+    counts = np.add.reduceat(pieces, coll.offsets[:-1])
+    return _rebuild(coll, new, counts, source)
+
+
+def sample(paths, counts, keep=None):
+    """
+    Places counts[i] points evenly along path i by arc length, including
+    both of its ends.
+    Args:
+        paths: a path, list of paths or PathCollection
+        counts: number of points for each path (1 keeps just the start)
+        keep: optional (P,) bool array of paths to leave as they are, whose
+            counts are ignored
+
+    Returns:
+        PathCollection
+    """
+    coll = _collection(paths)
+    counts = np.array(np.broadcast_to(counts, (coll.npaths,)), np.int64)
+    if keep is not None:
+        keep = np.asarray(keep, dtype=bool)
+        counts[keep] = coll.lengths[keep]
+    if (counts < 1).any():
+        raise ValueError('Every path needs at least 1 point')
+    distance, lengths = arc_lengths(coll)
+    # keep paths apart by a gap of 1, so the distance along all of them in
+    # a row only ever goes up and one np.interp call covers every path
+    gap = np.zeros(coll.npaths)
+    gap[1:] = np.cumsum(lengths[:-1] + 1)
+    along = distance + np.repeat(gap, coll.lengths)
+
+    path = np.repeat(np.arange(coll.npaths), counts)
+    step = np.arange(len(path)) - np.repeat(np.cumsum(counts) - counts,
+                                            counts)
+    fraction = step / np.maximum(counts - 1, 1)[path]
+    targets = gap[path] + fraction * lengths[path]
+    if keep is not None:
+        # the exact distances of the original points give them back as is
+        kept = np.repeat(keep, counts)
+        targets[kept] = along[np.repeat(keep, coll.lengths)]
+    new = np.column_stack([np.interp(targets, along, coll.points[:, k])
+                           for k in (0, 1)])
+    # the first original point at or past each target is the end of the
+    # segment the new point is on
+    source = np.searchsorted(along, targets)
+    source = np.clip(source, coll.offsets[:-1][path],
+                     coll.offsets[1:][path] - 1)
+    return _rebuild(coll, new, counts, source)
+
+
+def resample(paths, spacing):
+    """
+    Resamples every path to points spaced evenly along it, no further apart
+    than spacing, keeping both ends.
+
+    Returns:
+        PathCollection
+    """
+    if spacing <= 0:
+        raise ValueError('spacing must be more than 0')
+    coll = _collection(paths)
+    _, lengths = arc_lengths(coll)
+    return sample(coll, np.ceil(lengths / spacing).astype(np.int64) + 1)
+
+
+def decimate(paths, budget, minpoints=2):
+    """
+    Resamples a collection so it has at most budget points in total. Every
+    path keeps at least minpoints, and the rest are shared out by length.
+    Paths that already fit in their share are left as they are.
+    Args:
+        paths: a path, list of paths or PathCollection
+        budget: total number of points to aim for
+        minpoints: fewest points a path can be left with
+
+    Returns:
+        PathCollection
+    """
+    coll = _collection(paths)
+    _, lengths = arc_lengths(coll)
+    least = np.minimum(coll.lengths, minpoints)
+    spare = max(budget - int(least.sum()), 0)
+    total = lengths.sum()
+    if total > 0:
+        share = np.floor(spare * lengths / total).astype(np.int64)
+    else:
+        share = np.zeros(coll.npaths, dtype=np.int64)
+    counts = least + share
+    return sample(coll, counts, keep=coll.lengths <= counts)
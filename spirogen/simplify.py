@@ -0,0 +1,101 @@
+"""
+Polyline simplification.
+
+Generators like SpiralPattern and FlowerPattern2 place far more points than
+can be seen at the size they are drawn, and every point costs a line segment
+when drawing, rendering or exporting. rdp() removes the points that are
+within a tolerance of the line through their neighbours
+(Ramer-Douglas-Peucker), so a path looks the same at that tolerance with a
+fraction of the points. Every path of a collection is worked on at the same
+time: each pass finds the furthest point of every remaining stretch at once
+with numpy, and splits the ones that are out of tolerance.
+"""
+import numpy as np
+
+from spirogen.paths import PathCollection
+
+
+def _distance2(points, start, end):
+    # squared distance from each point to the segment from start to end
+    along = end - start
+    length2 = np.einsum('ij,ij->i', along, along)
+    offset = points - start
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.einsum('ij,ij->i', offset, along) / length2
+    t = np.clip(np.nan_to_num(t), 0, 1)
+    away = offset - t[:, None] * along
+    return np.einsum('ij,ij->i', away, away)
+
+
+def rdp(paths, tolerance, keep=None, stretch=1024):
+    """
+    Simplifies paths with the Ramer-Douglas-Peucker algorithm. The first and
+    last point of every path are always kept, as are the points where a
+    collection's per-point colors or pen sizes change, so the styling stays
+    the same.
+    Args:
+        paths: a path, list of paths or PathCollection
+        tolerance: furthest (in the paths' units) a removed point can be
+            from the simplified path
+        keep: optional (N,) bool array of other points that must be kept
+        stretch: paths are first cut every this many points. Splitting a
+            long path one point at a time (like a spiral, where the furthest
+            point is usually near an end) gets slow, and cutting it up first
+            hardly changes how many points are kept.
+
+    Returns:
+        PathCollection of the kept points, with the same depth and groups
+    """
+    coll = PathCollection.fromlist(paths)
+    points = coll.points
+    kept = np.zeros(len(points), dtype=bool)
+    filled = coll.lengths > 0
+    kept[coll.offsets[:-1][filled]] = True
+    kept[coll.offsets[1:][filled] - 1] = True
+    if keep is not None:
+        kept |= np.asarray(keep, dtype=bool)
+    if stretch:
+        position = np.arange(len(points)) - np.repeat(coll.offsets[:-1],
+                                                      coll.lengths)
+        kept[position % stretch == 0] = True
+    for values in (coll.colors, coll.pensizes):
+        if values is not None:
+            # a segment is styled by the point it ends on, so the point
+            # before a change ends the last segment of the old style
+            kept[:-1] |= values[1:] != values[:-1]
+
+    # stretches between neighbouring kept points with points in between
+    index = np.flatnonzero(kept)
+    first, last = index[:-1], index[1:]
+    inside = last - first > 1
+    first, last = first[inside], last[inside]
+    tolerance2 = tolerance ** 2
+    while len(first):
+        counts = last - first - 1
+        group = np.repeat(np.arange(len(first)), counts)
+        starts = np.cumsum(counts) - counts
+        between = (np.repeat(first + 1, counts)
+                   + np.arange(len(group)) - np.repeat(starts, counts))
+        dist = _distance2(points[between], points[first[group]],
+                          points[last[group]])
+        furthest = np.maximum.reduceat(dist, starts)
+        split = furthest > tolerance2
+        # the first point of each stretch that is furthest away
+        at = np.flatnonzero(dist == furthest[group])
+        _, firsthit = np.unique(group[at], return_index=True)
+        middle = between[at[firsthit]][split]
+        kept[middle] = True
+        first, last = first[split], last[split]
+        first, last = np.concatenate((first, middle)), \
+            np.concatenate((middle, last))
+        inside = last - first > 1
+        first, last = first[inside], last[inside]
+
+    counts = np.zeros(len(points) + 1, dtype=np.int64)
+    np.cumsum(kept, out=counts[1:])
+    return PathCollection(
+        points[kept], counts[coll.offsets],
+        None if coll.colors is None else coll.colors[kept],
+        None if coll.pensizes is None else coll.pensizes[kept],
+        coll.groups, coll.depth
+    )
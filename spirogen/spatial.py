@@ -0,0 +1,323 @@
+"""
+Spatial searches over points and paths using uniform grids.
+
+LVL2.sin_avg_point_rotation connects the ends of its strands by always going
+to the closest end it hasn't visited yet. Measuring the distance to every end
+left at each step makes that O(n^2). GridIndex hashes the points into a
+uniform grid of cells that points can be removed from, so each step only looks
+at the cells around the current point, and tour() builds the whole greedy
+nearest neighbour ordering in close to linear time.
+
+intersections() finds where paths cross each other (used by
+Analyze.crosspoint). Every segment is put in the grid cells it passes
+through, and only segments sharing a cell are tested against each other, all
+with numpy.
+"""
+from math import floor, inf, sqrt
+
+import numpy as np
+
+from spirogen.paths import PathCollection
+
+
+class GridIndex:
+    """
+    Uniform grid hash of 2D points for nearest neighbour lookups, with
+    support for removing points.
+    Args:
+        points: (N, 2) array-like of points. Points are referred to by their
+            index in this.
+    """
+    def __init__(self, points):
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        self.x = points[:, 0].tolist()
+        self.y = points[:, 1].tolist()
+        self.removed = [False] * len(points)
+        self.count = len(points)
+        self.build()
+
+    def __len__(self):
+        return self.count
+
+    def build(self):
+        """
+        Hashes the remaining points into cells sized to hold about two points
+        each. This is redone whenever half the points have been removed, so
+        the cells don't empty out as the set shrinks.
+        """
+        alive = [i for i, gone in enumerate(self.removed) if not gone]
+        self.built = len(alive)
+        self.cells = {}
+        if not alive:
+            return
+        points = np.column_stack(
+            ([self.x[i] for i in alive], [self.y[i] for i in alive])
+        )
+        width, height = np.ptp(points, axis=0).tolist()
+        n = len(alive)
+        # the second term keeps cells sensible for points along a line
+        size = max(sqrt(width * height * 2 / n), max(width, height) * 2 / n)
+        self.size = size if size > 0 else 1.0
+        keys = np.floor(points / self.size).astype(np.int64)
+        for key, i in zip(map(tuple, keys.tolist()), alive):
+            cell = self.cells.get(key)
+            if cell is None:
+                self.cells[key] = {i}
+            else:
+                cell.add(i)
+        low, high = keys.min(axis=0).tolist(), keys.max(axis=0).tolist()
+        self.cellbounds = (low[0], low[1], high[0], high[1])
+
+    def key(self, x, y):
+        return floor(x / self.size), floor(y / self.size)
+
+    def remove(self, index):
+        """
+        Removes point index from the set. Removing a point twice does nothing.
+        """
+        if self.removed[index]:
+            return
+        self.removed[index] = True
+        self.count -= 1
+        key = self.key(self.x[index], self.y[index])
+        cell = self.cells[key]
+        cell.discard(index)
+        if not cell:
+            del self.cells[key]
+        if self.count <= self.built // 2:
+            self.build()
+
+    def nearest(self, x, y):
+        """
+        Finds the closest remaining point to (x, y). Ties go to the lowest
+        index, the same as taking the argmin of the distances to every point.
+
+        Returns:
+            index of the point, or None if there are none left
+        """
+        if not self.count:
+            return None
+        size = self.size
+        cx, cy = self.key(x, y)
+        xlow, ylow, xhigh, yhigh = self.cellbounds
+        # the ring of cells past which there are no more points
+        rmax = max(cx - xlow, xhigh - cx, cy - ylow, yhigh - cy)
+        best, bestdist = None, inf
+        r = 0
+        while r <= rmax:
+            # walk the square ring of cells r away from (cx, cy)
+            xs = range(max(cx - r, xlow), min(cx + r, xhigh) + 1)
+            ys = range(max(cy - r + 1, ylow), min(cy + r - 1, yhigh) + 1)
+            rows = {j for j in (cy - r, cy + r) if ylow <= j <= yhigh}
+            columns = {i for i in (cx - r, cx + r) if xlow <= i <= xhigh}
+            keys = [(i, j) for j in rows for i in xs]
+            keys += [(i, j) for i in columns for j in ys]
+            for key in keys:
+                cell = self.cells.get(key)
+                if cell is None:
+                    continue
+                for i in cell:
+                    dx, dy = self.x[i] - x, self.y[i] - y
+                    dist = dx * dx + dy * dy
+                    if dist < bestdist or (dist == bestdist and i < best):
+                        best, bestdist = i, dist
+            # every point further out is at least r cells away
+            if bestdist <= (r * size) ** 2:
+                break
+            r += 1
+        return best
+
+
+def tour(points, start=0):
+    """
+    Orders points by starting at one and always moving to the closest point
+    not visited yet (the greedy nearest neighbour tour).
+    Args:
+        points: (N, 2) array-like of points, e.g. a list of (x, y) tuples
+        start: index of the point to start at
+
+    Returns:
+        list of the indices of every point in the order they are visited
+    """
+    index = GridIndex(points)
+    if not len(index):
+        return []
+    order = []
+    current = start
+    while current is not None:
+        order.append(current)
+        index.remove(current)
+        current = index.nearest(index.x[current], index.y[current])
+    return order
+
+
+def intersections(paths, cellsize=None, selfintersections=False,
+                  chunksize=1 << 21):
+    """
+    Finds every point where the segments of different paths cross.
+    Args:
+        paths: list of paths, a single path, or a PathCollection
+        cellsize: side length of the grid cells. Defaults to the median size
+            of a segment, made larger if the long segments would otherwise
+            pass through more than about three cells per segment in all.
+        selfintersections: also find where a path crosses itself. A single
+            path is always checked against itself.
+        chunksize: rough number of segment pairs tested at a time, which
+            keeps the memory used down when lots of segments overlap
+
+    Returns:
+        (K, 2) array of the crossing points, ordered by the segments crossing
+    """
+    coll = PathCollection.fromlist(paths)
+    if coll.depth == 1:
+        selfintersections = True
+    points, offsets = coll.points, coll.offsets
+    lengths = np.diff(offsets)
+    # segment k runs from points[k] to points[k + 1], except at path ends
+    last = np.zeros(len(points), dtype=bool)
+    last[offsets[1:][lengths > 0] - 1] = True
+    starts = np.flatnonzero(~last)
+    if len(starts) < 2:
+        return np.empty((0, 2))
+    pathid = np.repeat(np.arange(len(lengths)), lengths)[starts]
+    closes = last[starts + 1]
+    a, b = points[starts], points[starts + 1]
+    low, high = np.minimum(a, b), np.maximum(a, b)
+
+    if cellsize is None:
+        # most segments then pass through a cell or two. Long ones pass
+        # through more, so the cells are grown until there are about three
+        # per segment in all.
+        walked = float(np.sum(high - low))
+        cellsize = max(float(np.median(np.max(high - low, axis=1))),
+                       walked / (3 * len(starts)))
+    if not cellsize > 0:
+        cellsize = 1.0
+    seg, key = _cells(a / cellsize, b / cellsize)
+    order = np.argsort(key, kind='stable')
+    key, seg = key[order], seg[order]
+
+    # each entry is paired with the entries after it in the same cell
+    first = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+    sizes = np.diff(np.r_[first, len(key)])
+    after = (np.repeat(sizes, sizes) - 1
+             - (np.arange(len(key)) - np.repeat(first, sizes)))
+    total = np.cumsum(after)
+
+    segments = _Segments(a, b, low, high, pathid, closes)
+    found = []
+    begin = 0
+    while begin < len(key):
+        done = total[begin - 1] if begin else 0
+        end = max(int(np.searchsorted(total, done + chunksize, 'right')),
+                  begin + 1)
+        counts = after[begin:end]
+        left = np.repeat(np.arange(begin, end), counts)
+        right = left + 1 + (np.arange(len(left))
+                            - np.repeat(np.cumsum(counts) - counts, counts))
+        found.append(segments.crossings(seg[left], seg[right],
+                                        selfintersections))
+        begin = end
+
+    i, j, t = (np.concatenate(x) for x in zip(*found))
+    # a pair of segments is tested in every cell they share, and seg[left] is
+    # always the lower one, so this also sorts them by the segments crossing
+    _, once = np.unique(i * len(starts) + j, return_index=True)
+    i, t = i[once], t[once]
+    return a[i] + t[:, None] * (b[i] - a[i])
+
+
+def _cells(a, b):
+    """
+    The grid cells of side 1 that the segments from a[k] to b[k] pass
+    through.
+
+    Returns:
+        (seg, key) with an entry for every cell a segment passes through,
+        where seg is the segment and key numbers the cell
+    """
+    low = np.floor(np.minimum(a, b)).astype(np.int64)
+    high = np.floor(np.maximum(a, b)).astype(np.int64)
+    origin = low.min(axis=0)
+    low, high, a, b = low - origin, high - origin, a - origin, b - origin
+    rows = int(high[:, 1].max()) + 1
+    # walk each segment one column of cells at a time along the axis it
+    # crosses the most cells on (p), and find the cells it covers in that
+    # column along the other one (q)
+    n = np.arange(len(a))
+    major = np.argmax(high - low, axis=1)
+    minor = 1 - major
+    pa, pb, qa, qb = a[n, major], b[n, major], a[n, minor], b[n, minor]
+    columns = high[n, major] - low[n, major] + 1
+    seg = np.repeat(n, columns)
+    column = low[seg, major[seg]] + (
+        np.arange(len(seg)) - np.repeat(np.cumsum(columns) - columns, columns)
+    )
+    dp = pb - pa
+    slope = np.divide(qb - qa, dp, out=np.zeros(len(n)), where=dp != 0)
+    p0 = np.maximum(column, np.minimum(pa, pb)[seg])
+    p1 = np.minimum(column + 1, np.maximum(pa, pb)[seg])
+    q0 = qa[seg] + (p0 - pa[seg]) * slope[seg]
+    q1 = qa[seg] + (p1 - pa[seg]) * slope[seg]
+    # a little wider, so rounding never loses the cell a crossing is in, but
+    # never outside the segment's bounding box
+    lowq = np.clip(np.floor(np.minimum(q0, q1) - 1e-6).astype(np.int64),
+                   low[seg, minor[seg]], high[seg, minor[seg]])
+    highq = np.clip(np.floor(np.maximum(q0, q1) + 1e-6).astype(np.int64),
+                    low[seg, minor[seg]], high[seg, minor[seg]])
+
+    count = highq - lowq + 1
+    entry = np.repeat(np.arange(len(seg)), count)
+    q = lowq[entry] + (
+        np.arange(len(entry)) - np.repeat(np.cumsum(count) - count, count)
+    )
+    p = column[entry]
+    seg = seg[entry]
+    xmajor = major[seg] == 0
+    x, y = np.where(xmajor, p, q), np.where(xmajor, q, p)
+    return seg, x * rows + y
+
+
+class _Segments:
+    """
+    The segments intersections() is testing, split into flat arrays.
+    """
+    def __init__(self, a, b, low, high, pathid, closes):
+        self.ax, self.ay = a[:, 0].copy(), a[:, 1].copy()
+        self.rx, self.ry = b[:, 0] - a[:, 0], b[:, 1] - a[:, 1]
+        self.lowx, self.lowy = low[:, 0].copy(), low[:, 1].copy()
+        self.highx, self.highy = high[:, 0].copy(), high[:, 1].copy()
+        self.pathid = pathid
+        self.closes = closes
+
+    def crossings(self, i, j, selfintersections=False):
+        """
+        Tests segments i against segments j.
+
+        Returns:
+            (i, j, t) of the pairs that cross, where the crossing is t of the
+            way along segment i
+        """
+        if not selfintersections:
+            keep = self.pathid[i] != self.pathid[j]
+            i, j = i[keep], j[keep]
+        keep = ((self.lowx[i] <= self.highx[j]) & (self.lowx[j] <= self.highx[i])
+                & (self.lowy[i] <= self.highy[j]) & (self.lowy[j] <= self.highy[i]))
+        i, j = i[keep], j[keep]
+
+        rx, ry, sx, sy = self.rx[i], self.ry[i], self.rx[j], self.ry[j]
+        dx, dy = self.ax[j] - self.ax[i], self.ay[j] - self.ay[i]
+        denom = rx * sy - ry * sx
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = (dx * sy - dy * sx) / denom
+            u = (dx * ry - dy * rx) / denom
+        # segments include their start but not their end, unless they end the
+        # path, so a crossing right on a point between two segments counts once
+        hit = ((denom != 0) & (t >= 0) & (u >= 0)
+               & ((t < 1) | (self.closes[i] & (t == 1)))
+               & ((u < 1) | (self.closes[j] & (u == 1))))
+        if selfintersections:
+            # neighbouring segments of a path only meet where they join
+            same = self.pathid[i] == self.pathid[j]
+            hit &= ~same | ((t > 0) & (t < 1) & (u > 0) & (u < 1))
+        return i[hit], j[hit], t[hit]
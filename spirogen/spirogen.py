@@ -1,8 +1,16 @@
 import turtle
 import numpy as np
-from matplotlib.colors import rgb2hex as pltcolors
-from scipy.spatial import distance
 from math import *
+from spirogen import (
+    analysis, geometry, lazy, palette, parallel, pointcloud, resample,
+    simplify, spatial, stream
+)
+from spirogen.paths import PathCollection
+
+# only needed by closest_point, and slow to import
+distance = lazy.module('scipy.spatial.distance')
+# only needed by drawsteps, and imports Pillow
+render = lazy.module('spirogen.render')
 
 default_color_list = [
     'red', 'crimson', 'orangered', 'darkorange', 'orange', 'gold',
@@ -30,62 +38,69 @@ def setup(genspeed=1, turtlespeed=10, backgroundcolor='black', hide=True, resolu
 
 
 class Transform:
+    """
+    Holds a set of points as an (N, 2) float array and transforms them.
+
+    The original methods (xscale, yshift, rotate, etc.) apply straight away
+    and return the new list of (x, y) tuples, updating the pattern's list
+    when a pattern was passed in. The chainable methods (scaled, shifted,
+    rotated, origin_rotated, reflected) only compose their 3x3 affine matrix
+    onto self.matrix, so any number of them can be applied in one go with
+    apply().
+
+    Lists, arrays and PathCollections passed in are copied, so the only
+    thing that changes them is apply(inplace=True).
+    """
 
     def __init__(self, func):
         self.func = func
-        if isinstance(func, (list, tuple)):
-            inputxy = func
-            self.inputxy = func
-        elif isinstance(func, (Pattern, PolarPattern, SpiralPattern, TimesTable)):
+        if isinstance(func, (Pattern, PolarPattern, SpiralPattern, TimesTable)):
             inputxy = func.list
-            self.inputxy = func.list
-        if not isinstance(inputxy[0], list):
-            inputxy = [list(lst) for lst in inputxy]
-            self.inputxy = inputxy
-        self._input = inputxy
-        self.ldepth = get_depth(self.inputxy)
-        if self.ldepth == 1:
-            self.xlist = [i[0] for i in inputxy]
-            self.ylist = [i[1] for i in inputxy]
-        if self.ldepth == 2:
-            self.xlist, self.ylist = [], []
-            for xy in inputxy:
-                if isinstance(xy, (tuple, list)) and len(xy) == 2:
-                    self.xlist.append(xy[0])
-                    self.ylist.append(xy[1])
-                elif isinstance(xy[0], (tuple, list)) and len(xy[0]) == 2:
-                    for i in xy:
-                        self.xlist.append(i[0])
-                        self.ylist.append(i[1])
-            for i in self.xlist:
-                if not isinstance(i, (float, int)):
-                    print('Transform might fail, item not an integer: ', i, type(i))
-
-        self.list = [c for c in zip(self.xlist, self.ylist)]
-        if self.ldepth == 1:
-            self.cartesianlist = [self.pol2cart(pc[0], pc[1]) for pc in inputxy]
-            self.polarlist = [self.cart2pol(xy[0], xy[1]) for xy in inputxy]
+        else:
+            inputxy = func
+        self.inputxy = inputxy
+        if isinstance(inputxy, PathCollection):
+            self.ldepth = min(inputxy.depth, 2)
+            self.array = np.array(inputxy.points, dtype=float)
+        elif isinstance(inputxy, np.ndarray):
+            self.ldepth = inputxy.ndim - 1
+            self.array = np.array(inputxy, dtype=float).reshape(-1, 2)
+        elif np.ndim(inputxy[0]) == 1:
+            self.ldepth = 1
+            self.array = np.array(inputxy, dtype=float).reshape(-1, 2)
+        else:
+            self.ldepth = 2
+            self.array = np.concatenate(
+                [np.array(lst, dtype=float).reshape(-1, 2) for lst in inputxy]
+            )
+        self.matrix = np.identity(3)
 
     def __repr__(self):
-        # if isinstance(self.func, (list, tuple)):
-        #     return self.cartesianlist
-        # else:
-        #     return self.cartesianlist
-        lst = list(self.cartesianlist)
-        return lst
+        return str(self.list)
 
     def __str__(self):
-        return str(self.cartesianlist)
+        return str(self.list)
 
     def __getitem__(self, index):
-        return self.cartesianlist[index]
+        return tuple(self.array[index])
 
     def __setitem__(self, index, value):
-        self.cartesianlist[index] = value
+        self.array[index] = value
 
     def __len__(self):
-        return len(self.cartesianlist)
+        return len(self.array)
+
+    @property
+    def list(self):
+        return geometry.tuples(self.array)
+
+    @property
+    def xlist(self):
+        return self.array[:, 0].tolist()
 
+    @property
+    def ylist(self):
+        return self.array[:, 1].tolist()
 
     @staticmethod
     def cart2pol(x, y):
@@ -99,127 +114,148 @@ class Transform:
         y = radius * np.sin(theta)
         return x, y
 
+    def scaled(self, x=1, y=None):
+        self.matrix = geometry.scale_matrix(x, y) @ self.matrix
+        return self
+
+    def shifted(self, x=0, y=0):
+        self.matrix = geometry.shift_matrix(x, y) @ self.matrix
+        return self
+
+    def rotated(self, angle, center=(0, 0)):
+        # clockwise, same as rotate()
+        rotation = geometry.rotation_matrix(angle, center, clockwise=True)
+        self.matrix = rotation @ self.matrix
+        return self
+
+    def origin_rotated(self, angle):
+        # counterclockwise around the origin, same as origin_rotate()
+        self.matrix = geometry.rotation_matrix(angle) @ self.matrix
+        return self
+
+    def reflected(self, x=False, y=False):
+        self.matrix = geometry.reflection_matrix(x, y) @ self.matrix
+        return self
+
+    def apply(self, inplace=False):
+        """
+        Applies every chained operation at once.
+        Args:
+            inplace: if True, the points held by this Transform are replaced
+                by the result and the chain is reset. So is whatever was
+                passed in: a pattern's list, or the points of an array or
+                PathCollection.
+
+        Returns:
+            (N, 2) array of the transformed points
+        """
+        if not inplace:
+            return geometry.apply_matrix(self.array, self.matrix)
+        self._update()
+        if isinstance(self.func, PathCollection):
+            self.func.points[...] = self.array
+        elif isinstance(self.func, np.ndarray):
+            self.func[...] = self.array.reshape(self.func.shape)
+        return self.array
+
+    def _update(self):
+        # runs the chain on the held points, and a pattern's list, but never
+        # on a list or array that was passed in
+        geometry.apply_matrix(self.array, self.matrix, out=self.array)
+        self.matrix = np.identity(3)
+        if not isinstance(self.func, (list, tuple, np.ndarray, PathCollection)):
+            self.func.list = self.list
+
+    def _transform(self, matrix):
+        # applies a single operation right away for the original methods
+        self.matrix = matrix @ self.matrix
+        self._update()
+        return self.list
+
     def xscale(self, scaleamt):
-        self.xlist = map(lambda x: x * scaleamt, self.xlist)
-        self.list = [c for c in zip(self.xlist, self.ylist)]
-        if isinstance(self.func, (list, tuple)):
-            return self.list
-        else:
-            return self.list
+        return self._transform(geometry.scale_matrix(scaleamt, 1))
 
     def yscale(self, scaleamt):
-        self.ylist = map(lambda y: y * scaleamt, self.ylist)
-        self.list = [c for c in zip(self.xlist, self.ylist)]
-        if isinstance(self.func, (list, tuple)):
-            return self.list
-        else:
-            self.func.list = self.list
+        return self._transform(geometry.scale_matrix(1, scaleamt))
 
     def xshift(self, shiftamt):
-        self.xlist = map(lambda x: x + shiftamt, self.xlist)
-        self.list = [c for c in zip(self.xlist, self.ylist)]
-        if isinstance(self.func, (list, tuple)):
-            return self.list
-        else:
-            self.func.list = self.list
+        return self._transform(geometry.shift_matrix(shiftamt, 0))
 
     def yshift(self, shiftamt):
-        self.ylist = map(lambda y: y + shiftamt, self.ylist)
-        self.list = [c for c in zip(self.xlist, self.ylist)]
-        if isinstance(self.func, (list, tuple)):
-            return self.list
-        else:
-            self.func.list = self.list
+        return self._transform(geometry.shift_matrix(0, shiftamt))
 
     def origin_rotate(self, angle):
-        rads = angle * (pi / 180)
-        newxlist = [(x * cos(rads)) - (y * sin(rads)) for x, y in self.list]
-        newylist = [(y * cos(rads)) + (x * sin(rads)) for x, y in self.list]
-        newlist = [xy for xy in zip(newxlist, newylist)]
-        if isinstance(self.func, (list, tuple)):
-            return newlist
-        else:
-            self.func.list = newlist
-            return newlist
+        return self._transform(geometry.rotation_matrix(angle))
 
     def rotate(self, angle, center=[0, 0]):
-        rads = angle * (pi / 180)
-        x0, y0 = center[0], center[1]
-        # ((x - x0) * cos(rads) + (y - y0) * sin(rads) + x0) # x
-        # (−(x − x0) * sin(rads) + (y − y0) * cos(rads) + y0) # y
-        newxlist = [((x - x0) * cos(rads) + (y - y0) * sin(rads) + x0) for x, y
-                    in self.list]
-        newylist = [(-(x - x0) * sin(rads) + (y - y0) * cos(rads) + y0) for x, y
-                    in self.list]
-        newlist = [xy for xy in zip(newxlist, newylist)]
-        if isinstance(self.func, Wave):
-            self.func.list = newylist
-        if isinstance(self.func, (list, tuple)):
-            return newlist
-        else:
-            self.func.list = newlist
+        return self._transform(
+            geometry.rotation_matrix(angle, center, clockwise=True)
+        )
 
     def reflectx(self):
-        newylist = [(y * -1) for y in self.ylist]
-        newlist = [c for c in zip(self.xlist, newylist)]
-        if isinstance(self.func, (list, tuple)):
-            return newlist
-        else:
-            self.func.list = newlist
+        return self._transform(geometry.reflection_matrix(x=True))
 
     def reflecty(self):
-        newxlist = [(x * -1) for x in self.xlist]
-        newlist = [c for c in zip(newxlist, self.ylist)]
-        if isinstance(self.func, (list, tuple)):
-            return newlist
+        return self._transform(geometry.reflection_matrix(y=True))
+
+    @staticmethod
+    def batch(paths, matrices):
+        """
+        Transforms every path in a list by its own 3x3 affine matrix in a
+        single vectorized call (see geometry.transform_paths).
+        Args:
+            paths: list of paths, each a list of (x, y) or an (n, 2) array,
+                or a PathCollection
+            matrices: (len(paths), 3, 3) array, one matrix per path
+
+        Returns:
+            list of the transformed paths as lists of (x, y) tuples
+        """
+        if isinstance(paths, PathCollection):
+            points, offsets = paths.points, paths.offsets
+            points = geometry.transform_paths(points, matrices, offsets)
         else:
-            self.func.list = newlist
+            points, offsets = geometry.stack_paths(paths)
+            geometry.transform_paths(points, matrices, offsets, out=points)
+        paths = geometry.split_paths(points, offsets)
+        return [geometry.tuples(p) for p in paths]
 
     def addpoints(self, thresh, addnptz=10):
-        pointlist = self.inputxy
-        distlist, xydistlist = Analyze(pointlist).distancelist()
-        newcoords = []
-        for i in range(len(pointlist) - 1):
-            currentpoint = pointlist[i]
-            dist2nxt = distlist[i]
-            xdist2nxt = xydistlist[i][0]
-            ydist2nxt = xydistlist[i][1]
-            newcoords.append(currentpoint)
-            if abs(dist2nxt) >= thresh:
-                xinterval = xdist2nxt / addnptz
-                yinterval = ydist2nxt / addnptz
-                for j in range(addnptz):
-                    newx = currentpoint[0] - (xinterval * (j + 1))
-                    newy = currentpoint[1] - (yinterval * (j + 1))
-                    newxy = (newx, newy)
-                    newcoords.append(newxy)
-        return newcoords
-
-    def generatepointcloud(self, density, spread, exp=1):
-        pointlist = []
-        if self.ldepth == 1:
-            for coord in self.inputxy:
-                center_x, center_y = coord[0], coord[1]
-                for i in range(density):
-                    radius = (np.random.exponential(exp) * spread)
-                    angle = np.random.uniform(0, 2 * pi)
-                    x = radius * cos(angle) + center_x
-                    y = radius * sin(angle) + center_y
-                    point_coord = (x, y)
-                    pointlist.append(point_coord)
-        elif self.ldepth == 2:
-            for lst in self.inputxy:
-                for coord in lst:
-                    # print(f"coord: {coord}")
-                    center_x, center_y = coord[0], coord[1]
-                    for i in range(density):
-                        radius = (np.random.exponential(exp) * spread)
-                        angle = np.random.uniform(0, 2 * pi)
-                        x = radius * cos(angle) + center_x
-                        y = radius * sin(angle) + center_y
-                        point_coord = (x, y)
-                        pointlist.append(point_coord)
-        return pointlist
+        """
+        Fills in the gaps between points, so that no two neighbouring points
+        are further apart than thresh / addnptz. Every gap is split evenly
+        (see resample.densify), so the density is the same everywhere.
+        Gaps shorter than thresh are split too, where only gaps of at least
+        thresh used to be, so most patterns get more points than they did.
+        Args:
+            thresh: gap size that gets addnptz points added to it
+            addnptz: number of points added to a gap of size thresh. With 0
+                or less, no points are added.
+
+        Returns:
+            the new list of (x, y) tuples, or list of lists for a list of paths
+        """
+        if addnptz <= 0:
+            return PathCollection.fromlist(self.inputxy).tolist()
+        return resample.densify(self.inputxy, thresh / addnptz).tolist()
+
+    def generatepointcloud(self, density, spread, exp=1, seed=None):
+        """
+        Scatters density random points around every point (see
+        pointcloud.cloud).
+        Args:
+            density: number of points around each point
+            spread: multiplier for their distance from the point
+            exp: scale of the exponential distribution the distances come
+                from
+            seed: int to get the same cloud every time
+
+        Returns:
+            list of (x, y) tuples
+        """
+        return geometry.tuples(
+            pointcloud.cloud(self.array, density, spread, exp, seed)
+        )
 
 
 class Analyze:
@@ -234,64 +270,50 @@ class Analyze:
         self.coordlist = []
         self.ldepth = ldepth
 
-    def crosspoint(self, xtolerance=0.2, ytolerance=10, show=False):
-        biglist = self.funclist
-        listnum = len(biglist)
-        listsize = len(biglist[0])
-        ypoints = []
-        points = []
-        for n in range(listnum):
-            for i in range(listsize):
-                ind = n + 1
-                if n == listnum - 1:
-                    ind = 0
-                if abs(biglist[n][i][0] - biglist[ind][i][0]) < xtolerance:
-                    ypoints.append(biglist[n][i])
-
-        for n in range(len(ypoints)):
-            ind = n + 1
-            if n == len(ypoints) - 1:
-                ind = 0
-            if abs(ypoints[n][1] - ypoints[ind][1]) < ytolerance:
-                points.append(ypoints[n])
+    def crosspoint(self, xtolerance=None, ytolerance=None, show=False,
+                   cellsize=None):
+        """
+        Finds every point where the paths in funclist cross each other (or
+        where a single path crosses itself), see spatial.intersections.
+        Args:
+            xtolerance: deprecated and ignored, the crossings are found
+                exactly. Kept so show can still be passed by position.
+            ytolerance: deprecated and ignored
+            show: draw the crossing points and their average
+            cellsize: size of the grid cells used to find them
+
+        Returns:
+            (points, avg) where points is a list of (x, y) crossing points and
+            avg their average, or None if there aren't any
+        """
+        crossings = spatial.intersections(self.funclist, cellsize)
+        points = geometry.tuples(crossings)
         self.coordlist = points
-        avg = self.avgcoord(points)
+        avg = tuple(crossings.mean(axis=0).tolist()) if len(points) else None
         if show is True:
             self.drawdots(points)
             self.drawdots(avg)
         if len(points) == 0:
-            print('No crosspoint canidates were found. Returning None')
+            print('No crosspoints were found. Returning None')
         return points, avg
 
     def center(self, show=False):
-
-        avgs = []
         if self.ldepth == 1:
-            avgs.append(self.avgcoord(self.funclist))
-            center = self.avgcoord(avgs)
+            center = self.avgcoord(self.funclist)
         elif self.ldepth == 2:
-            for i in self.funclist:
-                avgs.append(self.avgcoord(i))
-            xs = [xy[0] for xy in avgs]
-            ys = [xy[1] for xy in avgs]
-            xavg = sum(xs) / len(xs)
-            yavg = sum(ys) / len(xs)
-            avg = (xavg, yavg)
-            center = avg
+            # the average of each path's center, so every path counts the same
+            centers = analysis.centroids(self.funclist)
+            center = tuple(centers.mean(axis=0).tolist())
         if show is True:
             self.drawdots(center)
         return center
 
     def distancelist(self):
-        coords = self.funclist
-        distlist = []
-        xydistlist = []
-        for i in range(len(coords)):
-            i2 = ((i + 1) % len(coords))
-            dist, xdist, ydist = self.distance(coords[i], coords[i2], seperate=True)
-            distlist.append(dist)
-            xydistlist.append((xdist, ydist))
-        return distlist, xydistlist
+        # distances from each point to the next, wrapping around at the end,
+        # rounded the same way as distance()
+        xydists = np.round(-analysis.segments(self.funclist, closed=True), 6)
+        distlist = np.round(np.hypot(*xydists.T), 2).tolist()
+        return distlist, [tuple(xy) for xy in xydists.tolist()]
 
     @staticmethod
     def drawdots(points, size=10):
@@ -310,15 +332,10 @@ class Analyze:
         turtle.pendown()
 
     def avgcoord(self, coords):
-        # if self.ldepth == 1:
-        xs, ys = [xy[0] for xy in coords], [xy[1] for xy in coords]
-        if len(xs) and len(ys) > 0:
-            xavg = sum(xs) / len(xs)
-            yavg = sum(ys) / len(ys)
-            avgcoord = (xavg, yavg)
-            return avgcoord
-        else:
+        avg = analysis.centroid(coords)
+        if avg is None:
             return None
+        return tuple(avg.tolist())
 
 
     @staticmethod
@@ -370,14 +387,8 @@ class ColorScheme:
         self.rlist = self.colors['r']
         self.glist = self.colors['g']
         self.blist = self.colors['b']
-        self.rgbdivs = {}
         self.roundto = 3
-        self.set_transition_divisions()
-        self.fades = self.set_fades()
-        self.rgbcolors = self.join_colors()
-        self.rgb0to1 = self.scale0to1(self.rgbcolors)
-        self.hex = []
-        self.hexconvert()
+        self.build()
         if symetrical is True:
             self.rgb0to1 = self.rgb0to1 + self.rgb0to1[::-1]
             self.rgb0to1 = self.rgb0to1 + self.rgb0to1[::-1]
@@ -404,14 +415,8 @@ class ColorScheme:
         self.rlist = self.colors['r']
         self.glist = self.colors['g']
         self.blist = self.colors['b']
-        self.rgbdivs = {}
         self.roundto = 3
-        self.set_transition_divisions()
-        self.fades = self.set_fades()
-        self.rgbcolors = self.join_colors()
-        self.rgb0to1 = self.scale0to1(self.rgbcolors)
-        self.hex = []
-        self.hexconvert()
+        self.build()
         if self._symetrical is True:
             self.rgb0to1 = self.rgb0to1 + self.rgb0to1[::-1]
             self.rgb0to1 = self.rgb0to1 + self.rgb0to1[::-1]
@@ -446,59 +451,23 @@ class ColorScheme:
                     newlist.append(color[i][1])
             self.colors[k] = newlist
 
-    def set_transition_divisions(self):
-        rlen = len(self.rlist) - 1
-        glen = len(self.glist) - 1
-        blen = len(self.blist) - 1
-
-        rdivs = [self.ncolors // rlen] * rlen
-        gdivs = [self.ncolors // glen] * glen
-        bdivs = [self.ncolors // blen] * blen
-        rgbdivs = {'r': rdivs, 'g': gdivs, 'b': bdivs}
-        # Adding or subtracting from sections for divisibility
-        for k in self.keylist:
-            if sum(rgbdivs[k]) != self.ncolors:
-                diff = self.ncolors - sum(rgbdivs[k])
-                if diff < 0:
-                    f = -1
-                elif diff > 0:
-                    f = 1
-                for l in range(diff):
-                    rgbdivs[k][-(l + 1)] += f
-        self.rgbdivs = rgbdivs
-
-    def set_fades(self):
-        rgbdivs = self.rgbdivs
-        fades = {'r': [], 'g': [], 'b': []}
-        # rdivs, gdivs, bdivs = rgbdivs['r'], rgbdivs['g'], rgbdivs['b'],
-        decimal = self.roundto
-        for k in self.keylist:
-            clist = self.colors[k]
-            for i in range(len(clist) - 1):
-                first, last = clist[i], clist[i + 1]
-                section = np.linspace(first, last, rgbdivs[k][i])
-                section = (np.around(section, decimal)).tolist()
-                fades[k] = fades[k] + section
-        return fades
-
-    def join_colors(self):
-        rgb = [(c[0], c[1], c[2]) for c in
-               zip(self.fades['r'], self.fades['g'], self.fades['b'])]
-        return rgb
-
-    def scale0to1(self, rgblist):
-        newlist = []
-        roundto = self.roundto
-        for col in rgblist:
-            scaledval = [round(i / 255, roundto) for i in col]
-
-            newlist.append(scaledval)
-        return newlist
+    def build(self):
+        """
+        Fills in the palette for the current color stops and number of colors
+        (see palette.build, which caches palettes it has already made).
+        """
+        rgb, rgb0to1, hexes, divs = palette.build(
+            self.colors, self.ncolors, self.roundto
+        )
+        self.rgb = rgb
+        self.rgbdivs = {k: list(d) for k, d in zip(self.keylist, divs)}
+        self.fades = {k: rgb[:, i].tolist() for i, k in enumerate(self.keylist)}
+        self.rgbcolors = [tuple(c) for c in rgb.tolist()]
+        self.rgb0to1 = rgb0to1.tolist()
+        self.hex = list(hexes)
 
     def hexconvert(self):
-        for i in self.rgb0to1:
-            hexcol = pltcolors(i)
-            self.hex.append(hexcol)
+        self.hex += palette.tohex(self.rgb0to1)
 
     def shiftlightness(self, delta):
         newcolors = {'r': [], 'g': [], 'b': []}
@@ -511,7 +480,6 @@ class ColorScheme:
                     newval = 0
                 newcolors[k].append(newval)
         self.colors = newcolors
-        self.hexconvert()
         self.setup()
 
     def ramplightness(self, amt, direction=0, goto_percentage=100):
@@ -537,7 +505,6 @@ class ColorScheme:
                             self.colors[k][ind] = 0
                         elif self.colors[k][ind] > 255:
                             self.colors[k][ind] = 255
-        self.hexconvert()
         self.setup()
 
 
@@ -549,8 +516,8 @@ class Pattern:
         if isinstance(colors, str):
             colors = [colors]
         self.colors = colors
+        self._pensize = pensize
         self.ldepth = self.set_depth()
-        turtle.pensize(pensize)
 
     def __repr__(self):
         lst = list(self.list)
@@ -569,6 +536,7 @@ class Pattern:
         return len(self.list)
 
     def drawpath(self, penup=False):
+        turtle.pensize(self._pensize)
         self.goto(self.list[0], penup=True)
         turtle.setheading(0)
         ldepth = self.ldepth
@@ -600,6 +568,8 @@ class Pattern:
         return lst
 
     def set_depth(self):
+        if isinstance(self.list, PathCollection):
+            return self.list.depth
         if isinstance(self.list[0], tuple) and isinstance(self.list[0][0], (int, float)):
             return 1
         elif isinstance(self.list[0], list):
@@ -675,24 +645,26 @@ class Pattern:
 
 
 class PolarPattern:
+    """
+    A pattern made from lists of angles and radii, sized to size, shifted
+    to position, then stretched by xscale and yscale. Before Transform was
+    backed by an array, xscale was ignored here (Transform.xscale never
+    updated the pattern), so patterns made with xscale other than 1, such
+    as SpiralPattern(xscale=2), are now wider than they used to be.
+    """
     def __init__(self, radianlist, radiuslist, size, position=[0, 0], pensize=1,
-                 xscale=1, yscale=1):
+                 xscale=1, yscale=1, color=None):
         self.radianlist = radianlist
         self.radiuslist = radiuslist
         self.polarlist = [c for c in zip(self.radiuslist, self.radianlist)]
         self.cartesianlist = [self.pol2cart(pc[0], pc[1]) for pc in
                               self.polarlist]
         self.list = self.sizeup(self.cartesianlist, size)
-        if position[0] != 0:
-            Transform(self).xshift(position[0])
-        if position[1] != 0:
-            Transform(self).yshift(position[1])
-        if xscale != 1:
-            Transform(self).xscale(xscale)
-        if yscale != 1:
-            Transform(self).yscale(yscale)
+        if position[0] != 0 or position[1] != 0 or xscale != 1 or yscale != 1:
+            Transform(self).shifted(*position).scaled(xscale, yscale).apply(True)
         self.position = position
         self._pensize = pensize
+        self._color = color
 
         # self.goto(self.position)
 
@@ -712,10 +684,24 @@ class PolarPattern:
     def __len__(self):
         return len(self.list)
 
-    def draw(self, lst=None):
+    def draw(self, lst=None, tolerance=None):
+        """
+        Draws the pattern with turtle, one goto per point.
+        Args:
+            lst: points to draw instead of the pattern's own
+            tolerance: if given, the points are simplified first (see
+                simplify.rdp) so that none of them moves by more than this
+                many pixels. About half a pixel looks the same and cuts
+                dense patterns like SpiralPattern and FlowerPattern2 down to
+                a fraction of the gotos.
+        """
         turtle.pensize(self._pensize)
+        if self._color is not None:
+            turtle.color(self._color)
         if lst is None:
             lst = self.list
+        if tolerance:
+            lst = geometry.tuples(simplify.rdp(lst, tolerance).points)
         turtle.penup()
         turtle.goto(lst[0])
         turtle.pendown()
@@ -751,7 +737,6 @@ class Wave(Pattern):
         if isinstance(color, list):
             color = color[0]
             print('Only 1 color can be used. Using first in list')
-        turtle.color(color)
         if length < 0:
             self.xlist = np.linspace(round(length), round(abs(length) + (1 / (abs(length) * 25))), round(abs(length) * 25))
         else:
@@ -764,14 +749,15 @@ class Wave(Pattern):
             self.ylist = [cos(x) for x in self.xlist]
         self._Olist = [xy for xy in zip(self.xlist, self.ylist)]
         super().__init__(self._Olist, color, pensize, position)
-        self._talllist = Transform(self._Olist).yscale(height)
-        self.list = Transform(self._talllist).xscale(stretch)
+        wave = Transform(self._Olist).scaled(stretch, height)
         if position != (0, 0):
-            self.list = Transform(self.list).xshift(position[0])
-            self.list = Transform(self.list).yshift(position[1])
+            wave.shifted(position[0], position[1])
+        self.list = geometry.tuples(wave.apply())
 
-    def draw(self):
+    def draw(self, color=None):
         lst = self.list
+        turtle.pensize(self._pensize)
+        turtle.color(self.colors[0] if color is None else color)
         turtle.penup()
         turtle.goto(lst[0])
         turtle.pendown()
@@ -779,16 +765,30 @@ class Wave(Pattern):
             turtle.goto(xy)
 
     def capturepath(self, penup=True):
-        lst = self.list
-        turtle.penup()
-        turtle.goto(lst[0])
-        if penup is False:
-            turtle.pendown()
-        turtle.begin_poly()
-        for xy in lst:
-            turtle.goto(xy)
-        turtle.end_poly()
-        return turtle.get_poly()
+        return [self.list[0]] + list(self.list)
+
+    @staticmethod
+    def npoints(length):
+        """
+        Returns:
+            the number of points in a Wave of the given length
+        """
+        if length < 0:
+            return round(abs(length) * 25)
+        if (length * 25) == 0:
+            length += 0.1
+        return round(length * 25)
+
+    @classmethod
+    def frompoints(cls, points, color='yellow', pensize=1, position=(0, 0)):
+        """
+        Makes a Wave from points that have already been generated, e.g. by
+        wave_strand in another process.
+        """
+        wave = cls.__new__(cls)
+        Pattern.__init__(wave, geometry.tuples(points), color, pensize,
+                         position)
+        return wave
 
 
 class Rectangle(Pattern):
@@ -797,7 +797,6 @@ class Rectangle(Pattern):
         if isinstance(color, list):
             color = color[0]
             print('Only 1 color can be used. Using first in list')
-        turtle.color(color)
         xpos, ypos = position[0], position[1]
         topl = (xpos - (width / 2), ypos + (height / 2))
         topr = (xpos + (width / 2), ypos + (height / 2))
@@ -805,11 +804,13 @@ class Rectangle(Pattern):
         botr = (xpos + (width / 2), ypos - (height / 2))
         self.plist = [topl, topr, botr, botl, topl]
         super().__init__(self.plist, color, pensize, position)
-        self.list = Transform(self.plist).xscale(width / 2)
-        self.list = Transform(self.list).yscale(height / 2)
+        rectangle = Transform(self.plist).scaled(width / 2, height / 2)
+        self.list = geometry.tuples(rectangle.apply())
 
     def draw(self):
         lst = self.list
+        turtle.pensize(self._pensize)
+        turtle.color(self.colors[0])
         turtle.penup()
         turtle.goto(lst[0])
         turtle.pendown()
@@ -817,16 +818,7 @@ class Rectangle(Pattern):
             turtle.goto(xy)
 
     def capturepath(self, penup=True):
-        lst = self.list
-        turtle.penup()
-        turtle.goto(lst[0])
-        if penup is False:
-            turtle.pendown()
-        turtle.begin_poly()
-        for xy in lst:
-            turtle.goto(xy)
-        turtle.end_poly()
-        return turtle.get_poly()
+        return [self.list[0]] + list(self.list)
 
 
 class Circle(Pattern):
@@ -835,7 +827,6 @@ class Circle(Pattern):
         if isinstance(color, list):
             color = color[0]
             print('Only 1 color can be used. Using first in list')
-        turtle.color(color)
         radius = (height / 2)
         xpos, ypos = position[0], position[1]
         xpos += width / 2
@@ -843,28 +834,23 @@ class Circle(Pattern):
 
         self.plist = self.create_circle(radius, xpos, ypos)
         super().__init__(self.plist, color, pensize, position=[xpos, ypos])
-        self.list = Transform(self.plist).xscale(width / 2)
-        self.list = Transform(self.list).yscale(height / 2)
+        circle = Transform(self.plist).scaled(width / 2, height / 2)
+        self.list = geometry.tuples(circle.apply())
 
     def draw(self):
         lst = self.list
+        turtle.pensize(self._pensize)
+        turtle.color(self.colors[0])
         turtle.penup()
         turtle.goto(lst[0])
         turtle.pendown()
         for xy in lst:
             turtle.goto(xy)
 
-    def create_circle(self, radius, xpos, ypos, penup=True):
-        if penup:
-            turtle.penup()
-        else:
-            turtle.pendown()
-        turtle.goto((xpos - radius, ypos))
-        turtle.begin_poly()
-        turtle.circle(radius, steps=100)
-        turtle.end_poly()
-        circle = [tuple(i) for i in turtle.get_poly()]
-        return circle
+    @staticmethod
+    def create_circle(radius, xpos, ypos, steps=100):
+        circle = geometry.circle(radius, steps, start=(xpos - radius, ypos))
+        return geometry.tuples(circle)
 
 
 class RadialAngularPattern(Pattern):
@@ -883,8 +869,7 @@ class RadialAngularPattern(Pattern):
             angles = [[angles]]
         if isinstance(angles[0], int):
             self._turns = [angles]
-        self.goto(penup=True)
-        self._startpos = turtle.pos()
+        self._startpos = (position[0], position[1])
         self.list = self.draw(penup=True)
         super().__init__(self.list, self.colors, pensize, self._startpos)
         # self.center =
@@ -894,159 +879,14 @@ class RadialAngularPattern(Pattern):
             self.dot((0, 0), 5)
 
     def draw(self, penup=False):
-        turtle.pendown()
-        if penup:
-            turtle.penup()
-            turtle.speed(10)
-            turtle.tracer(1000, 1)
-        turtle.begin_poly()
-        if len(self._turns) == 1:
-            self.oneangle()
-        elif len(self._turns) == 2:
-            self.twoangle()
-        elif len(self._turns) == 3:
-            self.threeangle()
-        elif len(self._turns) == 4:
-            self.fourangle()
-        turtle.end_poly()
-        lst = turtle.get_poly()
-        lst = [tuple(xy) for xy in lst]
-        if penup:
-            turtle.speed(speed)
-            turtle.tracer(drawspeed, 1)
-        return lst
-
-    def oneangle(self):
-
-        for k in range(10000):
-
-            self.colorcycle(k)
-
-            self.anglego(0)
-            if self.checkplace():
-                turtle.dot(1)
-                turtle.goto(self._startpos)
-                turtle.hideturtle()
-                break
-
-    def twoangle(self):
-
-        for k in range(10000):
-
-            self.colorcycle(k)
-
-            self.anglego(0)
-            if self._turncycle == 1 or self._turncycle == 5:
-                self.anglego(0)
-
-            self.anglego(1)
-            if self._turncycle == 2 or self._turncycle == 5:
-                self.anglego(1)
-
-            if self._jank is not None:
-                turtle.forward(self._jank)
-
-            if self.checkplace():
-                turtle.dot(1)
-                turtle.goto(self._startpos)
-                turtle.hideturtle()
-                break
-
-    def threeangle(self):
-
-        for k in range(10000):
-
-            self.colorcycle(k)
-
-            self.anglego(0)
-            if self._turncycle == 1 or self._turncycle == 5:
-                self.anglego(0)
-
-            self.anglego(1)
-            if self._turncycle == 2 or self._turncycle == 5 or self._turncycle == 6:
-                self.anglego(1)
-
-            self.anglego(2)
-            if self._turncycle == 3 or self._turncycle == 6:
-                self.anglego(2)
-
-            if self._jank is not None:
-                turtle.forward(self._jank)
-
-            if self.checkplace():
-                turtle.dot(1)
-                turtle.goto(self._startpos)
-                turtle.hideturtle()
-                break
-
-    def fourangle(self):
-
-        for k in range(10000):
-
-            self.colorcycle(k)
-
-            self.anglego(0)
-            if self._turncycle == 1 or self._turncycle == 5 or self._turncycle == 8:
-                self.anglego(0)
-
-            self.anglego(1)
-            if self._turncycle == 2 or self._turncycle == 5 or self._turncycle == 6 or self._turncycle == 8 or self._turncycle == 9:
-                self.anglego(1)
-
-            self.anglego(2)
-            if self._turncycle == 3 or self._turncycle == 6 or self._turncycle == 7 or self._turncycle == 8 or self._turncycle == 9:
-                self.anglego(2)
-
-            self.anglego(3)
-            if self._turncycle == 4 or self._turncycle == 7 or self._turncycle == 9:
-                self.anglego(3)
-
-            if self._jank is not None:
-                turtle.forward(self._jank)
-
-            if self.checkplace():
-                turtle.dot(1)
-                turtle.goto(self._startpos)
-                turtle.hideturtle()
-                break
-
-    def anglego(self, n):
-        turtle.forward(self._size)
-        self.turn(*self._turns[n])
-
-    def checkplace(self):
-
-        sx, sy = round(self._startpos[0]), round(self._startpos[1])
-        current = turtle.pos()
-        x, y = round(current[0]), round(current[1])
-        if sx == x and sy == y:
-            return True
-        else:
-            return False
+        path = geometry.radial_angular(
+            self._size, self._turns, self._turncycle, self._jank,
+            start=self._startpos
+        )
+        return geometry.tuples(path)
 
     def capturepath(self, penup=True):
-        if penup:
-            turtle.penup()
-            turtle.tracer(1000, 1)
-            turtle.speed(10)
-        # self.goto(penup=penup)
-        turtle.begin_poly()
-        if len(self._turns) == 1:
-            self.oneangle()
-        elif len(self._turns) == 2:
-            self.twoangle()
-        elif len(self._turns) == 3:
-            self.threeangle()
-        elif len(self._turns) == 4:
-            self.fourangle()
-        turtle.end_poly()
-        lst = turtle.get_poly()
-        lst = [tuple(xy) for xy in lst]
-        turtle.pendown()
-        if penup:
-            turtle.tracer(drawspeed, 1)
-            turtle.speed(speed)
-        return lst
+        return self.draw(penup)
 
     def center(self, showcenter=False):
         precenter = Analyze(self.list, self.ldepth).center(show=showcenter)
@@ -1066,11 +906,11 @@ class FlowerPattern(PolarPattern):
         if isinstance(color, list):
             color = color[0]
             print('Only 1 color can be used. Using first in list')
-        turtle.color(color)
         radianlist = np.linspace(0, 7, poly)
         radiuslist = [(3 - (innerdepth * cos(npetals * theta))) for theta in
                       radianlist]
-        super().__init__(radianlist, radiuslist, size, position, pensize)
+        super().__init__(radianlist, radiuslist, size, position, pensize,
+                         color=color)
 
 
 class SpiralPattern(PolarPattern):
@@ -1087,10 +927,9 @@ class SpiralPattern(PolarPattern):
         if isinstance(color, list):
             color = color[0]
             print('Only 1 color can be used. Using first in list')
-        turtle.color(color)
         radianlist = np.linspace(0, diameter, angldiv // 6)
         radiuslist = [(angl * linelength) + centerdist for angl in radianlist]
-        super().__init__(radianlist, radiuslist, scale, position, pensize, xscale, yscale)
+        super().__init__(radianlist, radiuslist, scale, position, pensize, xscale, yscale, color)
 
 
 class FlowerPattern2(PolarPattern):
@@ -1102,12 +941,11 @@ class FlowerPattern2(PolarPattern):
         if isinstance(color, list):
             color = color[0]
             print('Only 1 color can be used. Using first in list')
-        turtle.color(color)
         divs = 50 * reps
         radianlist = np.linspace(0, reps, divs)
         radiuslist = [(3 + theta + innerdepth * cos(npetals * theta)) for theta in
                       radianlist]
-        super().__init__(radianlist, radiuslist, size, position)
+        super().__init__(radianlist, radiuslist, size, position, color=color)
 
 
 class DrawPath:
@@ -1118,8 +956,7 @@ class DrawPath:
             for i in range(len(coordlist)):
                 colind = i % len(colors)
                 color = colors[colind]
-                turtle.color(color)
-                coordlist[i].draw()
+                coordlist[i].draw(color)
             notfunc = False
         if notfunc:
             self.coordlist = coordlist
@@ -1241,6 +1078,8 @@ class DrawPath:
         #     l = l[0]
         #     print(cnt, l)
         # return cnt
+        if isinstance(self.coordlist, PathCollection):
+            return self.coordlist.depth
         if isinstance(self.coordlist[0], tuple) and isinstance(self.coordlist[0][0], (int, float)):
             return 1
         elif isinstance(self.coordlist[0], list):
@@ -1268,24 +1107,20 @@ class TimesTable:
         self._multlist = [n * multby for n in bigrange]
         self._doublelines = not doublelines
         self.ring = self.create_ring(radius)
-        self.ring = Transform(self.ring).xscale(xscale)
-        self.ring = Transform(self.ring).yscale(yscale)
-        self.ring = Transform(self.ring).origin_rotate(180 + rotation)
+        ring = Transform(self.ring).scaled(xscale, yscale)
+        self.ring = geometry.tuples(ring.origin_rotated(180 + rotation).apply())
         self._coordpairs = {bigrange[i]: self.ring[i % len(self.ring)] for i in range(len(bigrange))}
         self._pensize = pensize
-        self.list = self.draw(drawcircle=False, penup=True)
+        path = geometry.times_table(self.ring, range_, multby)
+        self.list = [geometry.tuples(path)]
 
     def __repr__(self):
         lst = list(self.list)
         return lst
 
     def create_ring(self, radius):
-        turtle.penup()
-        turtle.goto((0, -radius))
-        turtle.begin_poly()
-        turtle.circle(radius, steps=(self._npoints - 1))
-        turtle.end_poly()
-        return list(turtle.get_poly())
+        ring = geometry.circle(radius, self._npoints - 1, start=(0, -radius))
+        return geometry.tuples(ring)
 
     def draw(self, drawcircle=True, penup=False):
         biglist = []
@@ -1344,79 +1179,122 @@ class CascadeLines(Pattern):
 
     def draw(self):
         pathlist = []
-        turtle.penup()
-        turtle.goto((self._startpos[0] - (self._lenlist[0] / 2), self._startpos[1]))
+        lines = geometry.cascade_lines(
+            self._lenlist, self._distlist, self._startpos
+        )
         for i in range(self._nlines):
-            turtle.penup()
-            turtle.goto((self._startpos[0] - (self._lenlist[i] / 2), self._startpos[1] - self._distlist[i]))
-            # turtle.setheading(i * 3)
-            turtle.setheading(0)
-            # turtle.pendown()
-            turtle.begin_poly()
-            # turtle. circle(self._lenlist[i], 280)
-            turtle.forward(self._lenlist[i])
-            turtle.end_poly()
-            line = list(turtle.get_poly())
+            line = geometry.tuples(lines[i])
             if self._rotation > 0:
                 line = Transform(line).rotate(self._rotation * i, center=self._startpos)
             pathlist.append(line)
         return pathlist
 
 
+# Builders for single strands, kept at module level so that parallel.generate
+# can send them to other processes.
+def wave_strand(stretch, height, position, length, cosine):
+    return Wave(stretch=stretch, height=height, position=position,
+                length=length, cosin=cosine).list
+
+
+def flower_layer(npetals, innerdepth, size):
+    return FlowerPattern(npetals, innerdepth, size).list
+
+
 class LVL2:
     @staticmethod
     def layered_flowers(layers=30, npetals=6, innerdepth=3, sizefactor=2,
                         pensize=1, rotate=0, rotaterate=1, colors=default_color_list,
-                        position=[0, 0]):
+                        position=[0, 0], draw=True, processes=None,
+                        chunksize=None):
+        """
+        Layers of flowers growing in size, each rotated a bit further.
+        Args:
+            chunksize: if given, nothing is drawn and a stream.Strands is
+                returned instead of the paths, to make them this many points
+                at a time
+
+        Returns:
+            list of paths, one per layer
+        """
         sf = 1
         rotationfactor = 1
+        tasks = []
+        angles = []
         if isinstance(colors, (ColorScheme, ColorScheme)):
             colors = colors.hex
         for i in range(1, layers):
-            if isinstance(colors, list):
-                colind = i % len(colors)
-                color2 = colors[colind]
-            else:
-                color2 = colors
-            f = FlowerPattern(npetals, innerdepth, sf, color=color2, pensize=pensize)
+            tasks.append((npetals, innerdepth, sf))
             sf += 1 * sizefactor
             if rotate != 0:
-                Transform(f).rotate(rotate * rotationfactor)
+                angles.append(rotate * rotationfactor)
                 rotationfactor += rotaterate
-            if position != [0, 0]:
-                Transform(f).xshift(position[0])
-                Transform(f).yshift(position[1])
-            f.draw()
+            else:
+                angles.append(0)
+        matrices = None
+        if rotate != 0 or position != [0, 0]:
+            matrices = geometry.shift_matrix(position[0], position[1]) @ \
+                geometry.rotation_matrices(angles, clockwise=True)
+        if chunksize is not None:
+            return stream.Strands(
+                flower_layer, tasks, [500] * len(tasks), matrices, chunksize,
+                processes
+            )
+        pathlist = parallel.generate(
+            flower_layer, tasks, [500] * len(tasks), processes
+        )
+        if matrices is not None:
+            pathlist = Transform.batch(pathlist, matrices)
+        else:
+            pathlist = [geometry.tuples(p) for p in pathlist]
+        if draw:
+            if isinstance(colors, list):
+                colors = colors[1:] + colors[:1]  # layers start at color 1
+            DrawPath(pathlist, pensize=pensize, colors=colors)
+        return pathlist
 
     @staticmethod
     def sin_spiral(strands=20, xshift=10, yshift=0, rotate=0, rotaterate=1,
                    rotatecenter=[0, 0], colors=default_color_list, wavelength=50, amplitude=100, wlshift=0,
-                   ampshift=0, length=20, cosine=False, position=[0, 0]):
-        funclist = []
+                   ampshift=0, length=20, cosine=False, position=[0, 0],
+                   processes=None, chunksize=None):
+        """
+        Sine waves side by side, each rotated a bit further.
+        Args:
+            chunksize: if given, a stream.Strands is returned instead of the
+                paths, to make them this many points at a time
+
+        Returns:
+            list of paths, one per strand
+        """
         xpos, ypos = position[0], position[1]
         rotationfactor = 1
-        pathlist = []
-        if isinstance(colors, (ColorScheme, ColorScheme)):
-            colors = colors.hex
+        tasks = []
+        angles = []
         for i in range(strands):
-            colind = i % len(colors)
-            col = colors[colind]
-            sin1 = Wave(stretch=wavelength, height=amplitude, color=col,
-                        position=[xpos, ypos], length=length, cosin=cosine)
+            tasks.append((wavelength, amplitude, [xpos, ypos], length, cosine))
             xpos += xshift
             ypos += yshift
             wavelength += wlshift
             amplitude += ampshift
             if rotate != 0:
-                Transform(sin1).rotate(rotate * rotationfactor, rotatecenter)
+                angles.append(rotate * rotationfactor)
                 rotationfactor += rotaterate
-                for xy in sin1.list:
-                    if not isinstance(xy, tuple):
-                        pass
-                    for val in xy:
-                        pass
-            funclist.append(sin1.list)
-            pathlist.append(sin1.list)
+        sizes = [Wave.npoints(length)] * strands
+        rotations = None
+        if rotate != 0:
+            rotations = geometry.rotation_matrices(
+                angles, rotatecenter, clockwise=True
+            )
+        if chunksize is not None:
+            return stream.Strands(
+                wave_strand, tasks, sizes, rotations, chunksize, processes
+            )
+        pathlist = parallel.generate(wave_strand, tasks, sizes, processes)
+        if rotations is not None:
+            pathlist = Transform.batch(pathlist, rotations)
+        else:
+            pathlist = [geometry.tuples(p) for p in pathlist]
         # checkptz, point = Analyze(funclist).crosspoint()
         # turtle.color('white')
         # turtle.penup()
@@ -1430,8 +1308,8 @@ class LVL2:
                                rotate=1, rotaterate=1, individualrotation=0, totalrotation=None,
                                colors=default_color_list, wavelength=50, amplitude=100, wlshift=0,
                                ampshift=0, length=25, lenshift=0, idkyet=False, cosine=False, pensize=1, connectends=False, webends=False,
-                               position=[0, 0], showpoint=False, draworig=False, getpoint=False):
-        funclist = []
+                               position=[0, 0], showpoint=False, draworig=False, getpoint=False,
+                               processes=None):
         xpos, ypos = position[0], position[1]
         wavelength2 = wavelength
         amplitude2 = amplitude
@@ -1440,21 +1318,22 @@ class LVL2:
         amplitude3 = amplitude
         length3 = length
         lenshift = lenshift / 100
+        tasks = []
         for i in range(strands):
-            colind = i % len(colors)
-            col = colors[colind]
             if not idkyet:
                 length2 = length
-            sin1 = Wave(stretch=wavelength2, height=amplitude2, color=col,
-                        position=[xpos, ypos], length=length2, cosin=cosine)
+            tasks.append(
+                (wavelength2, amplitude2, [xpos, ypos], length2, cosine)
+            )
             xpos += xshift
             ypos += yshift
             wavelength2 += wlshift
             amplitude2 += ampshift
             length2 += lenshift
-            funclist.append(sin1.list)
-            if draworig is True:
-                sin1.draw()
+        funclist = LVL2._waves(tasks, processes)
+        if draworig is True:
+            for i in range(strands):
+                Wave.frompoints(funclist[i], colors[i % len(colors)]).draw()
         _, rotation_point = Analyze(funclist).crosspoint()
         center = Analyze(funclist, ldepth=get_depth(funclist)).center(show=False)
         # dot(center, 10)
@@ -1466,23 +1345,28 @@ class LVL2:
         funclist2 = []
         if totalrotation is None:
             totalrotation = -(rotate * (strands / 2))
+        tasks = []
         for i in range(strands):
-            colind = i % len(colors)
-            col = colors[colind]
-            sin1 = Wave(stretch=wavelength, height=amplitude, color=col,
-                        position=[xpos, ypos], length=length, cosin=cosine, pensize=pensize)
+            tasks.append((wavelength, amplitude, [xpos, ypos], length, cosine))
             xpos += xshift
             ypos += yshift
             wavelength += wlshift
             amplitude += ampshift
             length += lenshift
+        waves = LVL2._waves(tasks, processes)
+        for i in range(strands):
+            colind = i % len(colors)
+            col = colors[colind]
+            sin1 = Wave.frompoints(waves[i], col, pensize)
+            wave = Transform(sin1)
             if rotate != 0 and rotation_point is not None:
-                Transform(sin1).rotate(rotate * rotationfactor, rotation_point)
+                wave.rotated(rotate * rotationfactor, rotation_point)
                 rotationfactor += rotaterate
             else:
                 rotation_point = (0, 0)
             if totalrotation > 0:
-                Transform(sin1).rotate(totalrotation, center)
+                wave.rotated(totalrotation, center)
+            wave.apply(inplace=True)
             funclist2.append(sin1)
             if individualrotation != 0:
                 indcenter = Analyze(sin1).center()
@@ -1493,8 +1377,7 @@ class LVL2:
         if center2 != position:
             xdiff = position[0] - center2[0]
             ydiff = position[1] - center2[1]
-            Transform(sin1).xshift(xdiff)
-            Transform(sin1).yshift(ydiff)
+            Transform(sin1).shifted(xdiff, ydiff).apply(inplace=True)
         xpos, ypos = position[0] - xdiff, position[1] - ydiff
         rotationfactor = 1
         funclist3 = []
@@ -1502,23 +1385,30 @@ class LVL2:
         endliste = []
         if totalrotation is None:
             totalrotation = -(rotate * (strands / 2))
+        tasks = []
         for i in range(strands):
-            colind = i % len(colors)
-            col = colors[colind]
-            sin1 = Wave(stretch=wavelength3, height=amplitude3, color=col,
-                        position=[xpos, ypos], length=length3, cosin=cosine, pensize=pensize)
+            tasks.append(
+                (wavelength3, amplitude3, [xpos, ypos], length3, cosine)
+            )
             xpos += xshift
             ypos += yshift
             wavelength3 += wlshift
             amplitude3 += ampshift
             length3 += lenshift
+        waves = LVL2._waves(tasks, processes)
+        for i in range(strands):
+            colind = i % len(colors)
+            col = colors[colind]
+            sin1 = Wave.frompoints(waves[i], col, pensize)
+            wave = Transform(sin1)
             if rotate != 0 and rotation_point is not None:
-                Transform(sin1).rotate(rotate * rotationfactor, rotation_point)
+                wave.rotated(rotate * rotationfactor, rotation_point)
                 rotationfactor += rotaterate
             else:
                 rotation_point = (0, 0)
             if totalrotation > 0:
-                Transform(sin1).rotate(totalrotation, center)
+                wave.rotated(totalrotation, center)
+            wave.apply(inplace=True)
             funclist3.append(sin1)
             if individualrotation != 0:
                 indcenter = Analyze(sin1).center()
@@ -1531,8 +1421,7 @@ class LVL2:
             if center2 != position:
                 xdiff = position[0] - center2[0]
                 ydiff = position[1] - center2[1]
-                Transform(sin1).xshift(xdiff)
-                Transform(sin1).yshift(ydiff)
+                Transform(sin1).shifted(xdiff, ydiff).apply(inplace=True)
 
         if not draworig:
             curfunc = funclist3
@@ -1555,18 +1444,11 @@ class LVL2:
         if connectends == 1 or connectends == 3:
 
             # Sorting endlist starts
-            sorted_endlists = []
-            els_copy = endlists.copy()
-            sorted_endlists.append(endlists[0])
-            ind = 0
-            while len(els_copy) > 1:
-                sorted_endlists.append(els_copy[ind])
-                point = els_copy[ind]
-                els_copy.pop(ind)
-                ind = closest_point(point, els_copy)
-                print(ind)
+            sorted_endlists = [endlists[i] for i in spatial.tour(endlists)]
 
             thresh = 20
+            # gaps[i] is the distance from point i - 1 to point i
+            gaps = np.roll(analysis.segment_lengths(sorted_endlists, True), 1)
             turtle.penup()
             turtle.goto(sorted_endlists[0])
             turtle.tracer(10, 0)
@@ -1576,8 +1458,7 @@ class LVL2:
                 colind = i % len(colors)
                 col = colors[colind]
                 turtle.color(col)
-                dist = Analyze().distance(sorted_endlists[i], sorted_endlists[i - 1])
-                if abs(dist) > thresh:
+                if gaps[i] > thresh:
                     turtle.penup()
                 else:
                     turtle.pendown()
@@ -1588,18 +1469,11 @@ class LVL2:
         if connectends == 2 or connectends == 3:
 
             # Sorting endlist ends
-            sorted_endliste = []
-            ele_copy = endliste.copy()
-            sorted_endliste.append(endliste[0])
-            ind = 0
-            while len(ele_copy) > 1:
-                sorted_endliste.append(ele_copy[ind])
-                point = ele_copy[ind]
-                ele_copy.pop(ind)
-                ind = closest_point(point, ele_copy)
-                print(ind)
+            sorted_endliste = [endliste[i] for i in spatial.tour(endliste)]
 
             thresh = 20
+            # gaps[i] is the distance from point i - 1 to point i
+            gaps = np.roll(analysis.segment_lengths(sorted_endliste, True), 1)
             turtle.penup()
             turtle.goto(sorted_endliste[0])
             turtle.tracer(10, 0)
@@ -1609,8 +1483,7 @@ class LVL2:
                 colind = i % len(colors)
                 col = colors[colind]
                 turtle.color(col)
-                dist = Analyze().distance(sorted_endliste[i], sorted_endliste[i - 1])
-                if abs(dist) > thresh:
+                if gaps[i] > thresh:
                     turtle.penup()
                 else:
                     turtle.pendown()
@@ -1625,11 +1498,19 @@ class LVL2:
         else:
             return funclist2
 
+    @staticmethod
+    def _waves(tasks, processes=None):
+        # builds the wave_strand tasks, in parallel if processes allows it
+        sizes = [Wave.npoints(task[3]) for task in tasks]
+        paths = parallel.generate(wave_strand, tasks, sizes, processes)
+        return [geometry.tuples(p) for p in paths]
+
     @staticmethod
     def spiral_spiral(reps=30, rotation=5, curve=10, diameter=10, scale=20,
                       poly=400, centerdist=0, colors=default_color_list,
-                      pensize=1):
+                      pensize=1, draw=True):
         rotate = 0
+        pathlist = []
         for i in range(reps):
             colind = i % len(colors)
             col = colors[colind]
@@ -1638,8 +1519,11 @@ class LVL2:
                                    centerdist=centerdist, color=col,
                                    pensize=pensize)
             Transform(spiral).rotate(rotate)
-            spiral.draw()
+            pathlist.append(spiral.list)
+            if draw:
+                spiral.draw()
             rotate += rotation
+        return pathlist
 
     @staticmethod
     def antenas(colors=default_color_list, xshift=5, yshift=0, position=[100, 100]):
@@ -1657,7 +1541,8 @@ class LVL2:
             function=Wave, reps=30, xshift=0, yshift=0, stretch=20, length=30,
             depth=30, stretchshift=0, lenshift=0, depthshift=0, cosine=False,
             colors='white', pensize=1, individualrotation=2, distshift=0,
-            rotationcenter=(0, 0), position=(0, 0), draworig=False, branches=10
+            rotationcenter=(0, 0), position=(0, 0), draworig=False, branches=10,
+            draw=True
     ):
         funcmap = {'Wave': Wave, 'Rectangle': Rectangle, 'Circle': Circle}
         flippedfuncmap = {v: k for k, v in funcmap.items()}
@@ -1669,7 +1554,6 @@ class LVL2:
         length2 = length
         depth2 = depth
         stretch2 = stretch
-        indrotate2 = individualrotation
         if isinstance(colors, str):
             colors = [colors]
         for i in range(reps):
@@ -1690,23 +1574,37 @@ class LVL2:
             depth2 += depthshift
             stretch2 += stretchshift
             func1 = func1.list
-            if indrotate2 != 0:
-                func1 = Transform(func1).rotate(indrotate2, rotationcenter)
-                indrotate2 += individualrotation
             funclist.append(func1)
             if draworig is True:
                 func1.draw()
 
+        # each repetition is rotated a little more than the last:
+        if individualrotation != 0:
+            rotations = geometry.rotation_matrices(
+                individualrotation * np.arange(1, reps + 1), rotationcenter,
+                clockwise=True
+            )
+            funclist = Transform.batch(funclist, rotations)
+
         if branches != 0 or branches != 1:
 
             orig = funclist.copy()
 
             angle = 360 / branches
 
-            for i in range(branches - 1):
-                for b in orig:
-                    new = Transform(b).rotate((angle * (i + 1)), position)
-                    funclist.append(new)
+            # every branch is a rotated copy of all of the original paths,
+            # so they are all rotated together as one stack:
+            points, offsets = geometry.stack_paths(orig)
+            points, offsets = geometry.repeat_paths(
+                points, offsets, branches - 1
+            )
+            rotations = geometry.rotation_matrices(
+                angle * np.arange(1, branches), position, clockwise=True
+            )
+            matrices = np.repeat(rotations, len(orig), axis=0)
+            geometry.transform_paths(points, matrices, offsets, out=points)
+            branchpaths = geometry.split_paths(points, offsets)
+            funclist += [geometry.tuples(p) for p in branchpaths]
 
         # center = Analyze(funclist, ldepth=get_depth(funclist)).center(show=True)
 
@@ -1784,7 +1682,7 @@ class LVL2:
         #         Transform(func1).xshift(xdiff)
         #         Transform(func1).yshift(ydiff)
         #
-        if not draworig:
+        if draw and not draworig:
             curfunc = funclist
             for i in range(len(curfunc)):
                 colind = i % len(colors)
@@ -1875,6 +1773,57 @@ class LVL2:
         #     return funclist2, rotation_point
         # else:
         #     return funclist2
+        return funclist
+
+    @staticmethod
+    def random_rotation_parameters(rng=None, **given):
+        """
+        Picks random values for the iterative_rotation parameters that aren't
+        given (or are None), the way random_iterative_rotation does.
+        Args:
+            rng: seed or numpy Generator to pick them with, for the same
+                values every time
+            given: parameters to keep as they are. rotationcenter can have
+                None for either coordinate to pick just that one.
+
+        Returns:
+            dictionary of every parameter, with function as its name, in the
+            format PatternTab.save stores them (plus rotationcenter if it was
+            given)
+        """
+        rng = np.random.default_rng(rng)
+        params = dict(given)
+
+        def pick(name, value):
+            if params.get(name) is None:
+                params[name] = value()
+
+        def normal(scale, positive=True):
+            value = float(rng.standard_normal())
+            return round((abs(value) if positive else value) * scale, 2)
+
+        pick('function', lambda: ['Wave', 'Rectangle', 'Circle'][
+            int(rng.integers(0, 3))])
+        if not isinstance(params['function'], str):
+            params['function'] = params['function'].__name__
+        pick('reps', lambda: int(rng.integers(1, 100)))
+        pick('xshift', lambda: normal(2))
+        pick('yshift', lambda: normal(2))
+        pick('stretch', lambda: normal(20))
+        pick('length', lambda: normal(20))
+        pick('depth', lambda: normal(20))
+        pick('stretchshift', lambda: normal(2, False))
+        pick('lenshift', lambda: normal(2, False))
+        pick('depthshift', lambda: normal(5))
+        params.setdefault('cosine', False)
+        pick('individualrotation', lambda: normal(10))
+        pick('branches', lambda: int(rng.integers(1, 31)))
+        if 'rotationcenter' in params:
+            params['rotationcenter'] = tuple(
+                int(rng.integers(-300, 300)) if c is None else c
+                for c in params['rotationcenter']
+            )
+        return params
 
     @staticmethod
     def random_iterative_rotation(
@@ -1882,70 +1831,39 @@ class LVL2:
             length=None, depth=None, stretchshift=None, lenshift=None,
             depthshift=None, cosine=False, colors='white', pensize=1,
             individualrotation=None, rotationcenter=(None, None),
-            position=(0, 0), draworig=False, branches=None, distshift=0):
-
-        report = ""
-        reportrotcenter = False
-        if function is None:
-            flist = [Wave, Rectangle, Circle]
-            funcindex = int(np.random.randint(0, len(flist) - 1, 1))
-            print(funcindex)
-            function = flist[funcindex]
-            report += " fucntion={}".format(str(function))
-        if reps is None:
-            reps = int(np.random.randint(1, 100, 1))
-            report += ", reps={}".format(reps)
-        if xshift is None:
-            xshift = round(abs(float(np.random.randn())) * 2, 2)
-            report += ", xshift={}".format(xshift)
-        if yshift is None:
-            yshift = round(abs(float(np.random.randn())) * 2, 2)
-            report += ", yshift={}".format(yshift)
-        if stretch is None:
-            stretch = round(abs(float(np.random.randn())) * 20, 2)
-            report += ", stretch={}".format(stretch)
-        if length is None:
-            length = round(abs(float(np.random.randn())) * 20, 2)
-            report += ", length={}".format(length)
-        if depth is None:
-            depth = round(abs(float(np.random.randn())) * 20, 2)
-            report += ", depth={}".format(depth)
-        if stretchshift is None:
-            stretchshift = round(float(np.random.randn()) * 2, 2)
-            report += ", stretchshift={}".format(stretchshift)
-        if lenshift is None:
-            lenshift = round(float(np.random.randn()) * 2, 2)
-            report += ", lenshift={}".format(lenshift)
-        if depthshift is None:
-            depthshift = round(abs(float(np.random.randn())) * 5, 2)
-            report += ", depthshift={}".format(depthshift)
-        if individualrotation is None:
-            individualrotation = round(abs(float(np.random.randn(1))) * 10, 2)
-            report += ", individualrotation={}".format(individualrotation)
-        if rotationcenter[0] is None:
-            rotationcenter = (int(np.random.randint(-300, 300)), rotationcenter[1])
-            reportrotcenter = True
-        if rotationcenter[1] is None:
-            rotationcenter = (rotationcenter[0], int(np.random.randint(-300, 300)))
-            reportrotcenter = True
-        if reportrotcenter:
-            report += ", rotationcenter={}".format(rotationcenter)
-        if branches is None:
-            branches = int(np.random.randint(1, 31, 1))
-            report += ", branches={}".format(branches)
-        # print(report)
+            position=(0, 0), draworig=False, branches=None, distshift=0,
+            draw=True, seed=None, getparams=False):
+        """
+        iterative_rotation with random values for every parameter left as
+        None (see random_rotation_parameters).
+        Args:
+            seed: int to pick the same parameters every time
+            getparams: also return the parameters that were used
+
+        Returns:
+            the paths, or (paths, parameters) if getparams
+        """
+        params = LVL2.random_rotation_parameters(
+            seed, function=function, reps=reps, xshift=xshift, yshift=yshift,
+            stretch=stretch, length=length, depth=depth,
+            stretchshift=stretchshift, lenshift=lenshift,
+            depthshift=depthshift, cosine=cosine,
+            individualrotation=individualrotation, branches=branches,
+            rotationcenter=rotationcenter
+        )
 
         if isinstance(colors, (str, list)):
-            colors2 = ColorScheme(colors, reps)
+            colors2 = ColorScheme(colors, params['reps'])
         else:
             colors2 = colors
 
-        LVL2.iterative_rotation(
-            function, reps, xshift, yshift, stretch, length, depth,
-            stretchshift, lenshift, depthshift, cosine, colors2, pensize,
-            individualrotation, distshift, rotationcenter, position, draworig,
-            branches
+        paths = LVL2.iterative_rotation(
+            colors=colors2, pensize=pensize, distshift=distshift,
+            position=position, draworig=draworig, draw=draw, **params
         )
+        if getparams:
+            return paths, params
+        return paths
 
 
 def closest_point(node, nodes):
@@ -1954,6 +1872,8 @@ def closest_point(node, nodes):
 
 
 def get_depth(coordlist):
+    if isinstance(coordlist, PathCollection):
+        return coordlist.depth
     depth = 0
     if isinstance(coordlist[0], tuple) and isinstance(coordlist[0][0], (int, float)):
         depth = 1
@@ -1976,6 +1896,38 @@ def dot(loc=(0, 0), size=3, color='white'):
     turtle.dot(size)
 
 
+def drawsteps(coordlist, colors='white', pensize=1, colorby=None, step=2000):
+    """
+    Draws paths with turtle a piece at a time, styled the same way as
+    render.render draws them. Nothing more is drawn until the next value is
+    asked for, so the caller can keep a window responsive in between, or stop
+    partway through by not asking for any more.
+    Args:
+        coordlist, colors, pensize, colorby: as for render.runs
+        step: number of segments to draw between yields
+
+    Yields:
+        fraction of the segments drawn so far, ending with 1
+    """
+    coll = PathCollection.fromlist(coordlist)
+    total = max(coll.npoints - coll.npaths, 1)
+    drawn = 0
+    for points, color, width in render.runs(coll, colors, pensize, colorby):
+        turtle.pensize(float(width))
+        turtle.color(color)
+        turtle.penup()
+        turtle.goto(*points[0])
+        turtle.pendown()
+        for x, y in points[1:].tolist():
+            turtle.goto(x, y)
+            drawn += 1
+            if drawn % step == 0:
+                turtle.update()
+                yield min(drawn / total, 1)
+    turtle.update()
+    yield 1
+
+
 def wait():
     turtle.hideturtle()
     turtle.done()
@@ -0,0 +1,174 @@
+"""
+Generating and drawing paths a chunk at a time.
+
+Patterns are normally generated in full before anything is drawn, so memory
+use grows with the number of points, and very large ones (hundreds of
+strands, each thousands of points long) can take hundreds of MB. The
+iterables here hand out a pattern as a series of PathCollections instead,
+each no bigger than a chunk size, so a renderer or exporter can draw each
+one and let it go before the next is made (see pipeline.output_stream).
+
+Every chunk ends on a path boundary, and each iterable knows the total
+number of points and paths up front, so they can be copied into a
+PathBuffer preallocated for the whole pattern, in memory or in memory-mapped
+.npy files on disk.
+"""
+import os
+
+import numpy as np
+
+from spirogen import parallel
+from spirogen.paths import PathCollection
+
+
+def _spans(sizes, chunksize):
+    # splits consecutive sizes into (start, end) runs of at most chunksize
+    # total, with at least one item in each
+    spans = []
+    start = total = 0
+    for i, size in enumerate(sizes):
+        if i > start and total + size > chunksize:
+            spans.append((start, i))
+            start, total = i, 0
+        total += size
+    if start < len(sizes):
+        spans.append((start, len(sizes)))
+    return spans
+
+
+class Strands:
+    """
+    The paths built by running worker on each task (like parallel.generate),
+    made a chunk of tasks at a time.
+    Args:
+        worker: module level function that takes the items of a task as
+            arguments and returns an (n, 2) path
+        tasks: list of argument tuples, one per path
+        sizes: number of points each task's path will have
+        matrices: optional (P, 3, 3) stack of affine matrices, one applied
+            to each path
+        chunksize: most points to make at a time (a single path bigger than
+            this is made on its own)
+        processes: see parallel.generate
+    """
+    depth = 2
+
+    def __init__(self, worker, tasks, sizes, matrices=None,
+                 chunksize=1 << 18, processes=None):
+        self.worker = worker
+        self.tasks = list(tasks)
+        self.sizes = [int(size) for size in sizes]
+        self.matrices = None if matrices is None else np.asarray(matrices)
+        self.chunksize = chunksize
+        self.processes = processes
+        self.npaths = len(self.tasks)
+        self.npoints = sum(self.sizes)
+
+    def __iter__(self):
+        spans = _spans(self.sizes, self.chunksize)
+        npoints = max((sum(self.sizes[start:end]) for start, end in spans),
+                      default=0)
+        # one pool for every chunk, rather than starting one for each
+        with parallel.Workers(self.processes, npoints) as workers:
+            for start, end in spans:
+                chunk = parallel.generate(
+                    self.worker, self.tasks[start:end],
+                    self.sizes[start:end], workers=workers
+                )
+                if self.matrices is not None:
+                    chunk.transform(self.matrices[start:end], inplace=True)
+                yield chunk
+
+
+class Chunks:
+    """
+    An existing collection handed out a chunk at a time. The chunks share
+    the collection's arrays, so this is how a pattern that can't be made a
+    piece at a time, or one loaded memory-mapped from diskcache, is fed to
+    the same code as Strands.
+    Args:
+        coll: a PathCollection, or anything PathCollection.fromlist takes
+        chunksize: most points in a chunk (a single path bigger than this
+            is a chunk on its own)
+    """
+    def __init__(self, coll, chunksize=1 << 18):
+        self.coll = PathCollection.fromlist(coll)
+        self.chunksize = chunksize
+        self.depth = self.coll.depth
+        self.npaths = self.coll.npaths
+        self.npoints = self.coll.npoints
+
+    def __iter__(self):
+        coll = self.coll
+        if coll.depth != 2:
+            # a single path or groups of paths can't be split without
+            # changing what they stand for
+            yield coll
+            return
+        for start, end in _spans(coll.lengths, self.chunksize):
+            first, last = coll.offsets[start], coll.offsets[end]
+            yield PathCollection(
+                coll.points[first:last], coll.offsets[start:end + 1] - first,
+                None if coll.colors is None else coll.colors[first:last],
+                None if coll.pensizes is None else coll.pensizes[first:last]
+            )
+
+
+class PathBuffer:
+    """
+    Preallocated storage for a depth 2 collection that is filled a chunk at
+    a time. Given a folder, the points and offsets are memory-mapped .npy
+    files in it (points.npy and offsets.npy), so the chunks that have been
+    written don't have to stay in memory.
+    Args:
+        npoints: total number of points
+        npaths: total number of paths
+        folder: where to keep the arrays, or None to keep them in memory
+    """
+    def __init__(self, npoints, npaths, folder=None):
+        if folder is None:
+            self.points = np.empty((npoints, 2))
+            self.offsets = np.empty(npaths + 1, dtype=np.int64)
+        else:
+            openmap = np.lib.format.open_memmap
+            self.points = openmap(os.path.join(folder, 'points.npy'), 'w+',
+                                  np.float64, (npoints, 2))
+            self.offsets = openmap(os.path.join(folder, 'offsets.npy'),
+                                   'w+', np.int64, (npaths + 1,))
+        self.offsets[0] = 0
+        self.npoints = 0
+        self.npaths = 0
+
+    @property
+    def full(self):
+        return (self.npoints == len(self.points)
+                and self.npaths == len(self.offsets) - 1)
+
+    def append(self, chunk):
+        """
+        Copies a chunk of paths onto the end of the buffer.
+        """
+        chunk = PathCollection.fromlist(chunk)
+        points = self.npoints + chunk.npoints
+        paths = self.npaths + chunk.npaths
+        if points > len(self.points) or paths >= len(self.offsets):
+            raise ValueError('More paths than the buffer was made for')
+        self.points[self.npoints:points] = chunk.points
+        self.offsets[self.npaths + 1:paths + 1] = \
+            chunk.offsets[1:] + self.npoints
+        self.npoints, self.npaths = points, paths
+
+    def collection(self):
+        """
+        Returns:
+            PathCollection of the paths appended so far, sharing the buffer's
+            arrays
+        """
+        return PathCollection(self.points[:self.npoints],
+                              self.offsets[:self.npaths + 1])
+
+    def flush(self):
+        """Writes memory-mapped arrays out to their files."""
+        for array in (self.points, self.offsets):
+            if isinstance(array, np.memmap):
+                array.flush()
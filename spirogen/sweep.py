@@ -0,0 +1,212 @@
+"""
+Parameter sweeps of iterative rotation patterns.
+
+Makes lots of iterativerotation parameter sets, either at random from a seed
+or as every combination of a grid of values, and renders each one without
+the interface. Every set is written as a thumbnail next to a pattern json
+file in the format PatternTab.save writes, so the good ones can be copied
+into settings/patterns and loaded straight into the interface. For example,
+200 random patterns using every core:
+
+    python -m spirogen.sweep -n 200 --seed 1 -o sweep -j 0
+
+or every combination of some values, with the rest picked once at random:
+
+    python -m spirogen.sweep --grid reps=20,40,60 branches=5,10 \
+        --set function=Wave -o sweep
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from functools import partial
+
+import numpy as np
+
+from spirogen import pipeline
+from spirogen.batch import imap, parse_resolution
+from spirogen.spirogen import LVL2
+
+PATTERNTYPE = 'iterativerotation'
+
+
+def random_sets(n, seed=None, **fixed):
+    """
+    Makes n random parameter sets. Each is picked with its own seed, which is
+    used in its name, so LVL2.random_rotation_parameters(seed, **fixed) gives
+    it back.
+    Args:
+        n: number of sets
+        seed: int to make the same sets every time
+        fixed: parameters every set uses as they are
+
+    Returns:
+        list of (name, parameters)
+    """
+    seeds = np.random.SeedSequence(seed).generate_state(n).tolist()
+    return [(f'seed-{s}', LVL2.random_rotation_parameters(s, **fixed))
+            for s in seeds]
+
+
+def grid_sets(grid, seed=None, **fixed):
+    """
+    Makes a parameter set for every combination of the values in grid. The
+    parameters that aren't in grid or fixed are picked at random once and
+    are the same in every set.
+    Args:
+        grid: dictionary of parameter name to list of values
+        seed: int to pick the same values for the other parameters every time
+        fixed: parameters every set uses as they are
+
+    Returns:
+        list of (name, parameters)
+    """
+    seed = int(np.random.SeedSequence(seed).generate_state(1)[0])
+    sets = []
+    for i, values in enumerate(itertools.product(*grid.values())):
+        given = dict(fixed, **dict(zip(grid, values)))
+        sets.append(
+            (f'grid-{i:04d}', LVL2.random_rotation_parameters(seed, **given))
+        )
+    return sets
+
+
+def render_set(item, outdir, colors=None, resolution=(480, 300),
+               supersample=2):
+    """
+    Renders one parameter set to outdir/name.png and saves it as a pattern
+    to outdir/name.json.
+    Args:
+        item: (name, parameters)
+        colors: colors dictionary as saved by ColorSchemeTab.save, or None for
+            the default colors
+
+    Returns:
+        (name, error message or None, seconds taken)
+    """
+    name, params = item
+    start = time.perf_counter()
+    pattern = {'patterntype': PATTERNTYPE, 'parameters': params}
+    try:
+        scheme, background = pipeline.colorscheme(colors)
+        drawing = pipeline.generate(pattern, scheme)
+        pipeline.output(drawing, os.path.join(outdir, f'{name}.png'),
+                        background, resolution, supersample)
+        with open(os.path.join(outdir, f'{name}.json'), 'w') as file:
+            json.dump(pattern, file, indent=2)
+        error = None
+    except Exception as e:
+        error = f'{type(e).__name__}: {e}'
+    return name, error, time.perf_counter() - start
+
+
+def run(sets, outdir, jobs=1, colors=None, resolution=(480, 300),
+        supersample=2, verbose=True):
+    """
+    Renders parameter sets into outdir, in parallel if jobs is more than 1.
+    Args:
+        sets: list of (name, parameters) from random_sets or grid_sets
+        the rest are as for render_set and batch.imap
+
+    Returns:
+        list of (name, error) for the sets that failed
+    """
+    os.makedirs(outdir, exist_ok=True)
+    worker = partial(render_set, outdir=outdir, colors=colors,
+                     resolution=resolution, supersample=supersample)
+    failed = []
+    for name, error, seconds in imap(worker, sets, jobs):
+        if error is not None:
+            failed.append((name, error))
+            print(f'Failed {name}: {error}', file=sys.stderr)
+        elif verbose:
+            print(f'{name} ({seconds:.1f}s)')
+    return failed
+
+
+def parse_value(text):
+    # numbers, true/false and lists as json, anything else as a string
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def parse_setting(text):
+    try:
+        name, value = text.split('=', 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Settings should look like name=value, not '{text}'"
+        )
+    return name, value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m spirogen.sweep',
+        description='Render lots of random or gridded iterative rotation '
+                    'patterns, each saved with its parameters.'
+    )
+    parser.add_argument(
+        '-n', '--count', type=int, default=20,
+        help='number of random parameter sets (ignored with --grid)'
+    )
+    parser.add_argument(
+        '--seed', type=int, default=None,
+        help='seed for the random parameters, to get the same sets again'
+    )
+    parser.add_argument(
+        '--grid', nargs='+', type=parse_setting, default=[],
+        metavar='NAME=V1,V2',
+        help='render every combination of these parameter values'
+    )
+    parser.add_argument(
+        '--set', nargs='+', type=parse_setting, default=[], dest='fixed',
+        metavar='NAME=VALUE', help='parameters to use in every set'
+    )
+    parser.add_argument(
+        '--colors', default=None,
+        help='colors or session json file to color the patterns with'
+    )
+    parser.add_argument(
+        '-o', '--outdir', default='sweep', help='output folder'
+    )
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='number of sets to render in parallel. 0 uses every core.'
+    )
+    parser.add_argument(
+        '-r', '--resolution', type=parse_resolution, default=(480, 300),
+        help='thumbnail size as WIDTHxHEIGHT'
+    )
+    parser.add_argument(
+        '-s', '--supersample', type=int, default=2,
+        help='anti-aliasing factor'
+    )
+    parser.add_argument(
+        '-q', '--quiet', action='store_true', help='only report failures'
+    )
+    args = parser.parse_args(argv)
+
+    fixed = {name: parse_value(value) for name, value in args.fixed}
+    if args.grid:
+        grid = {name: [parse_value(v) for v in values.split(',')]
+                for name, values in args.grid}
+        sets = grid_sets(grid, args.seed, **fixed)
+    else:
+        sets = random_sets(args.count, args.seed, **fixed)
+    colors = None
+    if args.colors is not None:
+        _, colors = pipeline.load(args.colors)
+    failed = run(sets, args.outdir, args.jobs, colors, args.resolution,
+                 args.supersample, not args.quiet)
+    if not args.quiet:
+        print(f'Rendered {len(sets) - len(failed)} of {len(sets)} sets')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
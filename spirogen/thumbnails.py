@@ -0,0 +1,138 @@
+"""
+Cached thumbnails of saved settings.
+
+Seeing what a saved session, pattern or colors file looks like otherwise
+means loading it into the interface and drawing it. ThumbnailCache renders
+each one headlessly (with pipeline.py) to a small png, named after a hash of
+the json it was made from. For sessions that is the pattern and colors files
+they point to, so changing any of them gives a new name and a new thumbnail,
+and the old one is pruned. ThumbnailBuilder makes the thumbnails for a list
+of files on a background thread, so the interface can show the ones that
+are already cached straight away and fill in the rest as they are done.
+"""
+import hashlib
+import json
+import os
+import queue
+import threading
+
+from spirogen import pipeline
+
+CACHE_PATH = os.path.join(pipeline.SETTINGS_PATH, 'thumbnails')
+
+# same shape as the turtle window
+SIZE = (240, 150)
+
+# bump this when thumbnails are drawn differently, so old ones are redrawn
+VERSION = 1
+
+
+class ThumbnailCache:
+    """
+    A folder of thumbnails for one kind of settings file.
+    Args:
+        folder: where the thumbnails are kept. It is created if it doesn't
+            exist.
+        size: (width, height) of the thumbnails
+        settingspath: the settings folder sessions are resolved against, see
+            pipeline.load
+    """
+    def __init__(self, folder, size=SIZE, settingspath=None):
+        self.folder = folder
+        self.size = tuple(size)
+        self.settingspath = settingspath
+        os.makedirs(folder, exist_ok=True)
+
+    def key(self, pattern, colors):
+        """
+        Returns:
+            hex digest of the loaded pattern and colors dictionaries (either
+            can be None) and the thumbnail size
+        """
+        content = json.dumps(
+            [VERSION, self.size, pattern, colors], sort_keys=True
+        )
+        return hashlib.sha1(content.encode()).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.folder, f'{key}.png')
+
+    def thumbnail(self, file):
+        """
+        Gets the thumbnail for a settings file, rendering it if the file has
+        changed since it was last made.
+        Args:
+            file: path to a session, pattern or colors json file
+
+        Returns:
+            (key, path to the png)
+        """
+        pattern, colors = pipeline.load(file, self.settingspath)
+        key = self.key(pattern, colors)
+        path = self.path(key)
+        if not os.path.exists(path):
+            drawing, background = pipeline.prepare(pattern, colors)
+            # written under another name first so a half written file is
+            # never mistaken for a finished one
+            temp = os.path.join(self.folder, f'{key}.partial.png')
+            pipeline.output(drawing, temp, background, self.size,
+                            tolerance=0.5)
+            os.replace(temp, path)
+        return key, path
+
+    def prune(self, keys):
+        """
+        Deletes every thumbnail that isn't for one of keys.
+        Returns:
+            number of files deleted
+        """
+        keep = {f'{key}.png' for key in keys}
+        removed = 0
+        for name in os.listdir(self.folder):
+            if name.endswith('.png') and name not in keep:
+                os.remove(os.path.join(self.folder, name))
+                removed += 1
+        return removed
+
+
+class ThumbnailBuilder(threading.Thread):
+    """
+    Gets the thumbnails for a list of files on a background thread. As each
+    one is ready, (file, path) is put on results, with None for the path if
+    the file couldn't be rendered. Once every file is done, the cache is
+    pruned of thumbnails for files that have changed or gone.
+    tkinter can only be used from the main thread, so the interface should
+    poll results (with after()) rather than be called from here.
+    Args:
+        cache: ThumbnailCache
+        files: paths of the settings files, in the order to do them
+        prune: whether to prune the cache at the end. Only do this when files
+            is everything that belongs in the cache.
+    """
+    def __init__(self, cache, files, prune=True):
+        super().__init__(daemon=True)
+        self.cache = cache
+        self.files = list(files)
+        self.prune = prune
+        self.results = queue.Queue()
+        self.cancelled = threading.Event()
+
+    def run(self):
+        keys = []
+        for file in self.files:
+            if self.cancelled.is_set():
+                return
+            try:
+                key, path = self.cache.thumbnail(file)
+                keys.append(key)
+            except Exception as e:
+                print(f"Couldn't make a thumbnail of {file}: "
+                      f"{type(e).__name__}: {e}")
+                path = None
+            self.results.put((file, path))
+        if self.prune:
+            self.cache.prune(keys)
+
+    def cancel(self):
+        """Stops after the thumbnail currently being made."""
+        self.cancelled.set()
@@ -0,0 +1,42 @@
+import glob
+import json
+import os
+
+import pytest
+
+from spirogen import pipeline
+
+# every saved pattern, session and colors file except the tutorial's
+SETTINGS_FILES = sorted(
+    path for path in glob.glob(
+        os.path.join(pipeline.SETTINGS_PATH, '*', '*.json')
+    )
+    if os.path.basename(os.path.dirname(path)) != 'tutorial'
+)
+
+
+def saved_patterns(patterntype=None):
+    """
+    Returns:
+        list of (name, pattern) for every distinct saved pattern, of
+        patterntype if it's given
+    """
+    patterns = {}
+    for path in SETTINGS_FILES:
+        try:
+            pattern, _ = pipeline.load(path)
+        except (OSError, ValueError, KeyError):
+            continue  # sessions pointing at files that aren't saved
+        if pattern is None:
+            continue
+        if patterntype is None or pattern['patterntype'] == patterntype:
+            key = json.dumps(pattern, sort_keys=True)
+            patterns.setdefault(key, (os.path.basename(path), pattern))
+    return sorted(patterns.values(), key=lambda item: item[0])
+
+
+@pytest.fixture(autouse=True)
+def no_disk_cache(monkeypatch):
+    # tests never read or fill the user's geometry cache unless they pass a
+    # DiskCache of their own
+    monkeypatch.setenv('SPIROGEN_CACHE', '')
@@ -0,0 +1,82 @@
+from math import sqrt
+
+import numpy as np
+import pytest
+
+from spirogen import analysis
+from spirogen.paths import PathCollection
+from spirogen.spirogen import Analyze
+
+
+def old_avgcoord(coords):
+    xs, ys = [xy[0] for xy in coords], [xy[1] for xy in coords]
+    if len(xs) and len(ys) > 0:
+        return sum(xs) / len(xs), sum(ys) / len(ys)
+    return None
+
+
+def old_center(funclist, ldepth):
+    if ldepth == 1:
+        return old_avgcoord([old_avgcoord(funclist)])
+    avgs = [old_avgcoord(i) for i in funclist]
+    return (sum(xy[0] for xy in avgs) / len(avgs),
+            sum(xy[1] for xy in avgs) / len(avgs))
+
+
+def old_distancelist(coords):
+    distlist, xydistlist = [], []
+    for i in range(len(coords)):
+        a, b = coords[i], coords[(i + 1) % len(coords)]
+        xdist, ydist = round(a[0] - b[0], 6), round(a[1] - b[1], 6)
+        distlist.append(round(sqrt(xdist ** 2 + ydist ** 2), 2))
+        xydistlist.append((xdist, ydist))
+    return distlist, xydistlist
+
+
+def random_paths(seed, npaths=5):
+    rng = np.random.default_rng(seed)
+    return [[tuple(p) for p in (rng.random((n, 2)) * 600 - 300).tolist()]
+            for n in rng.integers(1, 200, npaths)]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_center_matches_old_analyze(seed):
+    paths = random_paths(seed)
+    assert Analyze(paths[0]).center() == pytest.approx(
+        old_center(paths[0], 1), abs=1e-9)
+    assert Analyze(paths, 2).center() == pytest.approx(
+        old_center(paths, 2), abs=1e-9)
+    assert Analyze(paths[0]).avgcoord([]) is None
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_distancelist_matches_old_analyze(seed):
+    path = random_paths(seed, 1)[0]
+    dists, xydists = Analyze(path).distancelist()
+    olddists, oldxydists = old_distancelist(path)
+    np.testing.assert_allclose(dists, olddists, atol=0.01)
+    np.testing.assert_allclose(xydists, oldxydists, atol=1e-6)
+
+
+def test_per_path_measurements():
+    paths = random_paths(9) + [[]]
+    coll = PathCollection.fromlist(paths)
+    assert coll.npaths == 6
+    centers = analysis.centroids(coll)
+    lengths = analysis.path_lengths(coll)
+    box = analysis.path_bounds(coll)
+    for n, path in enumerate(paths[:-1]):
+        np.testing.assert_allclose(centers[n], old_avgcoord(path))
+        steps = [sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2)
+                 for a, b in zip(path, path[1:])]
+        assert lengths[n] == pytest.approx(sum(steps))
+        xs, ys = zip(*path)
+        np.testing.assert_array_equal(
+            box[n], [min(xs), min(ys), max(xs), max(ys)])
+        np.testing.assert_array_equal(analysis.bounds(path), box[n])
+        np.testing.assert_allclose(analysis.arc_length(path)[-1], lengths[n])
+    assert np.isnan(centers[-1]).all() and np.isnan(box[-1]).all()
+    assert lengths[-1] == 0
+    np.testing.assert_allclose(analysis.extents(coll)[:-1],
+                               box[:-1, 2:] - box[:-1, :2])
+    assert analysis.centroid([]) is None
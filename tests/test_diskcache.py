@@ -0,0 +1,119 @@
+import glob
+import mmap
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from spirogen import diskcache, pipeline
+from spirogen.paths import PathCollection
+
+PATTERN = {'patterntype': 'radialangular',
+           'parameters': {'size': 100, 'pensize': 1, 'angles': [[144, 0]]}}
+
+
+def collection(n=3, colors=False):
+    rng = np.random.default_rng(n)
+    paths = [rng.random((10 + i, 2)).tolist() for i in range(n)]
+    coll = PathCollection.fromlist(paths)
+    if colors:
+        coll.colors = np.arange(coll.npoints) % 4
+    return coll
+
+
+def mapped(array):
+    # whether an array is a view of a memory-mapped file
+    while array is not None:
+        if isinstance(array, (np.memmap, mmap.mmap)):
+            return True
+        array = getattr(array, 'base', None)
+    return False
+
+
+def test_round_trip(tmp_path):
+    cache = diskcache.DiskCache(str(tmp_path))
+    assert cache.get('a') is None
+    coll = collection(colors=True)
+    cache.put('a', coll)
+    loaded = cache.get('a')
+    assert mapped(loaded.points) and loaded.depth == 2
+    for name in diskcache.ARRAYS:
+        expected = getattr(coll, name)
+        if expected is None:
+            assert getattr(loaded, name) is None
+        else:
+            np.testing.assert_array_equal(getattr(loaded, name), expected)
+    # changing what was loaded doesn't change the cache
+    loaded.points[:] = 0
+    np.testing.assert_array_equal(cache.get('a').points, coll.points)
+    assert cache.get('b') is None
+    assert not glob.glob(os.path.join(str(tmp_path), '.partial-*'))
+
+
+def test_trim_drops_the_least_recently_used(tmp_path):
+    cache = diskcache.DiskCache(str(tmp_path), maxbytes=1 << 30)
+    for n, key in enumerate('abc'):
+        cache.put(key, collection(n + 1))
+        os.utime(cache.path(key), (n, n))
+    cache.get('a')  # a is now the most recently used
+    sizes = {path: size for _, size, path in cache.entries()}
+    assert len(sizes) == 3 and cache.size() == sum(sizes.values())
+    assert cache.trim(cache.size() - 1) == 1
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    cache.maxbytes = sizes[cache.path('c')]
+    cache.put('d', collection(1))
+    assert cache.get('a') is None and cache.get('c') is None
+    assert cache.get('d') is not None
+    assert cache.clear() == 1 and cache.size() == 0
+
+
+def test_default(monkeypatch, tmp_path):
+    assert diskcache.default() is None
+    monkeypatch.setenv('SPIROGEN_CACHE', str(tmp_path))
+    assert diskcache.default().folder == str(tmp_path)
+    monkeypatch.delenv('SPIROGEN_CACHE')
+    assert diskcache.default().folder == diskcache.DEFAULT_PATH
+
+
+def test_generate_paths_uses_the_cache(tmp_path):
+    cache = diskcache.DiskCache(str(tmp_path))
+    paths = pipeline.generate_paths(PATTERN, cache=cache)
+    assert not mapped(paths.points)
+    cached = pipeline.generate_paths(dict(PATTERN, parameters=dict(
+        PATTERN['parameters'], pensize=4)), cache=cache)
+    assert mapped(cached.points)
+    np.testing.assert_array_equal(cached.points, paths.points)
+    assert len(cache.entries()) == 1
+    pipeline.generate_paths(PATTERN, cache=False)
+    assert len(cache.entries()) == 1
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    # a copy of the spirogen modules for codeversion to hash
+    folder = tmp_path / 'spirogen'
+    shutil.copytree(os.path.dirname(diskcache.__file__), folder,
+                    ignore=shutil.ignore_patterns('__pycache__', 'interface'))
+    monkeypatch.setattr(diskcache, '__file__', str(folder / 'diskcache.py'))
+    monkeypatch.setattr(diskcache, '_codeversion', None)
+    return folder
+
+
+def version(monkeypatch):
+    monkeypatch.setattr(diskcache, '_codeversion', None)
+    return diskcache.codeversion()
+
+
+def test_codeversion_follows_the_generators(source, monkeypatch):
+    first = version(monkeypatch)
+    with open(source / 'render.py', 'a') as file:
+        file.write('\n# drawn differently\n')
+    assert version(monkeypatch) == first
+    with open(source / 'geometry.py', 'a') as file:
+        file.write('\n# generated differently\n')
+    second = version(monkeypatch)
+    assert second != first
+    monkeypatch.setattr(diskcache, 'VERSION', diskcache.VERSION + 1)
+    assert version(monkeypatch) not in (first, second)
@@ -0,0 +1,97 @@
+import io
+import re
+import xml.etree.ElementTree as ElementTree
+
+import numpy as np
+import pytest
+
+from spirogen import export
+
+SVG = '{http://www.w3.org/2000/svg}'
+
+
+def parse(text):
+    return np.array([[float(v) for v in pair.split(',')]
+                     for pair in text.split()])
+
+
+@pytest.mark.parametrize('precision', [0, 1, 2, 4])
+def test_formatpoints_round_trip(precision):
+    rng = np.random.default_rng(precision)
+    points = np.concatenate((
+        rng.normal(scale=500, size=(200, 2)),
+        [[0, -0.0], [-0.001, 0.004], [10, 100], [1e-9, -1e-9], [2.5, -2.5]],
+    ))
+    text = export.formatpoints(points, precision)
+    np.testing.assert_array_equal(parse(text),
+                                  np.round(points, precision) + 0.0)
+    assert '-0 ' not in text + ' ' and '-0,' not in text
+    assert not re.search(r'\.0(,| |$)', text)
+
+
+def test_formatpoints_whole_numbers():
+    assert export.formatpoints([[1, 2], [3.5, -4]], 2) == '1,2 3.5,-4'
+    assert export.formatpoints([[1.26, 2.74]], 0) == '1,3'
+
+
+def svg_paths(coordlist, **kwargs):
+    file = io.BytesIO()
+    with export.SVGWriter(file, (200, 100), 'black', 2) as writer:
+        writer.paths(coordlist, **kwargs)
+    root = ElementTree.fromstring(file.getvalue())
+    return root, root.findall(f'{SVG}g/{SVG}path')
+
+
+def test_svg_paths():
+    square = [(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)]
+    far = [(50, 20), (60, 30)]
+    root, paths = svg_paths([square, far], colors=['red', 'blue'],
+                            pensize=2)
+    assert root.get('width') == '200' and root.get('height') == '100'
+    assert [p.get('stroke') for p in paths] == ['red', 'blue']
+    assert [p.get('stroke-width') for p in paths] == ['2', '2']
+    # page coordinates have y going down from the top left corner
+    first = parse(paths[0].get('d')[1:])
+    np.testing.assert_array_equal(first, np.array(square) * (1, -1)
+                                  + (100, 50))
+
+
+def test_svg_merges_runs_of_one_style():
+    # paths in the same color are written as one element, with joined paths
+    # carried on without a new subpath
+    root, paths = svg_paths(
+        [[(0, 0), (1, 1)], [(1, 1), (2, 0)], [(5, 5), (6, 6)]],
+        colors=['white']
+    )
+    assert len(paths) == 1
+    assert paths[0].get('d').count('M') == 2
+
+
+def test_pdf_structure():
+    file = io.BytesIO()
+    with export.PDFWriter(file, (300, 200), 'white', 2) as writer:
+        writer.paths([[(0, 0), (10, 5), (20, 0)], [(1, 1), (2, 2)]],
+                     colors=['#ff0000', 'blue'])
+    data = file.getvalue()
+    assert data.startswith(b'%PDF-1.4\n') and data.endswith(b'%%EOF\n')
+    xref = int(re.search(rb'startxref\n(\d+)\n', data).group(1))
+    assert data[xref:].startswith(b'xref\n0 6\n')
+    offsets = re.findall(rb'(\d{10}) 00000 n', data[xref:])
+    for number, offset in enumerate(offsets, 1):
+        assert data[int(offset):].startswith(b'%d 0 obj\n' % number)
+    start = data.index(b'stream\n') + len(b'stream\n')
+    end = data.index(b'endstream')
+    length = int(re.search(rb'5 0 obj\n(\d+)\n', data).group(1))
+    assert end - start == length
+    content = data[start:end].decode('latin-1')
+    assert '1 0 0 RG' in content and '0 0 1 RG' in content
+    assert '150 100 m\n160 105 l\n170 100 l' in content
+
+
+def test_export_picks_the_format(tmp_path):
+    export.export([(0, 0), (1, 1)], tmp_path / 'a.svg')
+    export.export([(0, 0), (1, 1)], tmp_path / 'a.pdf')
+    assert (tmp_path / 'a.svg').read_bytes().startswith(b'<?xml')
+    assert (tmp_path / 'a.pdf').read_bytes().startswith(b'%PDF')
+    with pytest.raises(ValueError):
+        export.export([(0, 0), (1, 1)], tmp_path / 'a.eps')
@@ -0,0 +1,186 @@
+from turtle import Vec2D
+
+import numpy as np
+import pytest
+
+from spirogen import geometry
+from spirogen.spirogen import CascadeLines, TimesTable
+from conftest import saved_patterns
+
+# which turncycle values repeat each angle, as the old oneangle() to
+# fourangle() methods spelled them out
+REPEATS = {
+    1: [()],
+    2: [(1, 5), (2, 5)],
+    3: [(1, 5), (2, 5, 6), (3, 6)],
+    4: [(1, 5, 8), (2, 5, 6, 8, 9), (3, 6, 7, 8, 9), (4, 7, 9)],
+}
+
+
+def turtle_radial_angular(size, angles, turncycle=0, jank=None):
+    # replays what RadialAngularPattern did with the turtle cursor before it
+    # was computed in closed form, using turtle's own vector type
+    position, orient = Vec2D(0, 0), Vec2D(1, 0)
+    poly = [position]
+
+    def forward(distance):
+        nonlocal position
+        position = position + orient * distance
+        poly.append(position)
+
+    def turn(angle, curve=0):
+        nonlocal orient
+        if curve is None or curve == 0:
+            orient = orient.rotate(-angle)
+            return
+        reps = round(abs(angle) / 10) or 1
+        for _ in range(reps):
+            forward(curve)
+            step = abs(angle) / reps
+            orient = orient.rotate(step if angle < 0 else -step)
+
+    for _ in range(10000):
+        for n, angle in enumerate(angles):
+            for _ in range(2 if turncycle in REPEATS[len(angles)][n] else 1):
+                forward(size)
+                turn(*angle)
+        if jank is not None and len(angles) > 1:
+            forward(jank)
+        if round(position[0]) == 0 and round(position[1]) == 0:
+            poly.append(Vec2D(0, 0))
+            break
+    return np.array(poly, dtype=float)
+
+
+@pytest.mark.parametrize(
+    'name, pattern', saved_patterns('radialangular'),
+    ids=[name for name, _ in saved_patterns('radialangular')]
+)
+def test_radial_angular_matches_turtle(name, pattern):
+    params = pattern['parameters']
+    angles = [a for a in params['angles'] if a[0] != 0]
+    args = (params['size'], angles, params.get('turncycle', 0),
+            params.get('jank'))
+    expected = turtle_radial_angular(*args)
+    path = geometry.radial_angular(*args)
+    assert path.shape == expected.shape
+    np.testing.assert_allclose(path, expected, atol=1e-6)
+
+
+@pytest.mark.parametrize('angles, turncycle, jank', [
+    ([[90, 0]], 0, None),
+    ([[144, 0]], 0, None),
+    ([[125, 5]], 0, None),
+    ([[125, 5], [4, 0]], 0, 0),
+    ([[100, 3], [250, 0], [30, 4]], 6, 7),
+    ([[60, 0], [170, 2], [95, 0], [20, 0]], 9, None),
+])
+def test_radial_angular_examples_match_turtle(angles, turncycle, jank):
+    expected = turtle_radial_angular(200, angles, turncycle, jank)
+    path = geometry.radial_angular(200, angles, turncycle, jank)
+    assert path.shape == expected.shape
+    np.testing.assert_allclose(path, expected, atol=1e-6)
+
+
+def turtle_circle(radius, steps, start=(0, 0)):
+    # the points turtle.circle(radius, steps=steps) records, from its source
+    position, orient = Vec2D(*start), Vec2D(1, 0)
+    w = 360 / steps
+    length = 2 * radius * np.sin(np.radians(w / 2))
+    poly = [position]
+    orient = orient.rotate(w / 2)
+    for _ in range(steps):
+        position = position + orient * length
+        poly.append(position)
+        orient = orient.rotate(w)
+    return np.array(poly, dtype=float)
+
+
+def test_circle_matches_turtle():
+    np.testing.assert_allclose(geometry.circle(50, 12), turtle_circle(50, 12),
+                               atol=1e-9)
+
+
+@pytest.mark.parametrize('radius, npoints', [(300, 100), (120, 7), (45, 360)])
+def test_times_table_ring_matches_turtle(radius, npoints):
+    table = TimesTable(radius, npoints)
+    np.testing.assert_allclose(
+        table.create_ring(radius),
+        turtle_circle(radius, npoints - 1, start=(0, -radius)), atol=1e-9
+    )
+
+
+@pytest.mark.parametrize('npoints, multby, range_', [
+    (100, 2, 200), (37, 5, 50), (360, 13, 1000), (10, 1, 3)
+])
+def test_times_table_matches_turtle(npoints, multby, range_):
+    table = TimesTable(200, npoints, multby, range_, rotation=30, xscale=2)
+    # what draw() recorded with begin_poly: a goto to the ring point for
+    # each i, then one to the point it is joined to
+    ring = table.ring
+    expected = [ring[0]]
+    for i in range(range_):
+        expected += [ring[i % npoints], ring[(i * multby) % len(ring)]]
+    assert table.list == [[tuple(xy) for xy in expected]]
+
+
+@pytest.mark.parametrize('position', [(0, 0), (35.5, -20)])
+def test_cascade_lines_match_turtle(position):
+    nlines = 40
+    cascade = CascadeLines(nlines, position=position)
+    lengths = np.linspace(5, 500, nlines)
+    dists = np.linspace(10, 600, nlines)
+    # each line was a goto to its start then forward(length) with heading 0
+    expected = []
+    for length, dist in zip(lengths, dists):
+        start = Vec2D(position[0] - length / 2, position[1] - dist)
+        expected.append([tuple(start), tuple(start + Vec2D(1, 0) * length)])
+    assert cascade.paths == expected
+
+
+def test_closing_cycle_period():
+    # a five pointed star closes after five cycles, a square after four
+    assert geometry.closing_cycle(100 + 0j, 144) == (5, True)
+    assert geometry.closing_cycle(100 + 0j, 90) == (4, True)
+
+
+def test_closing_cycle_gives_up():
+    # turning 1 degree a cycle takes 360 cycles to come back, so within 5
+    # the closest end is the first one
+    assert geometry.closing_cycle(100 + 0j, 1, maxcycles=5) == (1, False)
+
+
+def test_transform_paths_matches_one_at_a_time():
+    rng = np.random.default_rng(0)
+    paths = [rng.normal(size=(n, 2)) for n in (3, 1, 7, 4)]
+    matrices = geometry.rotation_matrices([10, 45, 90, 200], (3, -2))
+    matrices[:, :2, 2] += rng.normal(size=(4, 2))
+    expected = [geometry.apply_matrix(p, m) for p, m in zip(paths, matrices)]
+
+    points, offsets = geometry.stack_paths(paths)
+    stacked = geometry.transform_paths(points, matrices, offsets)
+    for path, want in zip(geometry.split_paths(stacked, offsets), expected):
+        np.testing.assert_allclose(path, want)
+
+    padded = np.stack([p[:1].repeat(3, axis=0) for p in paths])
+    result = geometry.transform_paths(padded, matrices)
+    for path, matrix, original in zip(result, matrices, padded):
+        np.testing.assert_allclose(path, geometry.apply_matrix(original,
+                                                               matrix))
+
+
+def test_rotation_matrix_directions():
+    point = np.array([[1.0, 0.0]])
+    counter = geometry.apply_matrix(point, geometry.rotation_matrix(90))
+    clockwise = geometry.apply_matrix(
+        point, geometry.rotation_matrix(90, clockwise=True)
+    )
+    np.testing.assert_allclose(counter, [[0, 1]], atol=1e-12)
+    np.testing.assert_allclose(clockwise, [[0, -1]], atol=1e-12)
+
+
+def test_repeat_paths():
+    points, offsets = geometry.stack_paths([[(0, 0), (1, 1)], [(2, 2)]])
+    repeated, starts = geometry.repeat_paths(points, offsets, 3)
+    assert starts.tolist() == [0, 2, 3, 5, 6, 8, 9]
+    np.testing.assert_array_equal(repeated, np.tile(points, (3, 1)))
@@ -0,0 +1,101 @@
+import os
+import time
+
+import numpy as np
+
+from spirogen import jobs, pipeline
+
+PATTERN = {'patterntype': 'radialangular',
+           'parameters': {'size': 100, 'pensize': 1, 'angles': [[144, 0]]}}
+
+
+def add(a, b=0):
+    jobs.report(0.5, 'Adding')
+    return a + b
+
+
+def fail():
+    raise ValueError('no good')
+
+
+def sleep(seconds):
+    time.sleep(seconds)
+
+
+def crash():
+    os._exit(3)
+
+
+def reported(messages):
+    for fraction, message in messages:
+        jobs.report(fraction, message)
+    # keeps running for a while after reporting
+    time.sleep(0.5)
+    return len(messages)
+
+
+def test_done():
+    job = jobs.Job(add, 2, b=3)
+    assert job.wait(30)
+    assert job.state == 'done' and not job.running
+    assert job.result == 5 and job.error is None
+    assert job.progress == (0.5, 'Adding')
+    assert not job.poll()
+
+
+def test_progress_is_picked_up_while_running():
+    job = jobs.Job(reported, [(0.25, 'One'), (None, 'Two')])
+    deadline = time.monotonic() + 30
+    while job.poll() and job.progress != (None, 'Two'):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert job.wait(30) and job.result == 2
+
+
+def test_failed():
+    job = jobs.Job(fail)
+    assert job.wait(30)
+    assert job.state == 'failed' and job.result is None
+    message, trace = job.error
+    assert message == 'ValueError: no good'
+    assert 'raise ValueError' in trace
+
+
+def test_crash():
+    job = jobs.Job(crash)
+    assert job.wait(30)
+    assert job.state == 'failed'
+    assert job.error[0] == 'The job stopped unexpectedly'
+
+
+def test_cancel():
+    job = jobs.Job(sleep, 60)
+    assert not job.wait(0.05)
+    job.cancel()
+    assert job.state == 'cancelled' and not job._process.is_alive()
+    job.cancel()
+    assert job.state == 'cancelled'
+
+
+def test_runner_replaces_the_last_job():
+    runner = jobs.Runner()
+    first = runner.submit(sleep, 60)
+    second = runner.submit(add, 1, 1)
+    assert first.state == 'cancelled' and runner.job is second
+    assert second.wait(30) and second.result == 2
+    runner.cancel()
+    assert second.state == 'done'
+
+
+def test_report_and_partial_do_nothing_outside_a_job():
+    assert jobs.report(0.5, 'Nothing') is None
+    assert jobs.partial('anything') is None
+    assert add(1, 2) == 3
+
+
+def test_generate_paths_as_a_job():
+    job = jobs.Job(pipeline.generate_paths, PATTERN)
+    assert job.wait(60) and job.state == 'done'
+    assert job.progress == (1, 'Generated radialangular')
+    np.testing.assert_array_equal(job.result.points,
+                                  pipeline.generate_paths(PATTERN).points)
@@ -0,0 +1,46 @@
+import pathlib
+import subprocess
+import sys
+
+from spirogen import importbudget, lazy
+
+CHECK = """
+import sys
+import spirogen.spirogen as spiro
+assert 'scipy' not in sys.modules and 'matplotlib' not in sys.modules
+assert spiro.closest_point((1, 1), [(5, 5), (0, 2), (1, 3)]) == 1
+assert 'scipy.spatial' in sys.modules
+"""
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+
+def test_module_is_imported_on_first_use():
+    name = 'wave'
+    sys.modules.pop(name, None)
+    stand_in = lazy.module(name)
+    assert isinstance(stand_in, lazy.LazyModule)
+    assert not lazy.loaded(name)
+    assert stand_in.WAVE_FORMAT_PCM == 1
+    assert lazy.loaded(name)
+    # later lookups come from the copied attributes
+    assert 'Wave_read' in vars(stand_in)
+    assert stand_in.Wave_read is sys.modules[name].Wave_read
+
+
+def test_loaded_module_is_returned_as_is():
+    import colorsys
+    assert lazy.module('colorsys') is colorsys
+
+
+def test_scipy_is_only_imported_when_used():
+    subprocess.run([sys.executable, '-c', CHECK], check=True, cwd=ROOT)
+
+
+def test_budget_check_reports_deferred_imports(capsys, monkeypatch):
+    monkeypatch.chdir(ROOT)
+    budgets = {'scipy.spatial': 60, 'spirogen.palette': 60}
+    assert not importbudget.check(budgets, repeat=1)
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith('FAIL') and 'imported scipy' in lines[0]
+    assert lines[1].startswith('ok')
@@ -0,0 +1,93 @@
+import colorsys
+import json
+
+import numpy as np
+import pytest
+
+from spirogen import palette, pipeline
+from spirogen.spirogen import ColorScheme
+from conftest import SETTINGS_FILES
+
+
+def old_hex(colordict, ncolors):
+    # how ColorScheme built its palette before palette.py: a np.linspace per
+    # section, rounded and scaled with round(), then matplotlib's to_hex
+    fades = {}
+    for k in 'rgb':
+        stops = colordict[k]
+        sections = len(stops) - 1
+        divs = [ncolors // sections] * sections
+        for i in range(ncolors - sum(divs)):
+            divs[-(i + 1)] += 1
+        fades[k] = []
+        for i in range(sections):
+            section = np.linspace(stops[i], stops[i + 1], divs[i])
+            fades[k] += np.around(section, 3).tolist()
+    rgb0to1 = [[round(v / 255, 3) for v in color]
+               for color in zip(fades['r'], fades['g'], fades['b'])]
+    return ['#' + ''.join(format(round(v * 255), '02x') for v in color)
+            for color in rgb0to1], rgb0to1
+
+
+def saved_colors():
+    colors = []
+    for path in SETTINGS_FILES:
+        with open(path) as file:
+            data = json.load(file)
+        if pipeline.settings_kind(data) == 'colors':
+            colors.append(data)
+    return colors
+
+
+@pytest.mark.parametrize('colors', saved_colors())
+def test_saved_colors_match_old_palette(colors):
+    nstops = int(colors['nstops'])
+    colordict = {k: list(v[:nstops]) for k, v in colors['colordict'].items()}
+    expected, rgb0to1 = old_hex(colordict, int(colors['totalcolors']))
+    scheme, _ = pipeline.colorscheme(colors)
+    assert list(scheme.hex) == expected
+    np.testing.assert_array_equal(scheme.rgb0to1, rgb0to1)
+
+
+@pytest.mark.parametrize('ncolors', [2, 7, 50, 99, 100, 101, 1000])
+def test_uneven_stops_match_old_palette(ncolors):
+    colordict = {'r': [255, 0, 30, 7.5], 'g': [0, 128],
+                 'b': [12, 250, 3, 99, 0, 255, 17]}
+    expected, _ = old_hex(colordict, ncolors)
+    assert list(ColorScheme(colordict, ncolors).hex) == expected
+
+
+def test_symetrical():
+    colordict = {'r': [255, 0], 'g': [0, 255], 'b': [0, 0]}
+    forward, _ = old_hex(colordict, 10)
+    assert list(ColorScheme(colordict, 20, symetrical=True).hex) == (
+        forward + forward[::-1]
+    )
+
+
+def test_palettes_are_cached():
+    colordict = {'r': [1, 2], 'g': [3, 4], 'b': [5, 6]}
+    first = palette.build(colordict, 33)
+    assert palette.build(dict(colordict), 33) is first
+    assert not first[0].flags.writeable
+
+
+def test_hex_conversions():
+    assert palette.rgb2hex((1, 0.5, 0)) == '#ff8000'
+    assert palette.hex2color('#ff8000') == (1, 128 / 255, 0)
+    assert palette.hex2color('#f80') == palette.hex2color('#ff8800')
+    with pytest.raises(ValueError):
+        palette.hex2color('#ff80')
+
+
+def test_hsv_matches_colorsys():
+    rng = np.random.default_rng(0)
+    rgb = np.concatenate((rng.random((200, 3)), [[0, 0, 0], [1, 1, 1],
+                                                 [0.5, 0.5, 0.5], [1, 0, 0]]))
+    expected = np.array([colorsys.rgb_to_hsv(*c) for c in rgb])
+    np.testing.assert_allclose(palette.rgb_to_hsv(rgb), expected, atol=1e-12)
+    np.testing.assert_allclose(palette.hsv_to_rgb(expected), rgb,
+                               atol=1e-12)
+    back = np.array([colorsys.hsv_to_rgb(*c) for c in expected])
+    np.testing.assert_allclose(palette.hsv_to_rgb(expected), back,
+                               atol=1e-12)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from spirogen import parallel
+from spirogen.spirogen import LVL2
+
+
+def line(n, slope):
+    # a picklable worker for the pool
+    x = np.arange(n, dtype=float)
+    return np.column_stack((x, x * slope))
+
+
+TASKS = [(n, s) for n, s in zip((5, 1, 12, 7, 3, 9), range(6))]
+SIZES = [n for n, _ in TASKS]
+
+
+def test_processcount():
+    assert parallel.processcount(None) == 1
+    assert parallel.processcount(3) == 3
+    assert parallel.processcount(0) >= 1
+
+
+@pytest.mark.parametrize('processes, chunksize', [
+    (None, None), (2, None), (3, 1), (2, 4)
+])
+def test_generate_keeps_order(processes, chunksize):
+    coll = parallel.generate(line, TASKS, SIZES, processes, chunksize)
+    assert coll.lengths.tolist() == SIZES
+    for path, task in zip(coll.paths(), TASKS):
+        np.testing.assert_array_equal(path, line(*task))
+
+
+def test_generate_checks_sizes():
+    with pytest.raises(ValueError):
+        parallel.generate(line, TASKS, [s + 1 for s in SIZES], 2)
+
+
+def test_sin_spiral_in_parallel():
+    serial = LVL2.sin_spiral(strands=8, processes=None)
+    pooled = LVL2.sin_spiral(strands=8, processes=2)
+    assert len(pooled) == len(serial)
+    for a, b in zip(pooled, serial):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_layered_flowers_in_parallel():
+    serial = LVL2.layered_flowers(layers=6, draw=False, processes=None)
+    pooled = LVL2.layered_flowers(layers=6, draw=False, processes=2)
+    assert len(pooled) == len(serial)
+    for a, b in zip(pooled, serial):
+        np.testing.assert_array_equal(a, b)
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from spirogen.paths import PathCollection
+
+PATH = [(0.0, 0.0), (1.0, 2.0), (3.0, -1.0)]
+PATHS = [PATH, [(5.0, 5.0)], PATH[::-1], [(9.0, 9.0), (8.0, 7.0)]]
+GROUPS = [PATHS[:2], PATHS[2:], [PATH]]
+
+
+@pytest.mark.parametrize('coordlist, depth', [
+    (PATH, 1), (PATHS, 2), (GROUPS, 3)
+])
+def test_round_trip(coordlist, depth):
+    coll = PathCollection.fromlist(coordlist)
+    assert coll.depth == depth
+    assert coll.tolist() == coordlist
+    assert len(coll) == len(coordlist)
+    assert coll.npoints == len(np.concatenate(
+        [np.reshape(p, (-1, 2)) for p in coll.paths()]
+    ))
+
+
+def test_indexing_like_a_list():
+    coll = PathCollection.fromlist(PATHS)
+    assert coll.npaths == 4 and coll.npoints == 9
+    assert coll.lengths.tolist() == [3, 1, 3, 2]
+    np.testing.assert_array_equal(coll[2], PATHS[2])
+    np.testing.assert_array_equal(coll[-1], PATHS[-1])
+    assert coll.path(0).base is not None  # a view, not a copy
+    groups = PathCollection.fromlist(GROUPS)
+    assert groups.group(1).tolist() == GROUPS[1]
+    assert groups.group(-1).tolist() == GROUPS[-1]
+
+
+def test_arrays():
+    padded = np.arange(24, dtype=float).reshape(3, 4, 2)
+    coll = PathCollection.fromlist(padded)
+    assert coll.depth == 2 and coll.lengths.tolist() == [4, 4, 4]
+    np.testing.assert_array_equal(coll.points, padded.reshape(-1, 2))
+    single = PathCollection.fromlist(padded[0])
+    assert single.depth == 1 and single.npaths == 1
+    assert PathCollection.fromlist(coll) is coll
+    assert PathCollection.fromlist([]).npaths == 0
+
+
+def test_validation():
+    with pytest.raises(ValueError):
+        PathCollection(PATH, [0, 2])
+    with pytest.raises(ValueError):
+        PathCollection(PATH, colors=[1, 2])
+    with pytest.raises(ValueError):
+        PathCollection(PATH, [0, 1, 3], depth=1)
+
+
+def test_concatenate_keeps_shared_extras():
+    a = PathCollection(PATH, colors=[0, 1, 2])
+    b = PathCollection.fromlist(PATHS[1:3], colors=[3, 4, 5, 6])
+    joined = PathCollection.concatenate([a, b])
+    assert joined.tolist() == [PATH] + PATHS[1:3]
+    assert joined.colors.tolist() == [0, 1, 2, 3, 4, 5, 6]
+    joined = PathCollection.concatenate([a, PATHS[1:3]])
+    assert joined.colors is None
+
+
+def test_transform():
+    coll = PathCollection.fromlist(PATHS)
+    shift = np.identity(3)
+    shift[:2, 2] = (10, 20)
+    moved = coll.transform(shift)
+    np.testing.assert_array_equal(moved.points, coll.points + (10, 20))
+    per_path = np.repeat(np.identity(3)[None], 4, axis=0)
+    per_path[1, :2, 2] = (1, 1)
+    coll.transform(per_path, inplace=True)
+    assert coll.tolist()[1] == [(6.0, 6.0)]
+    assert coll.tolist()[0] == PATH
+
+
+def test_bounds_and_size():
+    coll = PathCollection.fromlist(PATHS)
+    assert coll.bounds() == (0, -1, 9, 9)
+    assert coll.nbytes == 9 * 16 + 5 * 8
+
+
+def test_ragged_groups():
+    # the first group's paths have different lengths, which np.ndim can't
+    # tell the depth of
+    coll = PathCollection.fromlist([[PATH, [(5.0, 5.0)]], [PATH]])
+    assert coll.depth == 3 and coll.groups.tolist() == [0, 2, 3]
@@ -0,0 +1,97 @@
+import json
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from spirogen import batch, pipeline, render
+from spirogen.spirogen import RadialAngularPattern
+from conftest import saved_patterns
+
+COLORS = {
+    'background': {'r': 10, 'g': 20, 'b': 30}, 'totalcolors': 12,
+    'nstops': 2, 'colordict': {'r': [255, 0, 9], 'g': [0, 0, 9],
+                               'b': [0, 255, 9]},
+    'id': None
+}
+PATTERN = {'patterntype': 'radialangular',
+           'parameters': {'size': 200, 'pensize': 2, 'angles': [[144, 0]]}}
+
+
+@pytest.fixture
+def settings(tmp_path):
+    # a settings folder with a session pointing at a pattern and colors
+    for kind, name, data in (
+            ('patterns', 'star', PATTERN), ('colors', 'blue', COLORS),
+            ('sessions', 'both', {'patterns': 'star', 'colors': 'blue'})):
+        (tmp_path / kind).mkdir()
+        (tmp_path / kind / f'{name}.json').write_text(json.dumps(data))
+    return tmp_path
+
+
+def test_load(settings):
+    assert pipeline.load(settings / 'patterns' / 'star.json') == (PATTERN,
+                                                                  None)
+    assert pipeline.load(settings / 'colors' / 'blue.json') == (None, COLORS)
+    assert pipeline.load(settings / 'sessions' / 'both.json') == (PATTERN,
+                                                                  COLORS)
+    with pytest.raises(ValueError):
+        pipeline.settings_kind({'something': 'else'})
+
+
+def test_colorscheme():
+    scheme, background = pipeline.colorscheme(COLORS)
+    assert background == '#0a141e'
+    assert len(scheme.hex) == 12
+    # only the first nstops stops are used
+    assert scheme.hex[0] == '#ff0000' and scheme.hex[-1] == '#0000ff'
+    assert pipeline.colorscheme()[1] == '#000000'
+
+
+def test_radial_angular_matches_the_pattern_class():
+    coll = pipeline.generate_paths(PATTERN)
+    expected = RadialAngularPattern(200, [[144, 0]]).list
+    assert coll.depth == 1
+    np.testing.assert_allclose(coll.points, expected)
+
+
+@pytest.mark.parametrize('patterntype', [
+    'radialangular', 'layeredflowers', 'sinespiral', 'spirals',
+    'iterativerotation'
+])
+def test_generate_saved_pattern(patterntype):
+    name, pattern = saved_patterns(patterntype)[0]
+    scheme, _ = pipeline.colorscheme()
+    drawing = pipeline.generate(pattern, scheme)
+    assert drawing['coordlist'].npoints > 0
+    assert np.isfinite(drawing['coordlist'].points).all()
+    assert drawing['pensize'] == pattern['parameters'].get('pensize', 1)
+
+
+def test_render_file(settings, tmp_path):
+    written = pipeline.render_file(
+        settings / 'sessions' / 'both.json', tmp_path / 'out',
+        ('png', 'svg'), (160, 100)
+    )
+    assert [p.rsplit('.', 1)[1] for p in written] == ['png', 'svg']
+    image = Image.open(written[0])
+    assert image.size == (160, 100)
+    assert image.getpixel((0, 0)) == (10, 20, 30)
+    assert len(np.unique(np.asarray(image).reshape(-1, 3), axis=0)) > 2
+
+
+def test_expand(settings):
+    files = batch.expand([str(settings), str(settings / 'colors' / '*.json')])
+    assert [f.rsplit('/', 2)[1] for f in files] == [
+        'colors', 'patterns', 'sessions'
+    ]
+
+
+def test_batch_main(settings, tmp_path, capsys):
+    missing = str(settings / 'patterns' / 'missing.json')
+    status = batch.main([str(settings / 'sessions'), missing,
+                         '-o', str(tmp_path / 'out'), '-r', '80x50'])
+    assert status == 1
+    assert (tmp_path / 'out' / 'both.png').exists()
+    assert 'missing.json' in capsys.readouterr().err
+
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from spirogen import pointcloud
+from spirogen.spirogen import Transform
+
+CENTERS = [(0, 0), (100, -50), (-30, 250)]
+
+
+def test_cloud_shape_and_order():
+    points = pointcloud.cloud(CENTERS, 2000, 3, exp=2, seed=1)
+    assert points.shape == (6000, 2)
+    for n, center in enumerate(CENTERS):
+        around = points[n * 2000:(n + 1) * 2000] - center
+        radii = np.hypot(*around.T)
+        # distances are exponential with a mean of exp * spread
+        assert radii.mean() == pytest.approx(6, rel=0.1)
+        assert np.median(radii) == pytest.approx(6 * np.log(2), rel=0.1)
+        angles = np.arctan2(around[:, 1], around[:, 0])
+        counts, _ = np.histogram(angles, 8, (-np.pi, np.pi))
+        assert (abs(counts - 250) < 75).all()
+
+
+def test_seed_gives_the_same_cloud():
+    first = pointcloud.cloud(CENTERS, 50, 2, seed=7)
+    np.testing.assert_array_equal(first, pointcloud.cloud(CENTERS, 50, 2,
+                                                          seed=7))
+    assert not np.array_equal(first, pointcloud.cloud(CENTERS, 50, 2,
+                                                      seed=8))
+    assert not np.array_equal(pointcloud.cloud(CENTERS, 50, 2),
+                              pointcloud.cloud(CENTERS, 50, 2))
+
+
+@pytest.mark.parametrize('chunksize', [1, 7, 50, 120, 1 << 20])
+def test_chunks_join_up_into_the_cloud(chunksize):
+    chunks = list(pointcloud.chunks(CENTERS, 50, 2, seed=3,
+                                    chunksize=chunksize))
+    assert max(len(c) for c in chunks) <= chunksize
+    np.testing.assert_array_equal(np.concatenate(chunks),
+                                  pointcloud.cloud(CENTERS, 50, 2, seed=3))
+
+
+def test_generatepointcloud():
+    path = [(0, 0), (10, 10)]
+    points = Transform(path).generatepointcloud(5, 1, seed=2)
+    assert len(points) == 10 and isinstance(points[0], tuple)
+    assert points == Transform(path).generatepointcloud(5, 1, seed=2)
+    lists = Transform([path, path]).generatepointcloud(5, 1, seed=2)
+    assert len(lists) == 20
+    assert lists[:10] == points
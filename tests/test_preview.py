@@ -0,0 +1,75 @@
+import io
+import time
+
+import numpy as np
+from PIL import Image
+
+from spirogen import jobs, pipeline
+
+PATTERN = {'patterntype': 'radialangular',
+           'parameters': {'size': 300, 'pensize': 2, 'angles': [[144, 0]]}}
+
+
+def partials(values):
+    for value in values:
+        jobs.partial(value)
+    time.sleep(0.2)
+    return 'finished'
+
+
+def image(png):
+    with Image.open(io.BytesIO(png)) as opened:
+        return np.asarray(opened.convert('RGB'))
+
+
+def test_partial_results():
+    job = jobs.Job(partials, ['rough', 'less rough'])
+    assert job.partial is None
+    assert job.wait(30) and job.result == 'finished'
+    assert job.partial == 'less rough'
+
+
+def test_preview():
+    scheme, _ = pipeline.colorscheme()
+    png, paths = pipeline.preview(PATTERN, scheme, resolution=(96, 60))
+    pixels = image(png)
+    assert pixels.shape == (60, 96, 3)
+    assert pixels.any() and not pixels[0, 0].any()
+    np.testing.assert_array_equal(paths.points,
+                                  pipeline.generate_paths(PATTERN).points)
+    # paths that are passed in aren't sent back
+    again, none = pipeline.preview(PATTERN, scheme, resolution=(96, 60),
+                                   paths=paths)
+    assert none is None and again == png
+
+
+def test_preview_skips_the_disk_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv('SPIROGEN_CACHE', str(tmp_path))
+    scheme, _ = pipeline.colorscheme()
+    pipeline.preview(PATTERN, scheme, resolution=(96, 60))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_rough_preview_is_sent_first():
+    scheme, _ = pipeline.colorscheme()
+    job = jobs.Job(pipeline.preview, PATTERN, scheme, '#102030', (96, 60),
+                   budget=1)
+    assert job.wait(60) and job.state == 'done'
+    rough, (png, paths) = image(job.partial), job.result
+    assert rough.shape == image(png).shape == (60, 96, 3)
+    assert rough[0, 0].tolist() == [16, 32, 48]
+    assert paths.npoints > 1
+    assert job.progress == (0.75, 'Refining preview')
+
+
+def test_simplified_keeps_cycling_colors():
+    path = [(x, 0.0) for x in range(9)]
+    drawing = {'coordlist': [path], 'colors': ['#ff0000', '#00ff00'],
+               'colorby': 'segment', 'pensize': 1}
+    coll = pipeline.simplified(drawing, 0.1)['coordlist']
+    # every point is kept where the color changes
+    assert coll.npoints == 9
+    assert coll.colors.tolist() == [0, 1] * 4 + [0]
+    drawing['colors'] = ['#ff0000']
+    assert pipeline.simplified(drawing, 0.1)['coordlist'].tolist() == [
+        [(0, 0), (8, 0)]]
@@ -0,0 +1,126 @@
+import numpy as np
+
+from spirogen import render
+from spirogen.paths import PathCollection
+
+SQUARE = [(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)]
+
+
+class Recorder(render.Raster):
+    # keeps every line as (number of points, color, pensize) instead of
+    # drawing it
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.drawn = []
+
+    def line(self, points, color='white', pensize=1):
+        self.drawn.append((len(points), color, pensize))
+
+
+def drawn(coordlist, colors, pensize=1, colorby=None):
+    raster = Recorder((40, 40), supersample=1)
+    raster.paths(coordlist, colors, pensize, colorby)
+    return raster.drawn
+
+
+def segment_colors(coordlist, colors, colorby=None, first=0):
+    # the color of every segment drawn, in order
+    runs = render.runs(coordlist, colors, 1, colorby, first)
+    return [color for points, color, _ in runs
+            for _ in range(len(points) - 1)]
+
+
+def test_single_path_cycles_colors_by_segment():
+    # like Pattern.simpledraw, each segment takes the color of the point it
+    # ends on
+    colors = ['a', 'b', 'c']
+    assert segment_colors(SQUARE, colors) == ['b', 'c', 'a', 'b']
+    assert drawn(SQUARE, ['x']) == [(5, 'x', 1)]
+
+
+def test_paths_take_the_next_color():
+    paths = [SQUARE, SQUARE[:3], SQUARE[1:]]
+    assert segment_colors(paths, ['a', 'b']) == (
+        ['a'] * 4 + ['b'] * 2 + ['a'] * 3
+    )
+    assert segment_colors(paths[:2], ['a', 'b'], 'segment') == (
+        ['b', 'a', 'b', 'a', 'b', 'a']
+    )
+
+
+def test_first_carries_on_colors_across_chunks():
+    paths = [SQUARE, SQUARE[:3], SQUARE[1:], SQUARE[:2]]
+    colors = ['a', 'b', 'c']
+    whole = segment_colors(paths, colors, 'path')
+    split = (segment_colors(paths[:1], colors, 'path')
+             + segment_colors(paths[1:], colors, 'path', first=1))
+    assert split == whole
+
+
+def test_point_colors_and_sizes():
+    coll = PathCollection(SQUARE, colors=[0, 0, 1, 1, 2],
+                          pensizes=[1, 1, 1, 3, 3])
+    runs = [(len(points), color, size) for points, color, size
+            in render.runs(coll, ['a', 'b', 'c'])]
+    assert runs == [(2, 'a', 1), (2, 'b', 1), (2, 'b', 3), (2, 'c', 3)]
+
+
+def test_pensize_fades_across_paths():
+    paths = [SQUARE, SQUARE, SQUARE]
+    assert [size for _, _, size in drawn(paths, 'white', (1, 5))] == [1, 3, 5]
+
+
+def test_aspaths():
+    groups = [[SQUARE, SQUARE], [SQUARE[1:], SQUARE[:2]]]
+    assert [len(p) for p in render.aspaths(groups)] == [5, 5, 4, 2]
+    assert [len(p) for p in render.aspaths(SQUARE)] == [5]
+    assert [len(p) for p in render.aspaths(np.zeros((3, 4, 2)))] == [4] * 3
+    assert render.aspaths([]) == []
+
+
+def test_raster_coordinates():
+    # pattern coordinates have (0, 0) in the middle and y going up
+    raster = render.Raster((100, 60), 'black', supersample=1)
+    raster.line([(0, 0), (20, 0)], 'white')
+    raster.line([(0, 0), (0, 20)], 'red')
+    image = np.asarray(raster.finish())
+    assert tuple(image[30, 60]) == (255, 255, 255)
+    assert tuple(image[20, 50]) == (255, 0, 0)
+    assert tuple(image[40, 50]) == (0, 0, 0)
+
+
+def test_render_supersampled_size(tmp_path):
+    image = render.render([SQUARE], tmp_path / 'square.png',
+                          resolution=(64, 48), supersample=3)
+    assert image.size == (64, 48)
+    assert (tmp_path / 'square.png').exists()
+
+
+def test_runs_match_what_the_raster_draws():
+    # the vector writers draw the same runs as the raster
+    paths = [SQUARE, SQUARE[:3], SQUARE[1:]]
+    for args in ((SQUARE, ['a', 'b', 'c']), (paths, ['a', 'b'], (1, 4)),
+                 (paths, ['a', 'b'], 2, 'segment')):
+        runs = [(len(points), color, size)
+                for points, color, size in render.runs(*args)]
+        assert runs == drawn(*args)
+
+
+def test_ragged_groups():
+    groups = [[SQUARE, SQUARE[:2]], [SQUARE[1:]]]
+    assert [len(p) for p in render.aspaths(groups)] == [5, 2, 4]
+
+
+def test_corners():
+    straight = np.array([(0, 0), (1, 0), (2, 0), (3, 0)], dtype=float)
+    assert len(render._corners(straight, 0.1)) == 0
+    # each vertex of an arc turns by the angle between its points
+    angles = np.radians(np.arange(0, 90, 2))
+    arc = 1000 * np.column_stack((np.cos(angles), np.sin(angles)))
+    assert len(render._corners(arc, 0.1)) == 0
+    assert len(render._corners(arc, 0.01)) == len(arc) - 2
+    zigzag = np.array([(0, 0), (1, 1), (2, 0), (3, 1), (4, 0)], dtype=float)
+    np.testing.assert_array_equal(render._corners(zigzag, 0.1), zigzag[1:-1])
+    # repeated points don't count as a turn
+    bend = np.array([(0, 0), (1, 0), (1, 0), (1, 1), (1.01, 2)])
+    np.testing.assert_array_equal(render._corners(bend, 0.1), [(1, 0)])
@@ -0,0 +1,95 @@
+from math import ceil, hypot
+
+import numpy as np
+import pytest
+
+from spirogen import resample
+from spirogen.paths import PathCollection
+from spirogen.spirogen import Transform
+
+
+def reference_densify(path, maxlength):
+    out = []
+    for a, b in zip(path, path[1:]):
+        pieces = max(ceil(hypot(b[0] - a[0], b[1] - a[1]) / maxlength), 1)
+        out += [(a[0] + (b[0] - a[0]) * k / pieces,
+                 a[1] + (b[1] - a[1]) * k / pieces) for k in range(pieces)]
+    return out + [path[-1]]
+
+
+def random_paths(seed, npaths=4):
+    rng = np.random.default_rng(seed)
+    return [np.cumsum(rng.normal(size=(n, 2)) * 20, axis=0)
+            for n in rng.integers(2, 60, npaths)]
+
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('maxlength', [0.5, 7, 1000])
+def test_densify_matches_reference(seed, maxlength):
+    paths = random_paths(seed)
+    coll = resample.densify([p.tolist() for p in paths], maxlength)
+    assert coll.npaths == len(paths)
+    for path, new in zip(paths, coll):
+        np.testing.assert_allclose(new, reference_densify(path.tolist(),
+                                                          maxlength))
+        steps = np.hypot(*np.diff(new, axis=0).T)
+        assert (steps <= maxlength * (1 + 1e-12)).all()
+
+
+def test_densify_keeps_every_point_and_style():
+    path = [(0, 0), (10, 0), (10, 0), (10, 3)]
+    coll = PathCollection.fromlist(path, colors=[0, 1, 2, 3])
+    new = resample.densify(coll, 2.5)
+    assert new.depth == 1
+    assert new.tolist() == [(0, 0), (2.5, 0), (5, 0), (7.5, 0), (10, 0),
+                            (10, 0), (10, 1.5), (10, 3)]
+    # new points take the style of the point ending their segment
+    assert new.colors.tolist() == [0, 1, 1, 1, 1, 2, 3, 3]
+    with pytest.raises(ValueError):
+        resample.densify(path, 0)
+
+
+def test_addpoints():
+    path = [(0, 0), (4, 0), (4, 30)]
+    assert Transform(path).addpoints(20, 10) == [
+        (0, 0), (2, 0), (4, 0)] + [(4, 2 * k) for k in range(1, 16)]
+    lists = Transform([path, path[::-1]]).addpoints(20, 10)
+    assert lists[1] == lists[0][::-1]
+    assert Transform(path).addpoints(20, 0) == path
+    assert Transform([path]).addpoints(20, -1) == [path]
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_sample_spacing_and_ends(seed):
+    paths = random_paths(seed)
+    counts = [2, 5, 17, 100]
+    coll = resample.sample(paths, counts)
+    assert coll.lengths.tolist() == counts
+    _, lengths = resample.arc_lengths(PathCollection.fromlist(paths))
+    for path, new, count, length in zip(paths, coll, counts, lengths):
+        np.testing.assert_allclose(new[[0, -1]], path[[0, -1]], atol=1e-9)
+        distance, _ = resample.arc_lengths(PathCollection.fromlist(new))
+        # points are evenly spaced along the original path, so never further
+        # apart in a straight line than the spacing
+        steps = np.hypot(*np.diff(new, axis=0).T)
+        assert (steps <= length / (count - 1) + 1e-9).all()
+        assert distance[-1] <= length + 1e-9
+    assert resample.sample(paths, 1).tolist() == [[tuple(p[0])]
+                                                  for p in paths]
+
+
+def test_resample_and_decimate():
+    paths = random_paths(5, 6)
+    _, lengths = resample.arc_lengths(PathCollection.fromlist(paths))
+    coll = resample.resample(paths, 3)
+    assert coll.lengths.tolist() == (np.ceil(lengths / 3) + 1).tolist()
+
+    coll = resample.decimate(paths, 60)
+    assert coll.npoints <= 60
+    assert (coll.lengths >= 2).all()
+    # paths that already fit in their share are left exactly as they are
+    short = [(0, 0), (500, 500), (1000, 0)]
+    coll = resample.decimate([short] + paths, 100)
+    assert coll[0].tolist() == [list(p) for p in short]
+    with pytest.raises(ValueError):
+        resample.sample([short, []], 3)
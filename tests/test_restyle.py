@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from spirogen import pipeline
+from spirogen.spirogen import ColorScheme
+from conftest import saved_patterns
+
+STAR = {'patterntype': 'radialangular',
+        'parameters': {'size': 100, 'pensize': 1, 'angles': [[144, 0]]}}
+ROTATION = {'patterntype': 'iterativerotation', 'parameters': {
+    'function': 'Circle', 'reps': 3, 'xshift': 1, 'yshift': 1, 'stretch': 5,
+    'length': 5, 'depth': 5, 'stretchshift': 0, 'lenshift': 0,
+    'depthshift': 1, 'individualrotation': 2, 'branches': 2, 'pensize': 1}}
+
+
+def changed(pattern, **parameters):
+    return dict(pattern, parameters=dict(pattern['parameters'], **parameters))
+
+
+def test_deterministic():
+    assert pipeline.deterministic(STAR)
+    assert pipeline.deterministic(ROTATION)
+    assert not pipeline.deterministic(changed(ROTATION, reps=None))
+    assert not pipeline.deterministic(
+        changed(ROTATION, rotationcenter=(None, 0)))
+    assert pipeline.deterministic(changed(ROTATION, reps=None, seed=4))
+    assert pipeline.geometry_key(changed(ROTATION, reps=None)) is None
+
+
+def test_geometry_key_ignores_the_style():
+    key = pipeline.geometry_key(STAR)
+    assert pipeline.geometry_key(changed(STAR, pensize=7)) == key
+    assert pipeline.geometry_key(changed(STAR, size=101)) != key
+    assert pipeline.geometry_key(dict(STAR, patterntype='spirals')) != key
+    reordered = {'patterntype': 'radialangular', 'parameters': dict(
+        reversed(list(STAR['parameters'].items())))}
+    assert pipeline.geometry_key(reordered) == key
+
+
+def test_geometry_cache_keeps_the_latest():
+    cache = pipeline.GeometryCache(size=2)
+    patterns = [changed(STAR, size=s) for s in (10, 20, 30)]
+    for n, pattern in enumerate(patterns[:2]):
+        cache.put(pattern, n)
+    assert cache.get(changed(patterns[0], pensize=4)) == 0
+    cache.put(patterns[2], 2)
+    # the least recently used pattern is dropped
+    assert cache.get(patterns[1]) is None
+    assert cache.get(patterns[0]) == 0 and cache.get(patterns[2]) == 2
+    cache.put(changed(ROTATION, reps=None), 3)
+    assert cache.get(changed(ROTATION, reps=None)) is None
+
+
+@pytest.mark.parametrize('patterntype', [
+    'radialangular', 'layeredflowers', 'sinespiral', 'spirals',
+    'iterativerotation'
+])
+def test_restyling_matches_generating(patterntype):
+    _, pattern = saved_patterns(patterntype)[0]
+    cache = pipeline.GeometryCache()
+    first, _ = pipeline.colorscheme()
+    cache.put(pattern, pipeline.generate_paths(pattern))
+    scheme = ColorScheme({'r': [0, 255], 'g': [40, 40], 'b': [255, 0]}, 30)
+    restyled = changed(pattern, pensize=5)
+    paths = cache.get(restyled)
+    assert paths is not None
+    drawing = pipeline.style(paths, restyled, scheme)
+    expected = pipeline.generate(restyled, scheme)
+    assert drawing['coordlist'] is paths
+    np.testing.assert_array_equal(drawing['coordlist'].points,
+                                  expected['coordlist'].points)
+    assert {k: v for k, v in drawing.items() if k != 'coordlist'} == \
+        {k: v for k, v in expected.items() if k != 'coordlist'}
+    assert drawing['pensize'] == 5
+    assert pipeline.style(paths, pattern, first)['colors'] != \
+        drawing['colors']
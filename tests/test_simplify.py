@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from spirogen import simplify
+from spirogen import spirogen as spiro
+from spirogen.paths import PathCollection
+
+
+def segment_distance(p, a, b):
+    along, offset = b - a, p - a
+    length2 = along @ along
+    t = 0 if length2 == 0 else min(max(offset @ along / length2, 0), 1)
+    return np.hypot(*(offset - t * along))
+
+
+def reference_rdp(points, tolerance):
+    # the textbook recursive version
+    if len(points) < 3:
+        return points
+    dists = [segment_distance(p, points[0], points[-1]) for p in points[1:-1]]
+    furthest = int(np.argmax(dists)) + 1
+    if dists[furthest - 1] <= tolerance:
+        return points[[0, -1]]
+    left = reference_rdp(points[:furthest + 1], tolerance)
+    return np.concatenate((left[:-1], reference_rdp(points[furthest:],
+                                                    tolerance)))
+
+
+def random_paths(seed, npaths=4):
+    rng = np.random.default_rng(seed)
+    return [np.cumsum(rng.normal(size=(n, 2)) * 5, axis=0)
+            for n in rng.integers(3, 400, npaths)]
+
+
+def flower():
+    return np.array(spiro.FlowerPattern2(6, reps=40).list)
+
+
+@pytest.mark.parametrize('tolerance', [0.1, 0.5, 4])
+def test_matches_recursive_rdp(tolerance):
+    paths = random_paths(1) + [flower()]
+    coll = simplify.rdp(paths, tolerance, stretch=0)
+    assert coll.npaths == len(paths)
+    for path, new in zip(paths, coll):
+        np.testing.assert_array_equal(new, reference_rdp(path, tolerance))
+
+
+@pytest.mark.parametrize('stretch', [0, 50, 1024])
+def test_removed_points_are_within_tolerance(stretch):
+    tolerance = 0.5
+    for path, new in zip(random_paths(2), simplify.rdp(random_paths(2),
+                                                       tolerance,
+                                                       stretch=stretch)):
+        np.testing.assert_array_equal(new[[0, -1]], path[[0, -1]])
+        # every point is close to the segment between the kept points
+        # either side of it
+        kept = [int(np.flatnonzero((path == p).all(axis=1))[0]) for p in new]
+        for a, b in zip(kept, kept[1:]):
+            for p in path[a + 1:b]:
+                assert segment_distance(p, path[a], path[b]) <= tolerance
+        if stretch:
+            assert set(range(0, len(path), stretch)) <= set(kept)
+
+
+def test_keeps_style_changes_and_keep():
+    line = [(x, 0.0) for x in range(10)]
+    assert simplify.rdp(line, 0.1).tolist() == [(0, 0), (9, 0)]
+    keep = np.zeros(10, bool)
+    keep[4] = True
+    assert simplify.rdp(line, 0.1, keep).tolist() == [(0, 0), (4, 0), (9, 0)]
+    coll = PathCollection.fromlist(line, colors=[0] * 6 + [1] * 4,
+                                   pensizes=[2] * 10)
+    new = simplify.rdp(coll, 0.1)
+    assert new.tolist() == [(0, 0), (5, 0), (9, 0)]
+    assert new.colors.tolist() == [0, 0, 1]
+    assert new.pensizes.tolist() == [2, 2, 2]
+    lists = simplify.rdp([[line], [line[:2], []]], 0.1)
+    assert lists.tolist() == [[[(0, 0), (9, 0)]], [[(0, 0), (1, 0)], []]]
+
+
+class Recorder:
+    # stands in for the turtle module and keeps every point drawn
+    def __init__(self):
+        self.points = []
+
+    def goto(self, xy):
+        self.points.append(tuple(xy))
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def test_polar_pattern_draw_tolerance(monkeypatch):
+    pattern = spiro.FlowerPattern2(6, reps=40)
+    full, simple = Recorder(), Recorder()
+    monkeypatch.setattr(spiro, 'turtle', full)
+    pattern.draw()
+    monkeypatch.setattr(spiro, 'turtle', simple)
+    pattern.draw(tolerance=0.5)
+    assert full.points[1:] == [tuple(xy) for xy in pattern.list]
+    expected = simplify.rdp(pattern.list, 0.5).tolist()
+    assert simple.points[1:] == expected
+    assert len(expected) < len(pattern.list) / 2
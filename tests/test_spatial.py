@@ -0,0 +1,147 @@
+import numpy as np
+import pytest
+from scipy.spatial import distance
+
+from spirogen import spatial
+from spirogen.spirogen import Analyze, closest_point
+
+
+def old_tour(points):
+    # the closest_point / list.pop loop connectends used, without its
+    # duplicated first end and dropped last one
+    remaining = list(range(len(points)))
+    order = []
+    ind = 0
+    while remaining:
+        current = remaining.pop(ind)
+        order.append(current)
+        if remaining:
+            ind = closest_point(points[current],
+                                [points[i] for i in remaining])
+    return order
+
+
+def point_sets():
+    rng = np.random.default_rng(3)
+    yield rng.random((500, 2)) * 800 - 400
+    # a lattice has lots of ties, which have to go to the lowest index
+    yield np.array([(x, y) for y in range(12) for x in range(15)], float)
+    yield np.column_stack((np.linspace(-50, 50, 200), np.zeros(200)))
+    yield np.repeat(rng.normal(size=(40, 2)) * 100, 3, axis=0)
+    # a tight cluster far away from a spread out one
+    yield np.concatenate((rng.normal(size=(100, 2)),
+                          rng.normal(size=(100, 2)) * 1000 + 5000))
+
+
+@pytest.mark.parametrize('points', list(point_sets()))
+def test_tour_matches_closest_point_loop(points):
+    assert spatial.tour(points) == old_tour(points.tolist())
+
+
+def test_tour_of_tuples_and_start():
+    points = [(0, 0), (10, 0), (1, 0), (11, 0), (5, 0)]
+    assert spatial.tour(points) == [0, 2, 4, 1, 3]
+    assert spatial.tour(points, start=3) == [3, 1, 4, 2, 0]
+    assert spatial.tour([(2, 3)]) == [0]
+    assert spatial.tour([]) == []
+
+
+def test_grid_index_nearest_after_removals():
+    rng = np.random.default_rng(8)
+    points = rng.random((300, 2)) * [1000, 10]
+    index = spatial.GridIndex(points)
+    alive = np.ones(len(points), bool)
+    for i in rng.permutation(len(points))[:280]:
+        index.remove(i)
+        index.remove(i)
+        alive[i] = False
+        query = rng.random(2) * 1200 - 100
+        dists = distance.cdist([query], points[alive])[0]
+        expected = np.flatnonzero(alive)[dists.argmin()]
+        assert index.nearest(*query) == expected
+    assert len(index) == 20
+
+
+def brute_intersections(paths, selfintersections=False):
+    segments = [(np.array(p[k]), np.array(p[k + 1]), n)
+                for n, p in enumerate(paths) for k in range(len(p) - 1)]
+    found = []
+    for i, (a, b, n) in enumerate(segments):
+        for j in range(i + 1, len(segments)):
+            c, d, m = segments[j]
+            if n == m and (not selfintersections or j == i + 1):
+                continue
+            r, s = b - a, d - c
+            denom = r[0] * s[1] - r[1] * s[0]
+            if denom == 0:
+                continue
+            t = ((c - a)[0] * s[1] - (c - a)[1] * s[0]) / denom
+            u = ((c - a)[0] * r[1] - (c - a)[1] * r[0]) / denom
+            if 0 <= t <= 1 and 0 <= u <= 1:
+                found.append(a + t * r)
+    return np.array(found).reshape(-1, 2)
+
+
+def random_paths(seed, npaths, npoints, scale=100):
+    rng = np.random.default_rng(seed)
+    return [np.cumsum(rng.normal(size=(npoints, 2)), axis=0) * scale / 10
+            for _ in range(npaths)]
+
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('cellsize', [None, 0.5, 1000])
+def test_intersections_match_brute_force(seed, cellsize):
+    paths = random_paths(seed, 6, 40)
+    found = spatial.intersections([p.tolist() for p in paths], cellsize)
+    np.testing.assert_allclose(found, brute_intersections(paths))
+
+
+def test_self_intersections_match_brute_force():
+    paths = random_paths(7, 3, 60)
+    found = spatial.intersections(paths, selfintersections=True)
+    np.testing.assert_allclose(found, brute_intersections(paths, True))
+    # a single path is always checked against itself
+    np.testing.assert_allclose(spatial.intersections(paths[0].tolist()),
+                               brute_intersections(paths[:1], True))
+
+
+def test_small_chunks_find_the_same_points():
+    paths = random_paths(11, 8, 50)
+    np.testing.assert_array_equal(spatial.intersections(paths, chunksize=7),
+                                  spatial.intersections(paths))
+
+
+def test_crossing_on_a_joint_counts_once():
+    paths = [[(-1, 0), (0, 0), (1, 0)], [(0, -1), (0, 1)]]
+    np.testing.assert_array_equal(spatial.intersections(paths), [[0, 0]])
+    ends = [[(0, 0), (1, 1)], [(1, 1), (2, 0)]]
+    np.testing.assert_array_equal(spatial.intersections(ends), [[1, 1]])
+    assert spatial.intersections([[(0, 0), (1, 0)], [(0, 1), (1, 1)]]).shape \
+        == (0, 2)
+
+
+def test_mixed_segment_lengths():
+    # long segments pass through many more cells than the short ones, which
+    # mustn't blow up the number of cells searched
+    angles = np.linspace(0, 2 * np.pi, 300)
+    circle = 100 * np.column_stack((np.cos(angles), np.sin(angles)))
+    paths = [circle, np.array([(-500, -500), (500, 500)]),
+             np.array([(-300, 40), (300, 41), (0, -1000)])]
+    paths += random_paths(3, 2, 50)
+    for cellsize in (None, 0.5):
+        np.testing.assert_allclose(spatial.intersections(paths, cellsize),
+                                   brute_intersections(paths))
+    angles = np.linspace(0, 2 * np.pi, 20000)
+    circle = 100 * np.column_stack((np.cos(angles), np.sin(angles)))
+    found = spatial.intersections([circle, [(-500, -500), (500, 500)]])
+    np.testing.assert_allclose(found, [(50 * 2 ** 0.5,) * 2,
+                                       (-50 * 2 ** 0.5,) * 2], rtol=1e-7)
+
+
+def test_analyze_crosspoint():
+    paths = [[(-2, -2), (2, 2)], [(-2, 2), (2, -2)], [(-2, 1), (2, 1)]]
+    points, avg = Analyze(paths, 2).crosspoint()
+    assert sorted(points) == [(-1.0, 1.0), (0.0, 0.0), (1.0, 1.0)]
+    assert avg == (0.0, 2 / 3)
+    # the old tolerances are still accepted by position, and ignored
+    assert Analyze(paths, 2).crosspoint(0.5, 20, False) == (points, avg)
@@ -0,0 +1,177 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from spirogen import diskcache, parallel, pipeline, stream
+from spirogen.paths import PathCollection
+from spirogen.spirogen import LVL2
+
+SIZES = [5, 1, 12, 7, 3, 9, 30, 2]
+TASKS = [(n, s) for s, n in enumerate(SIZES)]
+FLOWERS = {'patterntype': 'layeredflowers', 'parameters': {
+    'layers': 12, 'npetals': 5, 'innerdepth': 3, 'sizefactor': 2,
+    'pensize': 1, 'rotate': 3, 'rotaterate': 1}}
+SPIRAL = {'patterntype': 'sinespiral', 'parameters': {'strands': 9}}
+
+
+def line(n, slope):
+    # a picklable worker for the pool
+    x = np.arange(n, dtype=float)
+    return np.column_stack((x, x * slope))
+
+
+def joined(chunks):
+    return PathCollection.concatenate(list(chunks))
+
+
+@pytest.mark.parametrize('chunksize, expected', [
+    (1, [(i, i + 1) for i in range(8)]),
+    (20, [(0, 3), (3, 6), (6, 7), (7, 8)]),
+    (1000, [(0, 8)]),
+])
+def test_spans(chunksize, expected):
+    assert stream._spans(SIZES, chunksize) == expected
+    assert stream._spans([], 10) == []
+
+
+@pytest.mark.parametrize('processes', [None, 2])
+@pytest.mark.parametrize('chunksize', [1, 20, 1000])
+def test_strands_match_generating_in_full(processes, chunksize):
+    matrices = np.tile(np.eye(3), (len(SIZES), 1, 1))
+    matrices[:, 0, 2] = np.arange(len(SIZES))
+    strands = stream.Strands(line, TASKS, SIZES, matrices, chunksize,
+                             processes)
+    assert (strands.npaths, strands.npoints) == (8, sum(SIZES))
+    chunks = list(strands)
+    assert all(c.npoints <= chunksize or c.npaths == 1 for c in chunks)
+    full = parallel.generate(line, TASKS, SIZES).transform(matrices)
+    np.testing.assert_array_equal(joined(chunks).points, full.points)
+    np.testing.assert_array_equal(joined(chunks).offsets, full.offsets)
+
+
+def test_strands_share_one_pool(monkeypatch):
+    made = []
+
+    class Counted(parallel.Workers):
+        def __init__(self, *args):
+            super().__init__(*args)
+            made.append(self)
+
+    monkeypatch.setattr(parallel, 'Workers', Counted)
+    chunks = list(stream.Strands(line, TASKS, SIZES, chunksize=10,
+                                 processes=2))
+    assert len(chunks) == 6 and len(made) == 1
+    assert made[0].npoints == 30
+    assert made[0].pool is None and made[0].memory is None
+
+
+def test_workers_are_reused():
+    with parallel.Workers(2, 50) as workers:
+        pool = workers.pool
+        for tasks in (TASKS[:4], TASKS[4:]):
+            coll = parallel.generate(line, tasks, [n for n, _ in tasks],
+                                     workers=workers)
+            for path, task in zip(coll.paths(), tasks):
+                np.testing.assert_array_equal(path, line(*task))
+        assert workers.pool is pool
+        with pytest.raises(ValueError):
+            parallel.generate(line, [(50, 1), (1, 1)], [50, 1],
+                              workers=workers)
+
+
+def test_chunks():
+    coll = PathCollection.fromlist([line(*task) for task in TASKS])
+    coll.colors = np.arange(coll.npoints)
+    chunks = list(stream.Chunks(coll, 20))
+    assert [c.npaths for c in chunks] == [3, 3, 1, 1]
+    assert np.shares_memory(chunks[1].points, coll.points)
+    np.testing.assert_array_equal(joined(chunks).colors, coll.colors)
+    single = stream.Chunks(line(5, 1), 2)
+    assert [c.npoints for c in single] == [5]
+
+
+@pytest.mark.parametrize('memmap', [False, True])
+def test_path_buffer(memmap, tmp_path):
+    coll = PathCollection.fromlist([line(*task) for task in TASKS])
+    buffer = stream.PathBuffer(coll.npoints, coll.npaths,
+                               str(tmp_path) if memmap else None)
+    for chunk in stream.Chunks(coll, 20):
+        assert not buffer.full
+        buffer.append(chunk)
+    assert buffer.full
+    buffer.flush()
+    np.testing.assert_array_equal(buffer.collection().points, coll.points)
+    np.testing.assert_array_equal(buffer.collection().offsets, coll.offsets)
+    if memmap:
+        np.testing.assert_array_equal(np.load(tmp_path / 'points.npy'),
+                                      coll.points)
+    with pytest.raises(ValueError):
+        buffer.append(line(1, 1))
+
+
+@pytest.mark.parametrize('pattern', [FLOWERS, SPIRAL])
+def test_stream_paths_match_generate_paths(pattern):
+    chunks = pipeline.stream_paths(pattern, chunksize=500)
+    assert isinstance(chunks, stream.Strands)
+    full = pipeline.generate_paths(pattern)
+    np.testing.assert_array_equal(joined(chunks).points, full.points)
+    np.testing.assert_array_equal(joined(chunks).offsets, full.offsets)
+
+
+def test_streaming_to_the_cache(tmp_path):
+    cache = diskcache.DiskCache(str(tmp_path))
+    key = pipeline.geometry_key(FLOWERS)
+    chunks = iter(pipeline.stream_paths(FLOWERS, 500, cache=cache))
+    next(chunks)
+    chunks.close()
+    # an entry is only saved once every chunk has gone by
+    assert cache.get(key) is None and not cache.entries()
+    assert not list(tmp_path.iterdir())
+    streamed = joined(pipeline.stream_paths(FLOWERS, 500, cache=cache))
+    cached = cache.get(key)
+    np.testing.assert_array_equal(cached.points, streamed.points)
+    chunks = pipeline.stream_paths(FLOWERS, 500, cache=cache)
+    assert isinstance(chunks, stream.Chunks)
+    np.testing.assert_array_equal(joined(chunks).points, streamed.points)
+
+
+@pytest.mark.parametrize('pattern', [FLOWERS, SPIRAL])
+@pytest.mark.parametrize('extension', ['png', 'svg'])
+def test_output_stream_matches_output(pattern, extension, tmp_path):
+    scheme, _ = pipeline.colorscheme()
+    streamed = tmp_path / f'streamed.{extension}'
+    whole = tmp_path / f'whole.{extension}'
+    pipeline.output_stream(pattern, scheme, str(streamed), '#000000',
+                           (192, 120), chunksize=500)
+    pipeline.output(pipeline.generate(pattern, scheme), str(whole),
+                    '#000000', (192, 120))
+    if extension == 'png':
+        with Image.open(streamed) as a, Image.open(whole) as b:
+            np.testing.assert_array_equal(np.asarray(a), np.asarray(b))
+    else:
+        assert streamed.read_text() == whole.read_text()
+
+
+@pytest.mark.parametrize('extension', ['png', 'svg', 'pdf'])
+def test_output_stream_failing_part_way(extension, tmp_path, monkeypatch):
+    def failing(*args):
+        yield PathCollection.fromlist([[(0, 0), (1, 1)]])
+        raise RuntimeError('generation failed')
+
+    monkeypatch.setattr(pipeline, 'stream_paths', failing)
+    scheme, _ = pipeline.colorscheme()
+    filename = tmp_path / f'pattern.{extension}'
+    filename.write_bytes(b'finished')
+    with pytest.raises(RuntimeError):
+        pipeline.output_stream(SPIRAL, scheme, str(filename))
+    # the finished file is left alone and nothing half written is left over
+    assert filename.read_bytes() == b'finished'
+    assert [path.name for path in tmp_path.iterdir()] == [filename.name]
+
+
+def test_layered_flowers_stream():
+    strands = LVL2.layered_flowers(layers=5, draw=False, chunksize=100)
+    full = LVL2.layered_flowers(layers=5, draw=False)
+    assert isinstance(strands, stream.Strands)
+    for a, b in zip(joined(strands).paths(), full):
+        np.testing.assert_array_equal(a, b)
@@ -0,0 +1,89 @@
+import json
+
+import numpy as np
+import pytest
+
+from spirogen import pipeline, sweep
+from spirogen.spirogen import LVL2
+
+
+def test_random_parameters_are_seeded():
+    params = LVL2.random_rotation_parameters(5)
+    assert params == LVL2.random_rotation_parameters(5)
+    assert params != LVL2.random_rotation_parameters(6)
+    assert params['function'] in ('Wave', 'Rectangle', 'Circle')
+    assert 1 <= params['reps'] < 100 and 1 <= params['branches'] < 31
+    assert params['stretch'] >= 0 and params['cosine'] is False
+    assert 'rotationcenter' not in params
+
+
+def test_given_parameters_are_kept():
+    params = LVL2.random_rotation_parameters(
+        3, reps=12, function=None, rotationcenter=(None, 40)
+    )
+    assert params['reps'] == 12
+    assert params['function'] == LVL2.random_rotation_parameters(3)['function']
+    x, y = params['rotationcenter']
+    assert -300 <= x < 300 and y == 40
+    rng = np.random.default_rng(3)
+    assert LVL2.random_rotation_parameters(rng) == \
+        LVL2.random_rotation_parameters(3)
+
+
+def test_random_iterative_rotation_uses_the_parameters():
+    scheme, _ = pipeline.colorscheme()
+    paths, params = LVL2.random_iterative_rotation(
+        seed=9, reps=4, colors=scheme, draw=False, getparams=True,
+        rotationcenter=(0, 0)
+    )
+    assert params == LVL2.random_rotation_parameters(
+        9, reps=4, cosine=False, rotationcenter=(0, 0))
+    again = LVL2.random_iterative_rotation(seed=9, reps=4, colors=scheme,
+                                           draw=False, rotationcenter=(0, 0))
+    np.testing.assert_array_equal(np.asarray(paths, dtype=float),
+                                  np.asarray(again, dtype=float))
+
+
+def test_random_sets():
+    sets = sweep.random_sets(6, seed=1, reps=10)
+    assert sets == sweep.random_sets(6, seed=1, reps=10)
+    assert len({name for name, _ in sets}) == 6
+    for name, params in sets:
+        seed = int(name.split('-')[1])
+        assert params == LVL2.random_rotation_parameters(seed, reps=10)
+
+
+def test_grid_sets():
+    grid = {'reps': [2, 3, 4], 'branches': [1, 5]}
+    sets = sweep.grid_sets(grid, seed=2, function='Circle')
+    assert [name for name, _ in sets] == [f'grid-{i:04d}' for i in range(6)]
+    assert [(p['reps'], p['branches']) for _, p in sets] == [
+        (2, 1), (2, 5), (3, 1), (3, 5), (4, 1), (4, 5)]
+    rest = {k: v for k, v in sets[0][1].items()
+            if k not in ('reps', 'branches')}
+    for _, params in sets:
+        assert params['function'] == 'Circle'
+        assert {k: params[k] for k in rest} == rest
+
+
+def test_main(tmp_path, capsys):
+    outdir = tmp_path / 'sweep'
+    assert sweep.main(['--grid', 'reps=2,3', '--set', 'function=Circle',
+                       'branches=2', '--seed', '4', '-o', str(outdir),
+                       '-r', '60x40', '-s', '1']) == 0
+    assert 'Rendered 2 of 2 sets' in capsys.readouterr().out
+    assert sorted(p.name for p in outdir.iterdir()) == [
+        'grid-0000.json', 'grid-0000.png', 'grid-0001.json', 'grid-0001.png']
+    with open(outdir / 'grid-0001.json') as file:
+        pattern = json.load(file)
+    assert pattern == {'patterntype': 'iterativerotation',
+                       'parameters': sweep.grid_sets(
+                           {'reps': [2, 3]}, 4, function='Circle',
+                           branches=2)[1][1]}
+
+
+@pytest.mark.parametrize('text,expected', [
+    ('12', 12), ('0.5', 0.5), ('true', True), ('[1, 2]', [1, 2]),
+    ('Wave', 'Wave')])
+def test_parse_value(text, expected):
+    assert sweep.parse_value(text) == expected
@@ -0,0 +1,86 @@
+import json
+import os
+
+import pytest
+from PIL import Image
+
+from spirogen import thumbnails
+
+PATTERN = {'patterntype': 'radialangular',
+           'parameters': {'size': 50, 'pensize': 1, 'angles': [[144, 0]]}}
+COLORS = {
+    'background': {'r': 0, 'g': 0, 'b': 0}, 'totalcolors': 4, 'nstops': 2,
+    'colordict': {'r': [255, 0], 'g': [0, 0], 'b': [0, 255]}, 'id': None
+}
+
+
+@pytest.fixture
+def settings(tmp_path):
+    for kind, name, data in (
+            ('patterns', 'star', PATTERN), ('colors', 'red', COLORS),
+            ('sessions', 'both', {'patterns': 'star', 'colors': 'red'})):
+        (tmp_path / kind).mkdir()
+        (tmp_path / kind / f'{name}.json').write_text(json.dumps(data))
+    return tmp_path
+
+
+@pytest.fixture
+def cache(settings):
+    return thumbnails.ThumbnailCache(str(settings / 'thumbnails'), (48, 30),
+                                     str(settings))
+
+
+def test_thumbnail_is_rendered_once(settings, cache):
+    key, path = cache.thumbnail(settings / 'sessions' / 'both.json')
+    assert path == cache.path(key) and key == cache.key(PATTERN, COLORS)
+    with Image.open(path) as image:
+        assert image.size == (48, 30)
+    made = os.path.getmtime(path)
+    assert cache.thumbnail(settings / 'sessions' / 'both.json') == (key, path)
+    assert os.path.getmtime(path) == made
+    assert os.listdir(cache.folder) == [f'{key}.png']
+
+
+def test_keys_change_with_the_settings(settings, cache):
+    session, _ = cache.thumbnail(settings / 'sessions' / 'both.json')
+    pattern, _ = cache.thumbnail(settings / 'patterns' / 'star.json')
+    colors, _ = cache.thumbnail(settings / 'colors' / 'red.json')
+    assert len({session, pattern, colors}) == 3
+    # editing a file a session points to gives the session a new thumbnail
+    changed = dict(PATTERN, parameters=dict(PATTERN['parameters'], size=60))
+    (settings / 'patterns' / 'star.json').write_text(json.dumps(changed))
+    newsession, _ = cache.thumbnail(settings / 'sessions' / 'both.json')
+    assert newsession not in (session, pattern)
+    bigger = thumbnails.ThumbnailCache(cache.folder, (96, 60))
+    assert bigger.key(PATTERN, COLORS) != cache.key(PATTERN, COLORS)
+
+
+def test_prune(cache):
+    for name in ('a.png', 'b.png', 'notes.txt'):
+        open(os.path.join(cache.folder, name), 'w').close()
+    assert cache.prune(['a']) == 1
+    assert sorted(os.listdir(cache.folder)) == ['a.png', 'notes.txt']
+
+
+def test_builder(settings, cache):
+    files = [settings / 'sessions' / 'both.json',
+             settings / 'patterns' / 'missing.json',
+             settings / 'colors' / 'red.json']
+    open(cache.path('stale'), 'w').close()
+    builder = thumbnails.ThumbnailBuilder(cache, files)
+    builder.start()
+    builder.join(60)
+    results = [builder.results.get_nowait() for _ in files]
+    assert [file for file, _ in results] == files
+    assert results[1][1] is None
+    assert all(os.path.exists(path) for _, path in results[::2])
+    assert sorted(os.listdir(cache.folder)) == sorted(
+        os.path.basename(path) for _, path in results[::2])
+
+
+def test_cancelled_builder_stops(settings, cache):
+    builder = thumbnails.ThumbnailBuilder(
+        cache, [settings / 'patterns' / 'star.json'])
+    builder.cancel()
+    builder.run()
+    assert builder.results.empty()
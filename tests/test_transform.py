@@ -0,0 +1,103 @@
+from math import cos, pi, sin
+
+import numpy as np
+import pytest
+
+from spirogen.paths import PathCollection
+from spirogen.spirogen import FlowerPattern, SpiralPattern, Transform
+
+POINTS = [(0.0, 0.0), (10.0, 5.0), (-3.0, 7.5), (4.0, -2.0)]
+
+
+def old_rotate(points, angle, center=(0, 0)):
+    # the list comprehension Transform.rotate used before it had matrices
+    rads = angle * (pi / 180)
+    x0, y0 = center
+    return [((x - x0) * cos(rads) + (y - y0) * sin(rads) + x0,
+             -(x - x0) * sin(rads) + (y - y0) * cos(rads) + y0)
+            for x, y in points]
+
+
+def old_origin_rotate(points, angle):
+    rads = angle * (pi / 180)
+    return [(x * cos(rads) - y * sin(rads), y * cos(rads) + x * sin(rads))
+            for x, y in points]
+
+
+@pytest.mark.parametrize('method, args, expected', [
+    ('xscale', (3,), [(x * 3, y) for x, y in POINTS]),
+    ('yscale', (-2,), [(x, y * -2) for x, y in POINTS]),
+    ('xshift', (4,), [(x + 4, y) for x, y in POINTS]),
+    ('yshift', (-1.5,), [(x, y - 1.5) for x, y in POINTS]),
+    ('reflectx', (), [(x, -y) for x, y in POINTS]),
+    ('reflecty', (), [(-x, y) for x, y in POINTS]),
+    ('rotate', (30, (2, 1)), old_rotate(POINTS, 30, (2, 1))),
+    ('origin_rotate', (45,), old_origin_rotate(POINTS, 45)),
+])
+def test_original_methods(method, args, expected):
+    result = getattr(Transform(list(POINTS)), method)(*args)
+    np.testing.assert_allclose(result, expected, atol=1e-12)
+
+
+@pytest.mark.parametrize('make', [
+    list, np.array, lambda p: PathCollection.fromlist([p, p]),
+])
+def test_original_methods_leave_input_alone(make):
+    points = make(POINTS)
+    before = np.array(points.points if hasattr(points, 'points') else points)
+    transform = Transform(points)
+    transform.xscale(3)
+    transform.rotate(30)
+    transform.scaled(2).shifted(1, 1).apply()
+    after = np.array(points.points if hasattr(points, 'points') else points)
+    np.testing.assert_array_equal(after, before)
+
+
+def test_apply_inplace_writes_back():
+    points = np.array(POINTS)
+    Transform(points).shifted(1, 2).apply(inplace=True)
+    np.testing.assert_allclose(points, np.array(POINTS) + (1, 2))
+
+    coll = PathCollection.fromlist([POINTS, POINTS])
+    Transform(coll).scaled(2).apply(inplace=True)
+    np.testing.assert_allclose(coll.points, np.array(POINTS * 2) * 2)
+
+
+def test_chain_matches_original_methods():
+    chained = Transform(list(POINTS)).rotated(30, (2, 1)).shifted(4, -1)
+    stepwise = Transform(Transform(list(POINTS)).rotate(30, (2, 1)))
+    stepwise.xshift(4)
+    np.testing.assert_allclose(chained.apply(), stepwise.yshift(-1),
+                               atol=1e-12)
+
+
+def test_pattern_list_is_updated():
+    flower = FlowerPattern(5)
+    before = np.array(flower.list)
+    Transform(flower).yshift(10)
+    np.testing.assert_allclose(flower.list, before + (0, 10))
+    Transform(flower).rotated(90).apply(inplace=True)
+    np.testing.assert_allclose(
+        flower.list, old_rotate(before + (0, 10), 90), atol=1e-9
+    )
+
+
+def test_polar_pattern_xscale():
+    # xscale used to be ignored, see PolarPattern
+    plain = np.array(SpiralPattern().list)
+    wide = np.array(SpiralPattern(xscale=2, yscale=0.5).list)
+    np.testing.assert_allclose(wide, plain * (2, 0.5))
+
+
+def test_batch_matches_rotate():
+    paths = [list(POINTS), list(POINTS[:2]), list(POINTS[1:])]
+    angles = [15, 90, 200]
+    matrices = np.stack([
+        Transform(POINTS).rotated(angle, (1, 1)).matrix for angle in angles
+    ])
+    expected = [old_rotate(path, angle, (1, 1))
+                for path, angle in zip(paths, angles)]
+    for coordlist in (paths, PathCollection.fromlist(paths)):
+        result = Transform.batch(coordlist, matrices)
+        for path, want in zip(result, expected):
+            np.testing.assert_allclose(path, want, atol=1e-12)